@@ -1,6 +1,19 @@
+import os
+import time
+from contextlib import nullcontext
+
 import streamlit as st
-from matcher import analyze_resume_against_job
-from extractor import extract_resume_text
+from analyzer import NLTKResourceError, excluded_lexicon, warm_up
+from matcher import analyze_resume_against_job_cached, get_result_cache
+from extractor import MAX_PDF_PAGES, MAX_TEXT_CHARS, UPLOAD_LIMITS, ResumeFile, extract_resume_cached
+from instrumentation import Recorder, recording
+
+# Start of this script run, for the rerun time in the timings panel
+run_started = time.perf_counter()
+
+# Uploads and analyses kept in memory by st.cache_data (shared by every session of this server)
+RESUME_CACHE_ENTRIES = 32
+ANALYSIS_CACHE_ENTRIES = 256
 
 # Page configuration
 st.set_page_config(
@@ -81,6 +94,9 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Debug mode (RESUME_ANALYZER_DEBUG=1, or ?debug=1 in the URL) shows per-stage timings of this run
+DEBUG = os.environ.get("RESUME_ANALYZER_DEBUG", "") not in ("", "0") or st.query_params.get("debug") == "1"
+
 # Main header
 st.markdown("""
 <div class="main-header">
@@ -116,12 +132,242 @@ with st.sidebar:
     - **🔴 1-5**: Nice to have keywords
     """)
     
+    if DEBUG:
+        st.markdown("---")
+        st.markdown("### 🐞 Debug")
+        profile_run = st.checkbox("Profile with cProfile")
+        trace_memory = st.checkbox("Measure peak memory (tracemalloc)")
+
     st.markdown("---")
     st.markdown("### ℹ️ About")
     st.markdown("""
     This tool analyzes the alignment between your resume and job postings using advanced text processing to identify key terms and phrases that recruiters and ATS systems look for.
     """)
 
+# Spans/counters of this script run, only collected in debug mode
+recorder = Recorder(profile=profile_run, trace_memory=trace_memory) if DEBUG else None
+
+
+def timed():
+    return recording(recorder) if recorder is not None else nullcontext()
+
+
+@st.cache_resource(show_spinner="Loading language models...")
+def load_analyzer():
+    """Loads the NLTK models and excluded words once per server process; returns the shared result cache."""
+    warm_up()
+    return get_result_cache()
+
+
+@st.cache_data(max_entries=RESUME_CACHE_ENTRIES, show_spinner=False)
+def extract_resume(data, file_type, _name):
+    """Resume Extraction (within UPLOAD_LIMITS), memoized by the upload's content (and type), so reruns never parse the file again."""
+    return extract_resume_cached(ResumeFile(data, _name, file_type), **UPLOAD_LIMITS)
+
+
+@st.cache_data(max_entries=ANALYSIS_CACHE_ENTRIES, show_spinner=False)
+def analyze(resume_text, job_text, company_name, lexicon_version):
+    """
+    analyze_resume_against_job results, memoized per (resume, posting, company, excluded words).
+    `lexicon_version` is the excluded_words.json fingerprint: it is only part of the memo key,
+    so editing the exclusion list invalidates the memoized results.
+    """
+    return analyze_resume_against_job_cached(resume_text, job_text, company_name, cache=load_analyzer())
+
+
+def render_results(match_results, celebrate=False):
+    """Results tabs, drawn from an already computed analysis (no NLP work happens here)."""
+    if celebrate:
+        st.balloons()  # Celebration animation
+    st.markdown("---")
+    st.markdown('<div class="section-header"><h2>🔍 Analysis Results</h2></div>', unsafe_allow_html=True)
+
+    # Create tabs for better organization
+    tab1, tab2, tab3, tab4 = st.tabs(["📊 Overview", "🔍 Job Keywords", "📝 Resume Analysis", "❌ Missing Elements"])
+
+    with tab1:
+        st.markdown("### 📈 Match Summary")
+        
+        # Create metrics row
+        metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
+        
+        with metric_col1:
+            keyword_matches = len(match_results["keyword_matches"]) if match_results["keyword_matches"] else 0
+            st.metric("🎯 Keyword Matches", keyword_matches)
+            
+        with metric_col2:
+            bigram_matches = len(match_results["bigram_matches"]) if match_results["bigram_matches"] else 0
+            st.metric("🔗 Phrase Matches", bigram_matches)
+            
+        with metric_col3:
+            missing_keywords = len(match_results["missing_keywords"]) if match_results["missing_keywords"] else 0
+            st.metric("⚠️ Missing Keywords", missing_keywords)
+            
+        with metric_col4:
+            missing_bigrams = len(match_results["missing_bigrams"]) if match_results["missing_bigrams"] else 0
+            st.metric("⚠️ Missing Phrases", missing_bigrams)
+
+        # Weighted match score (computed by the matcher, each job term counts by its importance)
+        match_percentage = match_results["match_score"]
+        
+        if match_percentage is not None:
+            st.markdown(f"### 🎯 Overall Match Score: {match_percentage:.1f}%")
+            st.progress(match_percentage / 100)
+            
+            if match_percentage >= 80:
+                st.success("🎉 Excellent match! Your resume aligns very well with the job requirements.")
+            elif match_percentage >= 60:
+                st.info("👍 Good match! Consider adding some missing keywords to improve further.")
+            elif match_percentage >= 40:
+                st.warning("⚠️ Moderate match. Your resume could benefit from more relevant keywords.")
+            else:
+                st.error("❌ Low match. Consider significantly revising your resume to better align with this position.")
+
+    with tab2:
+        # Top Job Keywords
+        st.markdown("### 🔹 **Top Keywords in Job Posting**")
+        if match_results["top_job_keywords"]:
+            for i, (word, count, score) in enumerate(match_results["top_job_keywords"], 1):
+                score_color = "🟢" if score >= 8 else "🟡" if score >= 6 else "🔴"
+                st.markdown(f"""
+                <div class="metric-card">
+                    <strong>#{i} {word}</strong> {score_color}<br>
+                    📊 {count} occurrences | ⭐ Importance: {score}/10
+                </div>
+                """, unsafe_allow_html=True)
+
+        # Top Job Bigrams
+        st.markdown("### 🔹 **Top Phrases in Job Posting**")
+        if match_results["top_job_bigrams"]:
+            for i, (bigram, count, score) in enumerate(match_results["top_job_bigrams"], 1):
+                score_color = "🟢" if score >= 8 else "🟡" if score >= 6 else "🔴"
+                st.markdown(f"""
+                <div class="metric-card">
+                    <strong>#{i} {bigram}</strong> {score_color}<br>
+                    📊 {count} occurrences | ⭐ Importance: {score}/10
+                </div>
+                """, unsafe_allow_html=True)
+
+    with tab3:
+        # Top Resume Keywords
+        st.markdown("### 📝 **Top Keywords in Your Resume**")
+        if match_results["top_resume_keywords"]:
+            for i, (word, count, score) in enumerate(match_results["top_resume_keywords"], 1):
+                score_color = "🟢" if score >= 8 else "🟡" if score >= 6 else "🔴"
+                st.markdown(f"""
+                <div class="metric-card">
+                    <strong>#{i} {word}</strong> {score_color}<br>
+                    📊 {count} occurrences | ⭐ Importance: {score}/10
+                </div>
+                """, unsafe_allow_html=True)
+        else:
+            st.markdown('<div class="warning-card">⚠ No significant keywords found in resume.</div>', unsafe_allow_html=True)
+
+        # Top Resume Bigrams
+        st.markdown("### 📝 **Top Phrases in Your Resume**")
+        if match_results["top_resume_bigrams"]:
+            for i, (bigram, count, score) in enumerate(match_results["top_resume_bigrams"], 1):
+                score_color = "🟢" if score >= 8 else "🟡" if score >= 6 else "🔴"
+                st.markdown(f"""
+                <div class="metric-card">
+                    <strong>#{i} {bigram}</strong> {score_color}<br>
+                    📊 {count} occurrences | ⭐ Importance: {score}/10
+                </div>
+                """, unsafe_allow_html=True)
+        else:
+            st.markdown('<div class="warning-card">⚠ No significant phrases found in resume.</div>', unsafe_allow_html=True)
+
+        # Keyword Matches
+        st.markdown("### ✅ **Keyword Matches in Your Resume**")
+        if match_results["keyword_matches"]:
+            for word, job_count in match_results["keyword_matches"]:
+                st.markdown(f"""
+                <div class="success-card">
+                    ✔ <strong>{word}</strong>: {job_count} occurrences in job posting
+                </div>
+                """, unsafe_allow_html=True)
+        else:
+            st.markdown('<div class="warning-card">⚠ No keyword matches found.</div>', unsafe_allow_html=True)
+
+        # Bigram Matches
+        st.markdown("### 🔗 **Phrase Matches in Your Resume**")
+        if match_results["bigram_matches"]:
+            for bigram, job_count in match_results["bigram_matches"]:
+                st.markdown(f"""
+                <div class="success-card">
+                    ✔ <strong>{bigram}</strong>: {job_count} occurrences in job posting
+                </div>
+                """, unsafe_allow_html=True)
+        else:
+            st.markdown('<div class="warning-card">⚠ No phrase matches found.</div>', unsafe_allow_html=True)
+
+    with tab4:
+        st.markdown("### ⚠️ **Optimization Opportunities**")
+        
+        improvement_found = False
+        
+        # Missing Important Keywords
+        if match_results["missing_keywords"]:
+            improvement_found = True
+            st.markdown("#### ❌ **Missing Important Keywords**")
+            st.markdown("Consider adding these keywords to your resume:")
+            
+            # Create chips for missing keywords
+            keyword_chips = ""
+            for keyword in match_results["missing_keywords"]:
+                keyword_chips += f'<span style="background:#34495e;color:white;padding:4px 8px;margin:2px;border-radius:12px;font-size:12px;">{keyword}</span> '
+            
+            st.markdown(f'<div style="margin:10px 0;">{keyword_chips}</div>', unsafe_allow_html=True)
+
+        # Missing Important Bigrams
+        if match_results["missing_bigrams"]:
+            improvement_found = True
+            st.markdown("#### ❌ **Missing Important Phrases**")
+            st.markdown("Consider incorporating these phrases into your resume:")
+            
+            # Create chips for missing bigrams
+            bigram_chips = ""
+            for bigram in match_results["missing_bigrams"]:
+                bigram_chips += f'<span style="background:#3498db;color:white;padding:4px 8px;margin:2px;border-radius:12px;font-size:12px;">{bigram}</span> '
+            
+            st.markdown(f'<div style="margin:10px 0;">{bigram_chips}</div>', unsafe_allow_html=True)
+        
+        if not improvement_found:
+            st.success("🎉 Great job! Your resume includes all the important keywords and phrases from the job posting.")
+            if celebrate:
+                st.balloons()
+
+    # Add some helpful tips at the bottom
+    st.markdown("---")
+    st.markdown("### 💡 **Optimization Tips**")
+    
+    tip_col1, tip_col2, tip_col3 = st.columns(3)
+    
+    with tip_col1:
+        st.markdown("""
+        <div class="metric-card">
+            <h4>🎯 Keywords</h4>
+            <p>Use exact keywords from the job posting. Avoid synonyms where possible.</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with tip_col2:
+        st.markdown("""
+        <div class="metric-card">
+            <h4>🔗 Context</h4>
+            <p>Include keywords in meaningful phrases that demonstrate your experience.</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with tip_col3:
+        st.markdown("""
+        <div class="metric-card">
+            <h4>📊 Balance</h4>
+            <p>Don't overuse keywords. Maintain natural, readable content.</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+
 # Create two columns for better layout
 col1, col2 = st.columns([1, 1])
 
@@ -139,10 +385,15 @@ with col2:
     
     # Resume Upload button
     uploaded_resume = st.file_uploader("Upload Your Resume", type=["pdf", "docx"], help="Supported formats: PDF, DOCX")
-    resume_text = extract_resume_text(uploaded_resume) if uploaded_resume else ""
+    with timed():
+        extraction = extract_resume(uploaded_resume.getvalue(), uploaded_resume.type, uploaded_resume.name) if uploaded_resume else None
+    resume_text = extraction.text if extraction else ""
     
     if uploaded_resume:
         st.success(f"✅ Resume uploaded: {uploaded_resume.name}")
+        if extraction.truncated:
+            st.warning(f"⚠ Your resume is long: only its first {MAX_PDF_PAGES} pages / {MAX_TEXT_CHARS:,} characters "
+                       "(or what could be read in time) were analyzed.")
         with st.expander("📖 Preview Resume Text"):
             st.text_area("Resume Content", resume_text[:500] + "..." if len(resume_text) > 500 else resume_text, height=200, disabled=True)
 
@@ -151,6 +402,7 @@ st.markdown("<br>", unsafe_allow_html=True)
 col_center = st.columns([1, 2, 1])
 with col_center[1]:
     # Analyze Button
+    new_analysis = False
     if st.button("🔍 Analyze Resume", use_container_width=True):
         if not company_name.strip(): #Checks if there is a company name and tells the user to input one if there isn't
             st.warning(
@@ -158,203 +410,40 @@ with col_center[1]:
         elif not resume_text or not job_text.strip():
             st.warning("⚠ Please upload a resume and paste the job posting text.")
         else:
+            # Remembered for the session, so later reruns keep showing these results
+            st.session_state.analyzed_inputs = (resume_text, job_text, company_name)
+            new_analysis = True
+
+    # Results of the last analysis, redrawn on every rerun from the cached result
+    analyzed_inputs = st.session_state.get("analyzed_inputs")
+    if analyzed_inputs is not None:
+        try:
             # Show progress
-            with st.spinner('🔍 Analyzing your resume...'):
-                # 1) Run analysis (calls Matcher.py's analyze_resume_against_job)
-                match_results = analyze_resume_against_job(resume_text, job_text, company_name)
-
-            # 2) Display results with improved styling
-            st.balloons()  # Celebration animation
-            st.markdown("---")
-            st.markdown('<div class="section-header"><h2>🔍 Analysis Results</h2></div>', unsafe_allow_html=True)
-
-            # Create tabs for better organization
-            tab1, tab2, tab3, tab4 = st.tabs(["📊 Overview", "🔍 Job Keywords", "📝 Resume Analysis", "❌ Missing Elements"])
-
-            with tab1:
-                st.markdown("### 📈 Match Summary")
-                
-                # Create metrics row
-                metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
-                
-                with metric_col1:
-                    keyword_matches = len(match_results["keyword_matches"]) if match_results["keyword_matches"] else 0
-                    st.metric("🎯 Keyword Matches", keyword_matches)
-                    
-                with metric_col2:
-                    bigram_matches = len(match_results["bigram_matches"]) if match_results["bigram_matches"] else 0
-                    st.metric("🔗 Phrase Matches", bigram_matches)
-                    
-                with metric_col3:
-                    missing_keywords = len(match_results["missing_keywords"]) if match_results["missing_keywords"] else 0
-                    st.metric("⚠️ Missing Keywords", missing_keywords)
-                    
-                with metric_col4:
-                    missing_bigrams = len(match_results["missing_bigrams"]) if match_results["missing_bigrams"] else 0
-                    st.metric("⚠️ Missing Phrases", missing_bigrams)
-
-                # Match percentage calculation
-                total_job_keywords = len(match_results["top_job_keywords"])
-                total_job_bigrams = len(match_results["top_job_bigrams"])
-                total_elements = total_job_keywords + total_job_bigrams
-                matched_elements = keyword_matches + bigram_matches
-                
-                if total_elements > 0:
-                    match_percentage = (matched_elements / total_elements) * 100
-                    st.markdown(f"### 🎯 Overall Match Score: {match_percentage:.1f}%")
-                    st.progress(match_percentage / 100)
-                    
-                    if match_percentage >= 80:
-                        st.success("🎉 Excellent match! Your resume aligns very well with the job requirements.")
-                    elif match_percentage >= 60:
-                        st.info("👍 Good match! Consider adding some missing keywords to improve further.")
-                    elif match_percentage >= 40:
-                        st.warning("⚠️ Moderate match. Your resume could benefit from more relevant keywords.")
-                    else:
-                        st.error("❌ Low match. Consider significantly revising your resume to better align with this position.")
-
-            with tab2:
-                # Top Job Keywords
-                st.markdown("### 🔹 **Top Keywords in Job Posting**")
-                if match_results["top_job_keywords"]:
-                    for i, (word, count, score) in enumerate(match_results["top_job_keywords"], 1):
-                        score_color = "🟢" if score >= 8 else "🟡" if score >= 6 else "🔴"
-                        st.markdown(f"""
-                        <div class="metric-card">
-                            <strong>#{i} {word}</strong> {score_color}<br>
-                            📊 {count} occurrences | ⭐ Importance: {score}/10
-                        </div>
-                        """, unsafe_allow_html=True)
-
-                # Top Job Bigrams
-                st.markdown("### 🔹 **Top Phrases in Job Posting**")
-                if match_results["top_job_bigrams"]:
-                    for i, (bigram, count, score) in enumerate(match_results["top_job_bigrams"], 1):
-                        score_color = "🟢" if score >= 8 else "🟡" if score >= 6 else "🔴"
-                        st.markdown(f"""
-                        <div class="metric-card">
-                            <strong>#{i} {bigram}</strong> {score_color}<br>
-                            📊 {count} occurrences | ⭐ Importance: {score}/10
-                        </div>
-                        """, unsafe_allow_html=True)
-
-            with tab3:
-                # Top Resume Keywords
-                st.markdown("### 📝 **Top Keywords in Your Resume**")
-                if match_results["top_resume_keywords"]:
-                    for i, (word, count, score) in enumerate(match_results["top_resume_keywords"], 1):
-                        score_color = "🟢" if score >= 8 else "🟡" if score >= 6 else "🔴"
-                        st.markdown(f"""
-                        <div class="metric-card">
-                            <strong>#{i} {word}</strong> {score_color}<br>
-                            📊 {count} occurrences | ⭐ Importance: {score}/10
-                        </div>
-                        """, unsafe_allow_html=True)
-                else:
-                    st.markdown('<div class="warning-card">⚠ No significant keywords found in resume.</div>', unsafe_allow_html=True)
-
-                # Top Resume Bigrams
-                st.markdown("### 📝 **Top Phrases in Your Resume**")
-                if match_results["top_resume_bigrams"]:
-                    for i, (bigram, count, score) in enumerate(match_results["top_resume_bigrams"], 1):
-                        score_color = "🟢" if score >= 8 else "🟡" if score >= 6 else "🔴"
-                        st.markdown(f"""
-                        <div class="metric-card">
-                            <strong>#{i} {bigram}</strong> {score_color}<br>
-                            📊 {count} occurrences | ⭐ Importance: {score}/10
-                        </div>
-                        """, unsafe_allow_html=True)
-                else:
-                    st.markdown('<div class="warning-card">⚠ No significant phrases found in resume.</div>', unsafe_allow_html=True)
-
-                # Keyword Matches
-                st.markdown("### ✅ **Keyword Matches in Your Resume**")
-                if match_results["keyword_matches"]:
-                    for word, job_count in match_results["keyword_matches"]:
-                        st.markdown(f"""
-                        <div class="success-card">
-                            ✔ <strong>{word}</strong>: {job_count} occurrences in job posting
-                        </div>
-                        """, unsafe_allow_html=True)
-                else:
-                    st.markdown('<div class="warning-card">⚠ No keyword matches found.</div>', unsafe_allow_html=True)
-
-                # Bigram Matches
-                st.markdown("### 🔗 **Phrase Matches in Your Resume**")
-                if match_results["bigram_matches"]:
-                    for bigram, job_count in match_results["bigram_matches"]:
-                        st.markdown(f"""
-                        <div class="success-card">
-                            ✔ <strong>{bigram}</strong>: {job_count} occurrences in job posting
-                        </div>
-                        """, unsafe_allow_html=True)
-                else:
-                    st.markdown('<div class="warning-card">⚠ No phrase matches found.</div>', unsafe_allow_html=True)
-
-            with tab4:
-                st.markdown("### ⚠️ **Optimization Opportunities**")
-                
-                improvement_found = False
-                
-                # Missing Important Keywords
-                if match_results["missing_keywords"]:
-                    improvement_found = True
-                    st.markdown("#### ❌ **Missing Important Keywords**")
-                    st.markdown("Consider adding these keywords to your resume:")
-                    
-                    # Create chips for missing keywords
-                    keyword_chips = ""
-                    for keyword in match_results["missing_keywords"]:
-                        keyword_chips += f'<span style="background:#34495e;color:white;padding:4px 8px;margin:2px;border-radius:12px;font-size:12px;">{keyword}</span> '
-                    
-                    st.markdown(f'<div style="margin:10px 0;">{keyword_chips}</div>', unsafe_allow_html=True)
-
-                # Missing Important Bigrams
-                if match_results["missing_bigrams"]:
-                    improvement_found = True
-                    st.markdown("#### ❌ **Missing Important Phrases**")
-                    st.markdown("Consider incorporating these phrases into your resume:")
-                    
-                    # Create chips for missing bigrams
-                    bigram_chips = ""
-                    for bigram in match_results["missing_bigrams"]:
-                        bigram_chips += f'<span style="background:#3498db;color:white;padding:4px 8px;margin:2px;border-radius:12px;font-size:12px;">{bigram}</span> '
-                    
-                    st.markdown(f'<div style="margin:10px 0;">{bigram_chips}</div>', unsafe_allow_html=True)
-                
-                if not improvement_found:
-                    st.success("🎉 Great job! Your resume includes all the important keywords and phrases from the job posting.")
-                    st.balloons()
-
-            # Add some helpful tips at the bottom
-            st.markdown("---")
-            st.markdown("### 💡 **Optimization Tips**")
-            
-            tip_col1, tip_col2, tip_col3 = st.columns(3)
-            
-            with tip_col1:
-                st.markdown("""
-                <div class="metric-card">
-                    <h4>🎯 Keywords</h4>
-                    <p>Use exact keywords from the job posting. Avoid synonyms where possible.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with tip_col2:
-                st.markdown("""
-                <div class="metric-card">
-                    <h4>🔗 Context</h4>
-                    <p>Include keywords in meaningful phrases that demonstrate your experience.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with tip_col3:
-                st.markdown("""
-                <div class="metric-card">
-                    <h4>📊 Balance</h4>
-                    <p>Don't overuse keywords. Maintain natural, readable content.</p>
-                </div>
-                """, unsafe_allow_html=True)
+            with st.spinner('🔍 Analyzing your resume...'), timed():
+                # Calls Matcher.py's analyze_resume_against_job, memoized per input
+                match_results = analyze(*analyzed_inputs, excluded_lexicon.current_fingerprint())
+        except NLTKResourceError as error:
+            st.error(f"❌ {error}")
+        else:
+            if analyzed_inputs != (resume_text, job_text, company_name):
+                st.info("ℹ️ The inputs changed since this analysis. Click Analyze to update the results.")
+            render_results(match_results, celebrate=new_analysis)
+
+# Timings panel (debug mode only)
+if recorder is not None:
+    with st.expander("⏱️ Timings", expanded=False):
+        st.markdown(f"**Script run:** {(time.perf_counter() - run_started) * 1000:.1f} ms")
+        if recorder.spans:
+            st.table([
+                {"stage": name, "calls": calls, "total ms": round(seconds * 1000, 2)}
+                for name, (calls, seconds) in recorder.totals().items()
+            ])
+        if recorder.counters:
+            st.table([{"counter": name, "value": value} for name, value in sorted(recorder.counters.items())])
+        if recorder.peak_memory is not None:
+            st.markdown(f"**Peak memory:** {recorder.peak_memory / 2**20:.2f} MB")
+        if recorder.profiler is not None:
+            st.code(recorder.profile_report(), language="text")
 
 # Footer
 st.markdown("---")
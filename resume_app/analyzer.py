@@ -1,42 +1,87 @@
+import atexit
+import hashlib
 import json
 import os
 import re
-import nltk
-import nltk.data
+import threading
 import unicodedata
-from nltk import WordNetLemmatizer, pos_tag
-from nltk.corpus import wordnet
+from collections.abc import Set
+from functools import lru_cache
 
-# Force NLTK download on both local and Streamlit Cloud
+from lemma_table import load_table, pos_key
+from scanner import PhraseScanner
+
+# NLTK itself is imported on first use: `import nltk` alone costs a few hundred ms,
+# and nothing in here needs it until the first document is lemmatized.
+
+# NLTK data lives in ~/nltk_data on both local and Streamlit Cloud
 nltk_data_path = os.path.join(os.path.expanduser("~"), "nltk_data")
-if not os.path.exists(nltk_data_path):
-    os.makedirs(nltk_data_path)
-nltk.data.path.append(nltk_data_path)
-
-# List of required NLTK resources
-nltk_resources = [
-    "averaged_perceptron_tagger_eng",
-    "wordnet",
-    "omw-1.4"
-    # "averaged_perceptron_tagger_eng" alternative tagger
-]
-
-
-def ensure_nltk_resources():
-    """Ensure all required NLTK models are installed."""
-    for resource in nltk_resources:
+
+# Required NLTK resources: path as nltk.data.find expects it -> package name for nltk.download
+NLTK_RESOURCES = {
+    "taggers/averaged_perceptron_tagger_eng": "averaged_perceptron_tagger_eng",
+    "corpora/wordnet": "wordnet",
+    "corpora/omw-1.4": "omw-1.4",
+}
+
+# With RESUME_ANALYZER_OFFLINE=1 nothing is ever downloaded, missing data fails fast instead
+OFFLINE = os.environ.get("RESUME_ANALYZER_OFFLINE", "") not in ("", "0")
+
+
+class NLTKResourceError(LookupError):
+    """Raised when required NLTK data is missing and could not (or may not) be downloaded."""
+
+
+def missing_nltk_resources():
+    """Returns the NLTK_RESOURCES paths that nltk.data.find cannot locate."""
+    import nltk.data
+
+    if nltk_data_path not in nltk.data.path:
+        nltk.data.path.append(nltk_data_path)
+    missing = []
+    for resource in NLTK_RESOURCES:
         try:
             nltk.data.find(resource)
         except LookupError:
-            nltk.download(resource.split('/')[-1], download_dir=nltk_data_path)
-
+            missing.append(resource)
+    return missing
 
-# Initialize NLTK resources at import
-ensure_nltk_resources()
 
-print("✅ NLTK is now using this path:", nltk.data.path)  # Debug print
-
-''' I had a lot of issues with these resources. '''
+def ensure_nltk_resources(offline=None):
+    """
+    Ensure all required NLTK models are installed, downloading the missing ones
+    unless running offline. Raises NLTKResourceError if anything is still missing.
+    """
+    offline = OFFLINE if offline is None else offline
+    missing = missing_nltk_resources()
+    if missing and not offline:
+        import nltk
+
+        os.makedirs(nltk_data_path, exist_ok=True)
+        for resource in missing:
+            nltk.download(NLTK_RESOURCES[resource], download_dir=nltk_data_path, quiet=True)
+        missing = missing_nltk_resources()
+    if missing:
+        packages = " ".join(NLTK_RESOURCES[resource] for resource in missing)
+        raise NLTKResourceError(
+            f"Missing NLTK data: {', '.join(missing)}"
+            f"{' (offline mode, downloads disabled)' if offline else ''}. "
+            f"Install it with: python -m nltk.downloader -d {nltk_data_path} {packages}"
+        )
+
+
+_nltk_ready = False
+_nltk_lock = threading.Lock()
+
+
+def require_nltk_resources():
+    """Checks the NLTK resources on first use instead of at import, once per process."""
+    global _nltk_ready
+    if not _nltk_ready:
+        with _nltk_lock:
+            if not _nltk_ready:
+                ensure_nltk_resources()
+                _nltk_ready = True
 
 
 def expand_company_terms(company_name: str):
@@ -49,62 +94,357 @@ def expand_company_terms(company_name: str):
     return terms
 
 
+def parse_excluded_words(data):
+    """Flattens the category -> word list mapping of excluded_words.json into a frozenset."""
+    excluded_words = set()
+    for category_values in data.values():
+        if isinstance(category_values, list):
+            for word in category_values:
+                if isinstance(word, list):
+                    # Flatten nested lists
+                    excluded_words.update(w.lower().strip() for w in word)
+                else:
+                    excluded_words.add(word.lower().strip())
+    return frozenset(excluded_words)
+
+
+class ExclusionOverlay(Set):
+    """
+    Read-only set made of the shared base lexicon plus a few per-request extra words
+    (company name variants). Lookups check the small overlay first, so the base set is never copied.
+    """
+
+    def __init__(self, base, extra=()):
+        self.base = base
+        self.extra = frozenset(extra) - base
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        # Set algebra (|, &, -, ^) builds its result from an iterable: return a plain frozenset
+        return frozenset(iterable)
+
+    def __contains__(self, word):
+        return word in self.extra or word in self.base
+
+    def __iter__(self):
+        yield from self.base
+        yield from self.extra
+
+    def __len__(self):
+        return len(self.base) + len(self.extra)
+
+    def __repr__(self):
+        return f"ExclusionOverlay({len(self.base)} base words, extra={sorted(self.extra)})"
+
+
+class ExcludedWordsLexicon:
+    """
+    Process-wide excluded words lexicon. The JSON file is parsed once and only
+    re-parsed when its modification time changes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.mtime = None
+        self.words = frozenset()
+        self.fingerprint = None
+        self.loads = 0  # number of times the file was actually parsed
+        self._lock = threading.Lock()
+
+    def base_words(self):
+        """Returns the frozen base set, reloading it first if the file changed on disk."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self.mtime:
+            with self._lock:
+                if mtime != self.mtime:
+                    self._reload(mtime)
+        return self.words
+
+    def _reload(self, mtime):
+        if mtime is None:
+            data = b""
+            words = frozenset()
+        else:
+            with open(self.path, "rb") as file:
+                data = file.read()
+            words = parse_excluded_words(json.loads(data.decode("utf-8")))
+        self.words = words
+        self.fingerprint = hashlib.sha256(data).hexdigest()
+        self.mtime = mtime
+        self.loads += 1
+
+    def current_fingerprint(self):
+        """SHA-256 of the file contents the base words were loaded from (after a reload check)."""
+        self.base_words()
+        return self.fingerprint
+
+    def with_company(self, company_name=None):
+        """Base words plus the company name variants as a lightweight overlay."""
+        extra = ()
+        if company_name and company_name.strip():
+            extra = expand_company_terms(company_name.strip())
+        return ExclusionOverlay(self.base_words(), extra)
+
+
+EXCLUDED_WORDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "excluded_words.json")
+excluded_lexicon = ExcludedWordsLexicon(EXCLUDED_WORDS_PATH)
+
+
 def load_excluded_words(company_name=None):
     """
-    Loads excluded words from excluded_words.json. Appends
+    Returns the excluded words from excluded_words.json plus the
     company name and its variants (abbreviation + individual words).
+    The file itself is cached by `excluded_lexicon` and only re-read when it changes.
     """
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    excluded_path = os.path.join(script_dir, "excluded_words.json")
+    return excluded_lexicon.with_company(company_name)
 
-    excluded_words = set()
 
-    # Load all categories from excluded_words.json
-    if os.path.exists(excluded_path):
-        with open(excluded_path, "r", encoding="utf-8") as file:
-            data = json.load(file)
-            for category_values in data.values():
-                if isinstance(category_values, list):
-                    for word in category_values:
-                        if isinstance(word, list):
-                            # Flatten nested lists
-                            excluded_words.update(w.lower().strip() for w in word)
-                        else:
-                            excluded_words.add(word.lower().strip())
+# Some words that usually do not get lemmatized
+SPECIAL_CASES = {
+    "engineering": "engineer",
+    "programming": "program",
+    "developing": "develop",
+    "analyzing": "analyze",
+}
+
+# First letter of a Penn Treebank tag -> WordNet POS (wordnet.ADJ, NOUN, VERB, ADV)
+ADJ, NOUN, VERB, ADV = "a", "n", "v", "r"
+TAG_TO_WORDNET = {"J": ADJ, "N": NOUN, "V": VERB, "R": ADV}
 
-    # Exclude company name variants if provided
-    if company_name and company_name.strip():
-        excluded_words |= expand_company_terms(company_name.strip())
-        print("❗ Final excluded words sample:", sorted(list(excluded_words))[:20])  # Debug Print
+# Lemmatization modes:
+#   "context" tags the whole token sequence in one pos_tag call (context-aware tags)
+#   "token"   tags every token on its own, matching lemmatize_word exactly (accuracy mode)
+LEMMA_MODES = ("context", "token")
 
-    return excluded_words
+# Max entries kept in the shared (token, POS) -> lemma and token -> POS caches
+LEMMA_CACHE_SIZE = 65536
 
+# Precompiled lemmas (built with `python lemma_table.py`), consulted before NLTK when present
+LEMMA_TABLE_PATH = os.environ.get(
+    "RESUME_ANALYZER_LEMMA_TABLE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "lemma_table.bin")
+)
+# Bump whenever lemmatization changes in a way SPECIAL_CASES does not show, so old tables are ignored
+LEMMA_RULES_VERSION = 1
 
-# use WordNet's Lemmatizer object (changes "running" to "run")
-lemmatizer = WordNetLemmatizer()
+
+def lemma_rules_fingerprint():
+    """SHA-256 of the rules baked into a lemma table; a table built with other rules is not used."""
+    rules = json.dumps([LEMMA_RULES_VERSION, SPECIAL_CASES], sort_keys=True)
+    return hashlib.sha256(rules.encode("utf-8")).digest()
+
+
+def penn_to_wordnet(tag):
+    """Map a Penn Treebank tag (e.g. 'VBG') to a WordNet POS, defaulting to NOUN."""
+    return TAG_TO_WORDNET.get(tag[:1].upper(), NOUN)
+
+
+class Analyzer:
+    """
+    Owns everything lemmatization needs: the excluded words lexicon, the WordNet lemmatizer, the
+    perceptron tagger, the optional lemma table and the (token, POS) -> lemma / token -> POS caches.
+
+    Thread safety: one Analyzer can be shared by any number of threads. Models are loaded once,
+    under a lock, by `warm_up` or by the first call that needs them (NLTK's lazy WordNet loader
+    breaks when two threads trigger it at the same time); after that they are only read. The
+    caches are functools.lru_cache objects, which are safe to call concurrently. Lemma table
+    hit/miss statistics are not locked and may undercount under contention.
+    Call `warm_up` before handing the object to a thread pool, so no request pays for loading.
+    """
+
+    def __init__(self, lexicon=None, lemma_table_path=None, cache_size=LEMMA_CACHE_SIZE):
+        self.lexicon = lexicon if lexicon is not None else excluded_lexicon
+        self.lemma_table_path = lemma_table_path  # None: LEMMA_TABLE_PATH when the table is loaded
+        self._lock = threading.Lock()
+        self._lemmatizer = None
+        self._tagger = None
+        self._lemma_table = None
+        self._lemma_table_loaded = False
+        # Per-instance caches (bound methods wrapped here, so instances never share entries)
+        self.lemmatize_with_pos = lru_cache(maxsize=cache_size)(self._lemmatize_with_pos)
+        self.wordnet_pos = lru_cache(maxsize=cache_size)(self._wordnet_pos)
+
+    def warm_up(self):
+        """
+        Loads the WordNet corpus, the tagger model, the lemma table and the excluded words now
+        instead of on first use. Raises NLTKResourceError when the NLTK data is missing.
+        """
+        self.get_lemmatizer()
+        self.get_tagger()
+        self.get_lemma_table()
+        self.lexicon.base_words()
+
+    def get_lemmatizer(self):
+        """The WordNetLemmatizer, with the WordNet corpus already loaded (checks the NLTK resources first)."""
+        if self._lemmatizer is None:
+            with self._lock:
+                if self._lemmatizer is None:
+                    require_nltk_resources()
+                    from nltk.corpus import wordnet
+                    from nltk.stem import WordNetLemmatizer
+
+                    wordnet.ensure_loaded()  # WordNet is a lazy corpus, load it here rather than in a race
+                    self._lemmatizer = WordNetLemmatizer()
+        return self._lemmatizer
+
+    def get_tagger(self):
+        """This analyzer's own PerceptronTagger (the model nltk.pos_tag uses)."""
+        if self._tagger is None:
+            with self._lock:
+                if self._tagger is None:
+                    require_nltk_resources()
+                    from nltk.tag.perceptron import PerceptronTagger
+
+                    self._tagger = PerceptronTagger()
+        return self._tagger
+
+    def get_lemma_table(self):
+        """The lemma_table.LemmaTable in use, or None if there is no (current) table."""
+        if not self._lemma_table_loaded:
+            with self._lock:
+                if not self._lemma_table_loaded:
+                    table = load_table(self.lemma_table_path or LEMMA_TABLE_PATH, lemma_rules_fingerprint())
+                    misses_path = os.environ.get("RESUME_ANALYZER_LEMMA_MISSES")
+                    if table is not None and misses_path:
+                        atexit.register(table.write_misses, misses_path)
+                    self._lemma_table = table
+                    self._lemma_table_loaded = True
+        return self._lemma_table
+
+    def close(self):
+        """Releases the lemma table; the analyzer loads it again if it is used afterwards."""
+        with self._lock:
+            if self._lemma_table is not None:
+                self._lemma_table.close()
+            self._lemma_table = None
+            self._lemma_table_loaded = False
+        self.clear_caches()
+
+    def tag(self, tokens):
+        """Penn Treebank tags of a token list, in one call (same as nltk.pos_tag)."""
+        return self.get_tagger().tag(list(tokens))
+
+    def excluded_words(self, company_name=None):
+        """This analyzer's excluded words plus the company name variants (see ExcludedWordsLexicon)."""
+        return self.lexicon.with_company(company_name)
+
+    def _wordnet_pos(self, word):
+        return penn_to_wordnet(self.tag([word])[0][1])
+
+    def _lemmatize_with_pos(self, word, pos):
+        table = self.get_lemma_table()
+        if table is not None:
+            lemma = table.get(pos_key(word.lower(), pos))
+            if lemma is not None:
+                return lemma
+        return self.wordnet_lemma(word, pos)
+
+    def wordnet_lemma(self, word, pos):
+        """The WordNet lemma of a token for a POS, with SPECIAL_CASES applied (no table, no cache)."""
+        lemma = self.get_lemmatizer().lemmatize(word.lower(), pos)
+        return SPECIAL_CASES.get(lemma, lemma)
+
+    def lemmatize_word(self, word):
+        """Lemmatizes a single token tagged on its own; words in the lemma table skip tagging and WordNet."""
+        table = self.get_lemma_table()
+        if table is not None:
+            lemma = table.get(word)
+            if lemma is not None:
+                return lemma
+        return self.lemmatize_with_pos(word, self.wordnet_pos(word))
+
+    def lemmatize_tokens(self, tokens, mode="context"):
+        """Lemmas aligned with `tokens` (see the module-level lemmatize_tokens for the modes)."""
+        if mode not in LEMMA_MODES:
+            raise ValueError(f"Unknown lemmatization mode {mode!r}, expected one of {LEMMA_MODES}")
+        tokens = list(tokens)
+        if not tokens:
+            return []
+        if mode == "token":
+            return [self.lemmatize_word(tok) for tok in tokens]
+        return [self.lemmatize_with_pos(tok, penn_to_wordnet(tag)) for tok, tag in self.tag(tokens)]
+
+    def clear_caches(self):
+        self.lemmatize_with_pos.cache_clear()
+        self.wordnet_pos.cache_clear()
+
+
+# The Analyzer behind the module-level functions below (and so behind extractor and matcher)
+default_analyzer = Analyzer()
+
+
+def get_lemmatizer():
+    """Returns the shared WordNetLemmatizer, checking the NLTK resources the first time."""
+    return default_analyzer.get_lemmatizer()
+
+
+def tag_tokens(tokens):
+    """Runs NLTK's perceptron POS tagger over a token list in one call."""
+    return default_analyzer.tag(tokens)
+
+
+def get_lemma_table():
+    """The lemma_table.LemmaTable at LEMMA_TABLE_PATH, or None if there is no (current) table."""
+    return default_analyzer.get_lemma_table()
 
 
 def get_wordnet_pos(word):
     """Map Part of Speech (POS) tag to first character WordNetLemmatizer understands."""
-    tag = pos_tag([word])[0][1][0].upper()
-    tag_dict = {"J": wordnet.ADJ, "N": wordnet.NOUN, "V": wordnet.VERB, "R": wordnet.ADV}
-    return tag_dict.get(tag, wordnet.NOUN)  # Default to NOUN for unknown
+    return penn_to_wordnet(tag_tokens([word])[0][1])
+
+
+def cached_wordnet_pos(word):
+    """Same as get_wordnet_pos, but each distinct token is only ever tagged once per process."""
+    return default_analyzer.wordnet_pos(word)
+
+
+def lemmatize_with_pos(word, pos):
+    """
+    Lemmatizes a token for an already known WordNet POS and applies SPECIAL_CASES.
+    Results are kept in a bounded LRU cache shared by every request in the process.
+    """
+    return default_analyzer.lemmatize_with_pos(word, pos)
+
+
+def wordnet_lemma(word, pos):
+    """The WordNet lemma of a token for a POS, with SPECIAL_CASES applied (no table, no cache)."""
+    return default_analyzer.wordnet_lemma(word, pos)
 
 
 def lemmatize_word(word):
     """
     Lemmatizes a single token. Also handles some manual special cases:
     e.g., 'engineering' -> 'engineer', 'programming' -> 'program'.
+    Words in the lemma table skip POS tagging and WordNet entirely.
+    """
+    return default_analyzer.lemmatize_word(word)
+
+
+def lemmatize_tokens(tokens, mode="context"):
+    """
+    Lemmatizes a whole token sequence.
+    mode="context" runs pos_tag once over the sequence so each tag sees its neighbours;
+    mode="token" reproduces lemmatize_word token by token (same output as before batching).
+    Returns a list of lemmas aligned with `tokens`.
+    """
+    return default_analyzer.lemmatize_tokens(tokens, mode)
+
+
+def clear_lemma_cache():
+    """Empties the shared lemma and POS caches (mostly useful for tests and benchmarks)."""
+    default_analyzer.clear_caches()
+
+
+def warm_up():
     """
-    lemma = lemmatizer.lemmatize(word.lower(), get_wordnet_pos(
-        word))  # ensures word is lowercase, lets the lemmatizer know what POS is working with
-    special_cases = {
-        "engineering": "engineer",
-        "programming": "program",
-        "developing": "develop",
-        "analyzing": "analyze",
-    }  # Some words that usually do not get lemmatized
-    return special_cases.get(lemma, lemma)
+    Loads everything analysis otherwise loads on first use: the NLTK data check, the WordNet
+    corpus, the perceptron tagger model and the excluded words. Raises NLTKResourceError when
+    the NLTK data is missing.
+    """
+    default_analyzer.warm_up()
+    phrase_scanner(None)
 
 
 def calculate_importance(counts):
@@ -128,26 +468,48 @@ def calculate_importance(counts):
     return importance_scores
 
 
-def emphasize_target_words(text, counts, boost=1.0):
+# Phrases after which a posting names what it really wants ("we need Python developers")
+EMPHASIS_PHRASES = ("we are looking for", "company is looking for", "we need", "company needs")
+
+# Values reported by phrase_scanner matches
+EMPHASIS = "emphasis"
+COMPANY = "company"
+
+# Word right after an emphasis phrase, skipping whitespace only (as the old str.find version did)
+NEXT_WORD = re.compile(r"\s*(\w+)")
+
+
+def company_scan_terms(company_name):
+    """Company name phrases removed from the text before tokenizing: full name and abbreviation."""
+    if not company_name or not company_name.strip():
+        return set()
+    parts = company_name.lower().split()
+    return {" ".join(parts), "".join(w[0] for w in parts)}
+
+
+@lru_cache(maxsize=256)
+def phrase_scanner(company_name=None):
     """
-    Looks for emphasis phrases like and boosts the count of
-    the word immediately after each one by `boost` (default is +1.0). (not implemented yet)
+    One PhraseScanner for the EMPHASIS_PHRASES plus the company name terms, so a single pass over
+    a document finds both. Matches carry EMPHASIS or COMPANY as their value. Cached per company.
     """
-    emphasis_phrases = ["we are looking for", "company is looking for", "we need", "company needs"]
-    text_lower = text.lower()
-
-    for phrase in emphasis_phrases:
-        idx = text_lower.find(phrase)
-        while idx != -1:
-            after_phrase = text_lower[idx + len(phrase):].strip()
-            match = re.match(r"(\w+)", after_phrase)
-            if match:
-                word = lemmatize_word(match.group(1))
-                counts[word] = counts.get(word, 0) + boost
+    phrases = [(phrase, EMPHASIS) for phrase in EMPHASIS_PHRASES]
+    phrases += [(term, COMPANY) for term in company_scan_terms(company_name)]
+    return PhraseScanner(phrases)
 
-            # Look for the next occurrence
-            idx = text_lower.find(phrase, idx + 1)
 
+def emphasize_target_words(text, counts, boost=1.0):
+    """
+    Looks for emphasis phrases like "we need" and boosts the count of
+    the word immediately after each one by `boost` (default is +1.0).
+    PreprocessedDocument(emphasis_boost=...) does the same during keyword extraction.
+    """
+    text_lower = text.lower()
+    for _, end, kind in phrase_scanner().finditer(text_lower):
+        match = NEXT_WORD.match(text_lower, end)
+        if kind == EMPHASIS and match:
+            word = lemmatize_word(match.group(1))
+            counts[word] = counts.get(word, 0) + boost
     return counts
 
 
@@ -0,0 +1,170 @@
+import os
+import traceback
+from collections import namedtuple
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from functools import partial
+
+from dedup import timed_call
+from extractor import preprocess
+from matcher import analyze_resume_against_job
+from workers import create_pool
+
+# One finished item of a batch: `result` is the analyze_resume_against_job dict, or None
+# when the item failed, in which case `error` holds the formatted exception.
+BatchResult = namedtuple("BatchResult", ["key", "result", "error"])
+
+# Pending tasks per worker, keeps memory bounded when the input is a long generator
+IN_FLIGHT_PER_WORKER = 4
+
+# Preprocessed document shared by every task of a pool (set once per worker process; inline
+# batches pass their document to the task instead, so concurrent batches never share it)
+_shared_doc = None
+
+
+def _init_worker(shared_doc):
+    global _shared_doc
+    _shared_doc = shared_doc
+
+
+def iter_items(items):
+    """
+    Yields (key, text, company_name) from a mapping {key: value} or an iterable of values
+    (keys are then the positions). A value is either the text or a (text, company_name) tuple.
+    """
+    pairs = items.items() if hasattr(items, "items") else enumerate(items)
+    for key, value in pairs:
+        if isinstance(value, tuple):
+            text, company_name = value
+        else:
+            text, company_name = value, None
+        yield key, text, company_name
+
+
+def _run_item(key, resume, job, company_name, top_n, lemma_mode):
+    """Analyzes one pair, turning any exception into a failed BatchResult so the batch keeps going."""
+    try:
+        result = analyze_resume_against_job(resume, job, company_name, lemma_mode=lemma_mode, top_n=top_n)
+        return BatchResult(key, result, None)
+    except Exception:
+        return BatchResult(key, None, traceback.format_exc())
+
+
+def _job_task(resume_doc, key, job_text, company_name, top_n, lemma_mode):
+    return _run_item(key, resume_doc, job_text, company_name, top_n, lemma_mode)
+
+
+def _resume_task(job_doc, key, resume_text, company_name, top_n, lemma_mode):
+    return _run_item(key, resume_text, job_doc, company_name, top_n, lemma_mode)
+
+
+def _pool_task(task, *args):
+    """Runs task(shared document, *args) in a pool worker, with the document _init_worker stored."""
+    return task(_shared_doc, *args)
+
+
+def bounded_imap(pool, fn, arg_tuples, max_in_flight):
+    """
+    Submits fn(*args) to `pool` for each tuple in `arg_tuples`, never keeping more than
+    `max_in_flight` tasks pending, and yields their results in completion order.
+    """
+    pending = set()
+    for args in arg_tuples:
+        pending.add(pool.submit(fn, *args))
+        if len(pending) >= max_in_flight:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from (future.result() for future in done)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        yield from (future.result() for future in done)
+
+
+def _deduplicated(run, task, arg_tuples, dedup):
+    """
+    Runs `task` only for the first item of each near-duplicate cluster (see dedup.PostingDeduplicator)
+    and yields its BatchResult again, under their own keys, for the other members of the cluster.
+    """
+    results = {}  # representative key -> its BatchResult
+    waiting = {}  # representative key -> keys of members that arrived before its result
+    ready = deque()  # member results whose representative had already finished
+
+    def representatives():
+        for args in arg_tuples:
+            key, text, item_company = args[:3]
+            representative = dedup.representative(key, text, item_company)
+            if representative == key:
+                yield (task, *args)
+            elif representative in results:
+                ready.append(results[representative]._replace(key=key))
+            else:
+                waiting.setdefault(representative, []).append(key)
+
+    def copies():
+        while ready:
+            dedup.record_reuse()
+            yield ready.popleft()
+
+    for batch_result, seconds in run(timed_call, representatives()):
+        dedup.record_analysis(seconds)
+        results[batch_result.key] = batch_result
+        yield batch_result
+        for key in waiting.pop(batch_result.key, ()):
+            dedup.record_reuse()
+            yield batch_result._replace(key=key)
+        yield from copies()
+    yield from copies()
+
+
+def _fan_out(task, shared_doc, items, company_name, top_n, lemma_mode, max_workers, dedup=None):
+    """Runs task(shared_doc, *item args) for every item, yielding BatchResults in completion order."""
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    arg_tuples = (
+        (key, text, item_company or company_name, top_n, lemma_mode)
+        for key, text, item_company in iter_items(items)
+    )
+
+    if max_workers <= 1:
+        # Inline mode: no pool, results come back in input order
+        task = partial(task, shared_doc)
+
+        def run(fn, arg_tuples):
+            return (fn(*args) for args in arg_tuples)
+
+        yield from run(task, arg_tuples) if dedup is None else _deduplicated(run, task, arg_tuples, dedup)
+        return
+
+    task = partial(_pool_task, task)
+    with create_pool(max_workers, initializer=_init_worker, initargs=(shared_doc,)) as pool:
+
+        def run(fn, arg_tuples):
+            return bounded_imap(pool, fn, arg_tuples, max_workers * IN_FLIGHT_PER_WORKER)
+
+        yield from run(task, arg_tuples) if dedup is None else _deduplicated(run, task, arg_tuples, dedup)
+
+
+def analyze_resume_against_jobs(resume_text, jobs, company_name=None, top_n=5, lemma_mode="context", max_workers=None,
+                                dedup=None):
+    """
+    Scores one resume against many job postings. The resume is preprocessed once in this
+    process and handed to every worker; postings are analyzed across a process pool.
+
+    `jobs` is a mapping {key: job} or an iterable of jobs, where a job is the posting text or a
+    (text, company_name) tuple. Per-posting company names only filter the posting side, the
+    resume is filtered with the batch-level `company_name`.
+    Yields BatchResult(key, result, error) as each posting finishes; max_workers<=1 runs inline.
+    With a dedup.PostingDeduplicator as `dedup`, near-duplicate postings are analyzed once and
+    share that result; the deduplicator then holds the dedup ratio and the time saved.
+    """
+    resume_doc = preprocess(resume_text, company_name=company_name, lemma_mode=lemma_mode)
+    yield from _fan_out(_job_task, resume_doc, jobs, company_name, top_n, lemma_mode, max_workers, dedup)
+
+
+def analyze_resumes_against_job(resumes, job_text, company_name=None, top_n=5, lemma_mode="context", max_workers=None):
+    """
+    Scores many resumes against one job posting (the reverse of analyze_resume_against_jobs).
+    The posting is preprocessed once; `resumes` follows the same mapping/iterable format as `jobs`.
+    Yields BatchResult(key, result, error) as each resume finishes.
+    """
+    job_doc = preprocess(job_text, company_name=company_name, lemma_mode=lemma_mode)
+    yield from _fan_out(_resume_task, job_doc, resumes, company_name, top_n, lemma_mode, max_workers)
@@ -0,0 +1,78 @@
+"""
+Compares the DOCX extraction backends on the same files.
+
+    python benchmarks/bench_docx.py resumes/*.docx
+    python benchmarks/bench_docx.py --generate 10 100 1000
+
+With --generate, template-style resumes (header, footer, a text box sidebar, a skills table and
+the given number of body paragraphs) are built instead of reading files. Each backend is timed
+over --repeat runs with no char limit, and its peak Python heap usage (tracemalloc) is reported
+with the number of characters it found: python-docx only reads body paragraphs, so text in
+tables, text boxes, headers and footers is missing from its output.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import make_resume_text, make_template_docx  # noqa: E402
+from extractor import DOCX_BACKENDS, DOCX_TYPE, ResumeFile, extract_docx_text  # noqa: E402
+
+HEADER = ["Jordan Rivera", "Senior Data Engineer", "jordan.rivera@example.com | +1 555 0100 | Austin, TX"]
+SIDEBAR = ["Languages: English, Spanish", "Certifications: AWS Solutions Architect, CKA", "Interests: open source, cycling"]
+SKILLS = [("Python", "Expert"), ("SQL", "Expert"), ("Spark", "Advanced"), ("Docker", "Advanced"),
+          ("Kubernetes", "Intermediate"), ("Terraform", "Intermediate")]
+FOOTER = ["References available on request"]
+
+
+def load_inputs(args):
+    """Returns [(label, docx_bytes), ...] from the given files or generated paragraph counts."""
+    if args.generate:
+        inputs = []
+        for count in args.generate:
+            paragraphs = make_resume_text(count * 80).splitlines()[:count]
+            inputs.append((f"template-{count}p", make_template_docx(HEADER, SIDEBAR, SKILLS, paragraphs, FOOTER)))
+        return inputs
+    inputs = []
+    for path in args.files:
+        with open(path, "rb") as file:
+            inputs.append((os.path.basename(path), file.read()))
+    return inputs
+
+
+def bench(data, backend, repeat):
+    """Returns (best seconds, peak bytes, extracted chars) for one backend on one DOCX."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = extract_docx_text(ResumeFile(data, "bench.docx", DOCX_TYPE), backend).text
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    extract_docx_text(ResumeFile(data, "bench.docx", DOCX_TYPE), backend)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, len(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DOCX text extraction backends.")
+    parser.add_argument("files", nargs="*", help="DOCX files to extract")
+    parser.add_argument("--generate", type=int, nargs="+", metavar="PARAGRAPHS",
+                        help="generate template resumes with these body paragraph counts")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per backend (best is reported)")
+    args = parser.parse_args(argv)
+    if not args.files and not args.generate:
+        parser.error("pass DOCX files or --generate")
+
+    print(f"{'file':<24} {'backend':<11} {'best ms':>9} {'peak MB':>8} {'chars':>8}")
+    for label, data in load_inputs(args):
+        for backend in DOCX_BACKENDS:
+            seconds, peak, chars = bench(data, backend, args.repeat)
+            print(f"{label:<24} {backend:<11} {seconds * 1000:>9.1f} {peak / 2**20:>8.2f} {chars:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compares the PDF extraction backends on the same files.
+
+    python benchmarks/bench_pdf.py resumes/*.pdf
+    python benchmarks/bench_pdf.py --generate 1 5 40
+
+With --generate, synthetic PDFs of the given page counts are built instead of reading files.
+Each backend is timed over --repeat runs with no page/char/time limits, and its peak Python
+heap usage (tracemalloc) is reported.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import make_pdf  # noqa: E402
+from extractor import PDF_BACKENDS, PDF_TYPE, ResumeFile, extract_pdf_text  # noqa: E402
+
+PAGE_TEXT = (
+    "Senior software engineer with experience building Python data pipelines, REST APIs and "
+    "cloud infrastructure on AWS. Led a team of five engineers, managed releases and mentored "
+    "junior developers. Skills: Python, SQL, Docker, Kubernetes, Terraform, React.\n"
+) * 6
+
+
+def load_inputs(args):
+    """Returns [(label, pdf_bytes), ...] from the given files or generated page counts."""
+    if args.generate:
+        return [(f"generated-{pages}p", make_pdf([PAGE_TEXT] * pages)) for pages in args.generate]
+    inputs = []
+    for path in args.files:
+        with open(path, "rb") as file:
+            inputs.append((os.path.basename(path), file.read()))
+    return inputs
+
+
+def bench(data, backend, repeat):
+    """Returns (best seconds, peak bytes, extracted chars) for one backend on one PDF."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = extract_pdf_text(ResumeFile(data, "bench.pdf", PDF_TYPE), backend).text
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    extract_pdf_text(ResumeFile(data, "bench.pdf", PDF_TYPE), backend)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, len(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark PDF text extraction backends.")
+    parser.add_argument("files", nargs="*", help="PDF files to extract")
+    parser.add_argument("--generate", type=int, nargs="+", metavar="PAGES", help="generate PDFs with these page counts")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per backend (best is reported)")
+    args = parser.parse_args(argv)
+    if not args.files and not args.generate:
+        parser.error("pass PDF files or --generate")
+
+    print(f"{'file':<24} {'backend':<11} {'best ms':>9} {'peak MB':>8} {'chars':>8}")
+    for label, data in load_inputs(args):
+        for backend in PDF_BACKENDS:
+            seconds, peak, chars = bench(data, backend, args.repeat)
+            print(f"{label:<24} {backend:<11} {seconds * 1000:>9.1f} {peak / 2**20:>8.2f} {chars:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Times every stage of the analysis pipeline on generated resumes and postings.
+
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --sizes 1k 64k --stages tokenize extract_keywords
+    python benchmarks/bench_pipeline.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --baseline benchmarks/baseline.json --threshold 0.25
+
+Each stage runs --repeat times per input size (best time is reported, the lemma cache is
+cleared before every run) plus once under tracemalloc for peak Python heap usage. Throughput
+is in characters per second, or words per second for lemmatize_word.
+With --baseline, the run fails (exit status 1) if any stage got slower or used more memory
+than the stored baseline by more than --threshold. Baselines are machine specific: save one
+on the machine that compares against it. Stages that need NLTK data are skipped if it is missing.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import clear_lemma_cache, lemmatize_word, missing_nltk_resources, normalize_token  # noqa: E402
+from benchmarks.fixtures import make_docx, make_job_text, make_pdf, make_resume_text  # noqa: E402
+from extractor import (  # noqa: E402
+    DOCX_TYPE, PDF_TYPE, TOKEN_PATTERN, ResumeFile, extract_bigrams, extract_keywords, extract_resume_text,
+)
+from matcher import analyze_resume_against_job  # noqa: E402
+
+STAGES = ("extract_pdf", "extract_docx", "tokenize", "lemmatize_word", "extract_keywords", "extract_bigrams",
+          "analyze_resume_against_job")
+DEFAULT_SIZES = ("1k", "16k", "256k", "1m")
+DEFAULT_THRESHOLD = 0.25
+PAGE_CHARS = 4000  # text per generated PDF page, about what make_pdf fits on one page
+
+# Stages that lemmatize and so need the NLTK tagger/WordNet data
+NLTK_STAGES = {"lemmatize_word", "extract_keywords", "extract_bigrams", "analyze_resume_against_job"}
+
+
+def parse_size(label):
+    """Input size in characters from a label: "16k" -> 16384, "1m" -> 1048576, "500" -> 500."""
+    label = label.lower()
+    multiplier = {"k": 2**10, "m": 2**20}.get(label[-1:], 1)
+    return int(label.rstrip("km")) * multiplier
+
+
+def tokenize(text):
+    return [normalize_token(match.group()) for match in TOKEN_PATTERN.finditer(text.lower())]
+
+
+def _extract(data, name, file_type):
+    return lambda: extract_resume_text(ResumeFile(data, name, file_type))
+
+
+def stage_input(stage, size):
+    """Returns (function to time, units it processes, unit name) for one stage at one input size."""
+    resume = make_resume_text(size)
+    if stage == "extract_pdf":
+        pages = [resume[start:start + PAGE_CHARS] for start in range(0, len(resume), PAGE_CHARS)]
+        run = _extract(make_pdf(pages), "bench.pdf", PDF_TYPE)
+        return run, len(run()), "chars"
+    if stage == "extract_docx":
+        run = _extract(make_docx(resume.splitlines()), "bench.docx", DOCX_TYPE)
+        return run, len(run()), "chars"
+    if stage == "tokenize":
+        return lambda: tokenize(resume), len(resume), "chars"
+    if stage == "lemmatize_word":
+        words = tokenize(resume)
+        return lambda: [lemmatize_word(word) for word in words], len(words), "words"
+    if stage == "extract_keywords":
+        return lambda: extract_keywords(resume, top_n=10), len(resume), "chars"
+    if stage == "extract_bigrams":
+        return lambda: extract_bigrams(resume, top_n=10), len(resume), "chars"
+    if stage == "analyze_resume_against_job":
+        job = make_job_text(size)
+        return lambda: analyze_resume_against_job(resume, job), len(resume) + len(job), "chars"
+    raise ValueError(f"Unknown stage {stage!r}")
+
+
+def bench(run, repeat):
+    """Returns (best seconds, peak traced bytes) of `run`, each run starting with a cold lemma cache."""
+    best = float("inf")
+    for _ in range(repeat):
+        clear_lemma_cache()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    clear_lemma_cache()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def run_benchmarks(stages, sizes, repeat=3, out=sys.stdout):
+    """Runs every stage at every size, printing one row each. Returns {"stage@size": measurements}."""
+    skipped = NLTK_STAGES.intersection(stages) if missing_nltk_resources() else set()
+    if skipped:
+        print(f"NLTK data missing, skipping: {', '.join(sorted(skipped))}", file=out)
+    results = {}
+    print(f"{'stage':<28} {'size':>6} {'best ms':>10} {'throughput':>16} {'peak MB':>8}", file=out)
+    for stage in stages:
+        if stage in skipped:
+            continue
+        for label in sizes:
+            run, units, unit = stage_input(stage, parse_size(label))
+            seconds, peak = bench(run, repeat)
+            throughput = units / seconds if seconds else float("inf")
+            results[f"{stage}@{label}"] = {"seconds": seconds, "peak_bytes": peak, "throughput": throughput,
+                                           "unit": unit}
+            print(f"{stage:<28} {label:>6} {seconds * 1000:>10.2f} {throughput:>10.0f} {unit + '/s':<5} "
+                  f"{peak / 2**20:>8.2f}", file=out)
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Messages for every stage/size measured in both runs whose time or peak memory grew by
+    more than `threshold` (0.25 = 25%) over the baseline.
+    """
+    regressions = []
+    for key, measured in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if base[metric] and measured[metric] > base[metric] * (1 + threshold):
+                change = measured[metric] / base[metric] - 1
+                regressions.append(f"{key} {metric}: {base[metric]:.6g} -> {measured[metric]:.6g} (+{change:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark each stage of resume analysis.")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES), help="stages to run")
+    parser.add_argument("--sizes", nargs="+", default=list(DEFAULT_SIZES), help="input sizes, e.g. 1k 256k 1m")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage and size (best is reported)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write this run's results as the baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown/memory growth over the baseline (default 0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.stages, args.sizes, args.repeat)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+        print(f"No regressions over {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
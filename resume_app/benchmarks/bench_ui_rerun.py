@@ -0,0 +1,100 @@
+"""
+Rerun latency of the Streamlit UI with and without its caches.
+
+    python benchmarks/bench_ui_rerun.py
+    python benchmarks/bench_ui_rerun.py --sizes 4k 64k --repeat 5
+
+Every widget interaction reruns the UI script, which redraws the last analysis. Without
+caching, a rerun extracts the uploaded resume and analyzes it again. With st.cache_data, a
+rerun hashes the arguments and unpickles the stored value. Both paths are timed here outside
+Streamlit, on generated PDF resumes and postings:
+- "uncached" runs extract_resume and analyze_resume_against_job.
+- "cached" models a cache_data hit: an md5 of the arguments plus pickle.loads of the stored
+  value, which is what Streamlit does.
+Rows that analyze need NLTK data and are skipped if it is missing.
+"""
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import clear_lemma_cache, missing_nltk_resources  # noqa: E402
+from benchmarks.bench_pipeline import PAGE_CHARS, parse_size  # noqa: E402
+from benchmarks.fixtures import make_job_text, make_pdf, make_resume_text  # noqa: E402
+from extractor import PDF_TYPE, UPLOAD_LIMITS, ResumeFile, extract_resume  # noqa: E402
+from matcher import analyze_resume_against_job  # noqa: E402
+
+COMPANY = "Acme"
+
+
+def cache_hit(value, *args):
+    """Returns a function doing the work of one st.cache_data hit for `args` returning `value`."""
+    stored = pickle.dumps(value)
+
+    def hit():
+        digest = hashlib.md5()
+        for arg in args:
+            digest.update(arg if isinstance(arg, bytes) else str(arg).encode("utf-8"))
+        digest.hexdigest()
+        return pickle.loads(stored)
+    return hit
+
+
+def best_time(run, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        clear_lemma_cache()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def steps(size, analysis):
+    """[(step, uncached run, cached run)] for one input size."""
+    resume = make_resume_text(size)
+    pdf = make_pdf([resume[start:start + PAGE_CHARS] for start in range(0, len(resume), PAGE_CHARS)])
+    job = make_job_text(size)
+
+    def extract():
+        return extract_resume(ResumeFile(pdf, "resume.pdf", PDF_TYPE), **UPLOAD_LIMITS)
+
+    extraction = extract()
+    found = [("extract", extract, cache_hit(extraction, pdf, PDF_TYPE))]
+    if analysis:
+        def analyze():
+            return analyze_resume_against_job(extraction.text, job, COMPANY)
+
+        def rerun():
+            return analyze_resume_against_job(extract().text, job, COMPANY)
+
+        result = analyze()
+        analyze_hit = cache_hit(result, extraction.text, job, COMPANY, "lexicon-fingerprint")
+        extract_hit = cache_hit(extraction, pdf, PDF_TYPE)
+        found.append(("analyze", analyze, analyze_hit))
+        found.append(("rerun", rerun, lambda: (extract_hit(), analyze_hit())))
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark UI rerun latency with and without caching.")
+    parser.add_argument("--sizes", nargs="+", default=["4k", "16k", "64k"], help="resume/posting sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per step (best is reported)")
+    args = parser.parse_args(argv)
+
+    analysis = not missing_nltk_resources()
+    if not analysis:
+        print("NLTK data missing, skipping: analyze, rerun")
+    print(f"{'step':<8} {'size':>6} {'uncached ms':>12} {'cached ms':>10} {'speedup':>8}")
+    for label in args.sizes:
+        for step, uncached, cached in steps(parse_size(label), analysis):
+            slow, fast = best_time(uncached, args.repeat), best_time(cached, args.repeat)
+            print(f"{step:<8} {label:>6} {slow * 1000:>12.2f} {fast * 1000:>10.3f} {slow / fast:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Compares cold and warm (pre-forked, see workers.create_pool) worker pools.
+
+    python benchmarks/bench_workers.py --workers 4
+
+For each mode a fresh pool is created in a fresh process. The script reports the pool start
+time, the first-request latency of every worker (an analysis of a generated resume and
+posting, timed inside the worker) and every worker's RSS and PSS after that request. PSS
+splits shared pages between the processes that use them, so it shows how much of the NLTK
+data the workers really share.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import missing_nltk_resources  # noqa: E402
+from benchmarks.fixtures import make_job_text, make_resume_text  # noqa: E402
+
+
+def first_request(resume, job):
+    """Worker task: (pid, seconds) of one uncached analysis."""
+    from matcher import analyze_resume_against_job
+
+    start = time.perf_counter()
+    analyze_resume_against_job(resume, job)
+    return os.getpid(), time.perf_counter() - start
+
+
+def measure(workers, warm):
+    """Runs in its own process, so the cold pool really starts from an unwarmed parent."""
+    from workers import create_pool, process_memory, worker_memory
+
+    start = time.perf_counter()
+    pool = create_pool(workers, warm=warm)
+    startup = time.perf_counter() - start
+    resume, job = make_resume_text(8000), make_job_text(4000)
+    latencies = {}
+    for future in [pool.submit(first_request, resume, job) for _ in range(workers)]:
+        pid, seconds = future.result()
+        latencies.setdefault(pid, seconds)
+    memory = worker_memory(pool)
+    parent = process_memory()
+    pool.shutdown()
+
+    mode = "warm" if warm else "cold"
+    print(f"{mode}: pool started in {startup * 1000:.0f} ms, parent RSS {parent['rss'] / 2**20:.1f} MB")
+    print(f"  {'pid':>8} {'first request ms':>17} {'RSS MB':>8} {'PSS MB':>8}")
+    for pid, usage in memory.items():
+        latency = f"{latencies[pid] * 1000:.1f}" if pid in latencies else "-"
+        rss = f"{usage['rss'] / 2**20:.1f}" if usage["rss"] is not None else "n/a"
+        pss = f"{usage['pss'] / 2**20:.1f}" if usage["pss"] is not None else "n/a"
+        print(f"  {pid:>8} {latency:>17} {rss:>8} {pss:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare cold and warm analysis worker pools.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--mode", choices=["cold", "warm"], help=argparse.SUPPRESS)  # child process
+    args = parser.parse_args(argv)
+    if missing_nltk_resources():
+        print("NLTK data is missing, install it first (see README)", file=sys.stderr)
+        return 1
+    if args.mode:
+        measure(args.workers, args.mode == "warm")
+        return 0
+    for mode in ("cold", "warm"):
+        subprocess.run([sys.executable, os.path.abspath(__file__), "--workers", str(args.workers), "--mode", mode],
+                       check=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
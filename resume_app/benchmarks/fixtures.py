@@ -0,0 +1,160 @@
+"""Generated documents for benchmarks and tests, so no binary fixtures need to be checked in."""
+import io
+import random
+import textwrap
+
+LINE_WIDTH = 90
+LINES_PER_PAGE = 50
+
+SKILLS = (
+    "python", "sql", "java", "javascript", "react", "docker", "kubernetes", "terraform", "aws", "azure",
+    "spark", "pandas", "machine learning", "data pipelines", "rest apis", "microservices", "linux", "git",
+    "ci/cd", "tableau", "excel", "project management", "stakeholder communication", "agile", "scrum",
+)
+RESUME_SENTENCES = (
+    "Built {0} services and {1} tooling used by {n} internal teams.",
+    "Led a team of {n} engineers delivering {0} and {1} projects on schedule.",
+    "Reduced processing time by {n}% by migrating {0} jobs to {1}.",
+    "Designed and implemented {0} dashboards, mentoring junior developers in {1}.",
+    "Managed releases for {0} applications and automated testing with {1}.",
+)
+JOB_SENTENCES = (
+    "We are looking for an engineer with {n}+ years of experience in {0} and {1}.",
+    "The candidate will design, implement and troubleshoot {0} systems.",
+    "We need strong {0} skills and experience with {1} in production.",
+    "You will collaborate with stakeholders to prioritize {0} and {1} work.",
+    "Experience with {0} is required; familiarity with {1} is a plus.",
+)
+
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages):
+    """
+    Builds a minimal text PDF (Helvetica, one content stream per page) from a list of page texts.
+    Lines are wrapped at LINE_WIDTH characters; text beyond LINES_PER_PAGE lines is dropped.
+    """
+    objects = []  # object bodies, object number = index + 1
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(None)  # page tree, filled in once the page objects exist
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for text in pages:
+        lines = []
+        for paragraph in text.splitlines() or [""]:
+            lines.extend(textwrap.wrap(paragraph, LINE_WIDTH) or [""])
+        body = " T* ".join(f"({_pdf_escape(line)}) Tj" for line in lines[:LINES_PER_PAGE])
+        stream = f"BT /F1 11 Tf 14 TL 72 740 Td {body} ET".encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def _make_text(sentences, size, seed):
+    rng = random.Random(seed)
+    lines = []
+    total = 0
+    while total < size:
+        sentence = rng.choice(sentences).format(*rng.sample(SKILLS, 2), n=rng.randint(2, 12))
+        lines.append(sentence)
+        total += len(sentence) + 1
+    return "\n".join(lines)[:size]
+
+
+def make_resume_text(size, seed=0):
+    """Deterministic synthetic resume text of `size` characters."""
+    return _make_text(RESUME_SENTENCES, size, seed)
+
+
+def make_job_text(size, seed=1):
+    """Deterministic synthetic job posting text of `size` characters."""
+    return _make_text(JOB_SENTENCES, size, seed)
+
+
+def make_docx(paragraphs):
+    """Builds a .docx file (bytes) with one paragraph per item of `paragraphs`."""
+    import docx
+
+    document = docx.Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+# A Word text box as Word writes it: DrawingML in mc:Choice and the same text again as VML in mc:Fallback
+TEXT_BOX_RUN = """<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"
+    xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"
+    xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"
+    xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"
+    xmlns:v="urn:schemas-microsoft-com:vml">
+  <mc:AlternateContent>
+    <mc:Choice Requires="wps"><w:drawing><wp:anchor><wp:docPr id="{id}" name="Text Box {id}"/>
+      <a:graphic><a:graphicData uri="http://schemas.microsoft.com/office/word/2010/wordprocessingShape">
+        <wps:wsp><wps:txbx><w:txbxContent>{paragraphs}</w:txbxContent></wps:txbx></wps:wsp>
+      </a:graphicData></a:graphic></wp:anchor></w:drawing></mc:Choice>
+    <mc:Fallback><w:pict><v:shape><v:textbox><w:txbxContent>{paragraphs}</w:txbxContent></v:textbox></v:shape></w:pict></mc:Fallback>
+  </mc:AlternateContent>
+</w:r>"""
+
+
+def _xml_escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def make_template_docx(header, sidebar, skills, paragraphs, footer):
+    """
+    Builds a .docx laid out like a resume template (bytes): `header` lines in the page header,
+    `sidebar` lines in a text box, `skills` as a two-column table ((name, level) rows), then
+    `paragraphs` and `footer` lines in the page footer. The header is also set as the
+    first-page header, as templates usually do.
+    """
+    import docx
+    from docx.oxml import parse_xml
+
+    document = docx.Document()
+    section = document.sections[0]
+    section.different_first_page_header_footer = True
+    for part in (section.header, section.first_page_header):
+        part.paragraphs[0].text = header[0]
+        for line in header[1:]:
+            part.add_paragraph(line)
+    section.footer.paragraphs[0].text = footer[0]
+    for line in footer[1:]:
+        section.footer.add_paragraph(line)
+
+    anchor = document.add_paragraph()
+    box = "".join(f"<w:p><w:r><w:t>{_xml_escape(line)}</w:t></w:r></w:p>" for line in sidebar)
+    anchor._p.append(parse_xml(TEXT_BOX_RUN.replace("{id}", "1").replace("{paragraphs}", box)))
+
+    table = document.add_table(rows=0, cols=2)
+    for name, level in skills:
+        cells = table.add_row().cells
+        cells[0].text, cells[1].text = name, level
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
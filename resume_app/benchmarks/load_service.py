@@ -0,0 +1,138 @@
+"""
+Load test for service.py: p50/p99 latency and throughput at increasing concurrency.
+
+    python benchmarks/load_service.py                        # starts a local service in-process
+    python benchmarks/load_service.py --port 8765 --no-start # targets an already running service
+    python benchmarks/load_service.py --concurrency 1 4 16 64 --requests 200 --pdf
+
+Every client sends the same generated resume and posting, so after the first request the
+service's result cache answers most of them; pass --unique to vary the posting per request and
+measure full analyses instead. 429 (backpressure) and other non-200 answers are counted
+separately and left out of the latency percentiles.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import make_job_text, make_pdf, make_resume_text  # noqa: E402
+from service import AnalysisService  # noqa: E402
+
+DEFAULT_CONCURRENCY = (1, 2, 4, 8, 16, 32)
+
+
+async def request(host, port, method, path, payload=None):
+    """Sends one HTTP request and returns (status, headers, body bytes); chunked bodies are decoded."""
+    reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding") == "chunked":
+        chunks = []
+        while size := int(await reader.readline(), 16):
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        data = b"".join(chunks)
+    elif "content-length" in headers:
+        data = await reader.readexactly(int(headers["content-length"]))
+    else:
+        data = await reader.read()
+    writer.close()
+    return status, headers, data
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def run_level(host, port, concurrency, total, make_payload):
+    """Sends `total` requests from `concurrency` clients; returns latencies (s) of 200s and status counts."""
+    latencies = []
+    statuses = {}
+    counter = iter(range(total))
+
+    async def client():
+        for number in counter:
+            start = time.perf_counter()
+            status, _, _ = await request(host, port, "POST", "/analyze", make_payload(number))
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return sorted(latencies), statuses, time.perf_counter() - start
+
+
+async def load_test(args):
+    service = server = None
+    port = args.port
+    if not args.no_start:
+        service = AnalysisService(args.workers, args.max_pending, warm=not args.cold)
+        server = await service.start(args.host, args.port)
+        port = server.sockets[0].getsockname()[1]
+    resume = make_resume_text(args.resume_size)
+    if args.pdf:
+        resume_fields = {"resume": base64.b64encode(make_pdf([resume])).decode("ascii"), "filename": "bench.pdf"}
+    else:
+        resume_fields = {"resume_text": resume}
+    job = make_job_text(args.job_size)
+
+    def make_payload(number):
+        job_text = f"{job}\nPosting {number}" if args.unique else job
+        return {**resume_fields, "job_text": job_text, "company_name": "Acme"}
+
+    print(f"{'clients':>8} {'ok':>6} {'429':>6} {'other':>6} {'p50 ms':>9} {'p99 ms':>9} {'req/s':>8}")
+    try:
+        for concurrency in args.concurrency:
+            latencies, statuses, seconds = await run_level(args.host, port, concurrency, args.requests, make_payload)
+            ok = statuses.get(200, 0)
+            rejected = statuses.get(429, 0)
+            print(f"{concurrency:>8} {ok:>6} {rejected:>6} {args.requests - ok - rejected:>6} "
+                  f"{percentile(latencies, 0.5) * 1000:>9.1f} {percentile(latencies, 0.99) * 1000:>9.1f} "
+                  f"{args.requests / seconds:>8.1f}")
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+            service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the local analysis service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="service port (default: a free port for the in-process service)")
+    parser.add_argument("--no-start", action="store_true", help="do not start a service, target --host/--port")
+    parser.add_argument("--workers", type=int, default=None, help="workers of the in-process service")
+    parser.add_argument("--max-pending", type=int, default=None, help="queue limit of the in-process service")
+    parser.add_argument("--cold", action="store_true", help="in-process service without warmed workers")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=list(DEFAULT_CONCURRENCY))
+    parser.add_argument("--requests", type=int, default=100, help="requests per concurrency level")
+    parser.add_argument("--resume-size", type=int, default=4000, help="characters of generated resume text")
+    parser.add_argument("--job-size", type=int, default=2000, help="characters of generated posting text")
+    parser.add_argument("--pdf", action="store_true", help="upload the resume as a generated PDF")
+    parser.add_argument("--unique", action="store_true", help="vary the posting so no request hits the cache")
+    args = parser.parse_args(argv)
+    if args.no_start and not args.port:
+        parser.error("--no-start needs --port")
+    asyncio.run(load_test(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
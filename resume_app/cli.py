@@ -0,0 +1,233 @@
+"""
+Headless bulk analysis: every resume in a directory against every job posting in another,
+written as one JSON line per (resume, job) pair as soon as it is ready.
+
+    python cli.py --resumes resumes/ --jobs postings/ --company "Acme" --workers 4 --output results.jsonl
+    python cli.py --resumes resumes/ --jobs feed/ --dedup-threshold 0.8 --output results.jsonl
+
+Re-running with the same --output skips pairs already recorded there, so a crashed run
+picks up where it stopped (failed pairs are retried, and their error lines are replaced by
+the new records, so each pair appears once). With --dedup-threshold, postings whose
+text is a near-duplicate of an earlier one (reposts, location variants, tracking footers) are
+not analyzed again: the earlier posting's result is written for them too.
+"""
+import argparse
+import json
+import os
+import sys
+import traceback
+from collections import namedtuple
+from contextlib import nullcontext
+from functools import lru_cache
+
+from batch import BatchResult, IN_FLIGHT_PER_WORKER, bounded_imap
+from dedup import PostingDeduplicator, timed_call
+from extractor import RESUME_TYPES, extract_resume_text_cached, extract_text_from_html, open_resume_file, preprocess
+from matcher import analyze_resume_against_job
+from workers import create_pool
+
+RESUME_EXTENSIONS = tuple(RESUME_TYPES)
+JOB_EXTENSIONS = (".txt", ".html", ".htm")
+
+# Documents kept preprocessed per worker, so a resume is not re-parsed for each posting
+RESUME_CACHE_SIZE = 16
+JOB_CACHE_SIZE = 256
+
+
+def find_files(root, extensions):
+    """Yields paths under `root` (recursively, sorted) whose extension is in `extensions`."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.lower().endswith(extensions):
+                yield os.path.join(dirpath, filename)
+
+
+def read_job_text(path):
+    """Reads a text or HTML job posting."""
+    with open(path, "r", encoding="utf-8", errors="replace") as file:
+        text = file.read()
+    if path.lower().endswith((".html", ".htm")):
+        return extract_text_from_html(text)
+    return text
+
+
+# A document that could not be loaded, with the formatted exception; cached in the document's
+# place, so a broken file is only parsed once per worker
+LoadFailure = namedtuple("LoadFailure", ["error"])
+
+
+def _load_or_failure(load, *args):
+    try:
+        return load(*args)
+    except Exception:
+        return LoadFailure(traceback.format_exc())
+
+
+def _resume_doc(path, company_name, lemma_mode):
+    return preprocess(extract_resume_text_cached(open_resume_file(path)), company_name=company_name, lemma_mode=lemma_mode)
+
+
+def _job_doc(path, company_name, lemma_mode):
+    return preprocess(read_job_text(path), company_name=company_name, lemma_mode=lemma_mode)
+
+
+@lru_cache(maxsize=RESUME_CACHE_SIZE)
+def load_resume(path, company_name, lemma_mode):
+    """The preprocessed resume, or a LoadFailure (cached too, so a broken file is not parsed for every posting)."""
+    return _load_or_failure(_resume_doc, path, company_name, lemma_mode)
+
+
+@lru_cache(maxsize=JOB_CACHE_SIZE)
+def load_job(path, company_name, lemma_mode):
+    """The preprocessed posting, or a LoadFailure (see load_resume)."""
+    return _load_or_failure(_job_doc, path, company_name, lemma_mode)
+
+
+def analyze_pair(resume_path, job_path, company_name, top_n, lemma_mode):
+    """Extracts and analyzes one (resume, job) pair; errors are returned, never raised."""
+    key = (resume_path, job_path)
+    resume_doc = load_resume(resume_path, company_name, lemma_mode)
+    if isinstance(resume_doc, LoadFailure):
+        return BatchResult(key, None, resume_doc.error)
+    job_doc = load_job(job_path, company_name, lemma_mode)
+    if isinstance(job_doc, LoadFailure):
+        return BatchResult(key, None, job_doc.error)
+    try:
+        return BatchResult(key, analyze_resume_against_job(resume_doc, job_doc, top_n=top_n), None)
+    except Exception:
+        return BatchResult(key, None, traceback.format_exc())
+
+
+def _checkpoint_pair(line):
+    """(resume, job) of a successful record line, None for failed records and lines that are not records."""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict) or record.get("error") is not None:
+        return None
+    resume, job = record.get("resume"), record.get("job")
+    return (resume, job) if isinstance(resume, str) and isinstance(job, str) else None
+
+
+def read_checkpoint(output_path):
+    """
+    Returns the (resume, job) pairs already recorded in `output_path`. A partially written
+    last line (from a crash mid-write) is cut off so new lines are appended cleanly, and
+    error lines (their pairs are retried) and lines that are not records are dropped.
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    complete = 0  # byte offset just past the last complete line
+    stale = False  # some complete line has to be dropped
+    with open(output_path, "rb+") as file:
+        for line in file:
+            if not line.endswith(b"\n"):
+                break
+            complete += len(line)
+            pair = _checkpoint_pair(line)
+            if pair is None:
+                stale = True
+            else:
+                done.add(pair)
+        file.truncate(complete)
+    if stale:
+        # Rewrite the successful lines only, switched in atomically so a crash keeps the old file
+        temp_path = output_path + ".tmp"
+        with open(output_path, "rb") as source, open(temp_path, "wb") as target:
+            target.writelines(line for line in source if _checkpoint_pair(line) is not None)
+        os.replace(temp_path, output_path)
+    return done
+
+
+def to_record(batch_result):
+    resume_path, job_path = batch_result.key
+    return {"resume": resume_path, "job": job_path, "result": batch_result.result, "error": batch_result.error}
+
+
+def cluster_jobs(job_paths, dedup, company_name=None):
+    """{representative path: [member paths, representative first]} of near-duplicate postings."""
+    clusters = {}
+    for path in job_paths:
+        try:
+            text = read_job_text(path)
+        except Exception:
+            text = None  # analyzed on its own, analyze_pair reports the error
+        clusters.setdefault(dedup.representative(path, text, company_name), []).append(path)
+    return clusters
+
+
+def run(resume_dir, job_dir, output, company_name=None, workers=None, top_n=5, lemma_mode="context", dedup=None):
+    """
+    Analyzes every resume under `resume_dir` against every posting under `job_dir` and writes
+    one JSON line per pair to `output` (a path, or "-" for stdout). Pairs already present in an
+    existing output file are skipped. Returns (written, failed) counts.
+    With a dedup.PostingDeduplicator, each cluster of near-duplicate postings is analyzed once
+    per resume and the result is written for every member.
+    """
+    done = read_checkpoint(output) if output != "-" else set()
+    job_paths = list(find_files(job_dir, JOB_EXTENSIONS))
+    if dedup is None:
+        clusters = {path: [path] for path in job_paths}
+    else:
+        clusters = cluster_jobs(job_paths, dedup, company_name)
+    arg_tuples = (
+        (analyze_pair, resume_path, job_path, company_name, top_n, lemma_mode)
+        for resume_path in find_files(resume_dir, RESUME_EXTENSIONS)
+        for job_path, members in clusters.items()
+        if any((resume_path, member) not in done for member in members)
+    )
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    out = sys.stdout if output == "-" else open(output, "a", encoding="utf-8")
+    written = failed = 0
+    try:
+        with create_pool(workers) if workers > 1 else nullcontext() as pool:
+            if pool is None:
+                results = (timed_call(*args) for args in arg_tuples)
+            else:
+                results = bounded_imap(pool, timed_call, arg_tuples, workers * IN_FLIGHT_PER_WORKER)
+            for batch_result, seconds in results:
+                resume_path, job_path = batch_result.key
+                members = [member for member in clusters[job_path] if (resume_path, member) not in done]
+                if dedup is not None:
+                    dedup.record_analysis(seconds)
+                    dedup.record_reuse(len(members) - (job_path in members))
+                for member in members:
+                    out.write(json.dumps(to_record(batch_result._replace(key=(resume_path, member)))) + "\n")
+                    written += 1
+                    failed += batch_result.error is not None
+                out.flush()  # each line is a checkpoint
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return written, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a directory of resumes against a directory of job postings.")
+    parser.add_argument("--resumes", required=True, help="directory of PDF/DOCX resumes")
+    parser.add_argument("--jobs", required=True, help="directory of .txt/.html job postings")
+    parser.add_argument("--output", default="-", help="JSONL output file, also used as the checkpoint (default: stdout)")
+    parser.add_argument("--company", default=None, help="company name to exclude from the analysis")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count, 1 runs inline)")
+    parser.add_argument("--top-n", type=int, default=5, help="number of top job keywords/bigrams to match")
+    parser.add_argument("--lemma-mode", default="context", choices=["context", "token"])
+    parser.add_argument("--dedup-threshold", type=float, default=None,
+                        help="analyze postings at least this similar (Jaccard, e.g. 0.8) only once")
+    args = parser.parse_args(argv)
+
+    dedup = PostingDeduplicator(args.dedup_threshold) if args.dedup_threshold is not None else None
+    written, failed = run(args.resumes, args.jobs, args.output, args.company, args.workers, args.top_n, args.lemma_mode,
+                          dedup)
+    print(f"{written} results written, {failed} failed", file=sys.stderr)
+    if dedup is not None:
+        print(dedup.report(), file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+import os
+import re
+import tempfile
+from functools import lru_cache
+
+import nltk
+import pytest
+
+# Keep on-disk caches written during tests out of the user's home directory
+os.environ.setdefault("RESUME_ANALYZER_CACHE_DIR", tempfile.mkdtemp(prefix="resume_analyzer_test_cache_"))
+
+
+@lru_cache(maxsize=None)
+def nltk_data_available():
+    """True when the tagger and WordNet are installed locally (tests needing them are skipped otherwise)."""
+    try:
+        nltk.data.find("taggers/averaged_perceptron_tagger_eng")
+        nltk.data.find("corpora/wordnet")
+    except LookupError:
+        return False
+    return True
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "needs_nltk_data: skip the test when the NLTK tagger/WordNet data is missing")
+
+
+def pytest_runtest_setup(item):
+    if item.get_closest_marker("needs_nltk_data") and not nltk_data_available():
+        pytest.skip("NLTK tagger/WordNet data not installed")
+
+
+@pytest.fixture
+def table_lemmas(tmp_path, monkeypatch):
+    """
+    Call it with some texts: installs (and returns) a new default analyzer whose lemma table
+    covers every word of them (plurals lose their "s"), so "token" mode lemmatization needs no NLTK data.
+    """
+    import analyzer
+    from lemma_table import pos_key, write_table
+
+    def install(*texts):
+        words = {word for text in texts for word in re.findall(r"\w+", text.lower())}
+        entries = {word: word[:-1] if word.endswith("s") and len(word) > 3 else word for word in words}
+        entries.update({pos_key(word, pos): lemma for word, lemma in list(entries.items()) for pos in "nvar"})
+        path = str(tmp_path / "lemmas.bin")
+        write_table(entries, path, analyzer.lemma_rules_fingerprint())
+        monkeypatch.setattr(analyzer, "default_analyzer", analyzer.Analyzer(lemma_table_path=path))
+        return analyzer.default_analyzer
+
+    yield install
+    analyzer.default_analyzer.close()
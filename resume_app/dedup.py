@@ -0,0 +1,171 @@
+import time
+import unicodedata
+import zlib
+
+from extractor import TOKEN_PATTERN
+
+# Words per shingle: long enough that unrelated postings share few shingles
+SHINGLE_SIZE = 5
+# MinHash values per signature; LSH splits them into bands
+NUM_PERM = 128
+# Jaccard similarity of the shingle sets above which two postings count as duplicates
+DEFAULT_THRESHOLD = 0.8
+
+
+def normalize_posting(text):
+    """NFKC-normalized, lowercase word list of a posting (punctuation and layout dropped)."""
+    return TOKEN_PATTERN.findall(unicodedata.normalize("NFKC", text).lower())
+
+
+def shingles(words, size=SHINGLE_SIZE):
+    """crc32 hashes of every `size`-word window of `words` (the whole text if it is shorter)."""
+    if len(words) <= size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))}
+    return {zlib.crc32(" ".join(words[i:i + size]).encode("utf-8")) for i in range(len(words) - size + 1)}
+
+
+def lsh_bands(threshold, num_perm=NUM_PERM):
+    """
+    (bands, rows) with bands * rows <= num_perm whose S-curve midpoint (1 / bands) ** (1 / rows)
+    is closest to `threshold`: pairs above it almost always share a band, pairs well below rarely do.
+    """
+    candidates = ((num_perm // rows, rows) for rows in range(1, num_perm + 1))
+    return min(candidates, key=lambda band_rows: abs((1 / band_rows[0]) ** (1 / band_rows[1]) - threshold))
+
+
+class MinHasher:
+    """
+    MinHash signatures with `num_perm` multiply-shift hash functions of the 32-bit shingle hashes.
+    The fraction of equal positions in two signatures estimates the Jaccard similarity of the sets.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        import numpy as np  # only needed once postings are deduplicated, keeps module import cheap
+
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, 2**63, num_perm, dtype=np.uint64) | np.uint64(1)  # odd multipliers
+        self._b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+
+    def signature(self, hashes):
+        import numpy as np
+
+        values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+        # (a * x + b) mod 2**64 >> 32, one row per hash function; uint64 arithmetic wraps as needed
+        return ((np.outer(self._a, values) + self._b[:, None]) >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+
+def similarity(signature, other):
+    """Estimated Jaccard similarity of the sets behind two MinHash signatures."""
+    return float((signature == other).mean())
+
+
+class NearDuplicateIndex:
+    """
+    Clusters texts whose estimated Jaccard similarity (over SHINGLE_SIZE-word shingles) is at
+    least `threshold`. `add` returns the key of the cluster the text joined: the first text of a
+    cluster is its representative, later texts join the most similar representative among the
+    LSH candidates. Only representatives are indexed, so clusters never chain through members.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE):
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm)
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+        self.buckets = [{} for _ in range(self.bands)]  # band -> {band bytes: [representative key, ...]}
+        self.signatures = {}  # representative key -> signature
+        self.clusters = {}  # representative key -> [member keys], representative first
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [signature[band * rows:(band + 1) * rows].tobytes() for band in range(self.bands)]
+
+    def add(self, key, text):
+        signature = self.hasher.signature(shingles(normalize_posting(text), self.shingle_size))
+        band_keys = self._band_keys(signature)
+        best, best_similarity = None, self.threshold
+        seen = set()
+        for bucket, band_key in zip(self.buckets, band_keys):
+            for candidate in bucket.get(band_key, ()):
+                if candidate not in seen:
+                    seen.add(candidate)
+                    score = similarity(signature, self.signatures[candidate])
+                    if score >= best_similarity:
+                        best, best_similarity = candidate, score
+        if best is not None:
+            self.clusters[best].append(key)
+            return best
+        self.signatures[key] = signature
+        self.clusters[key] = [key]
+        for bucket, band_key in zip(self.buckets, band_keys):
+            bucket.setdefault(band_key, []).append(key)
+        return key
+
+
+class PostingDeduplicator:
+    """
+    Dedup stage for batch runs: postings are clustered by NearDuplicateIndex (one index per company
+    name, since the company changes the analysis), each cluster is analyzed once and its result is
+    fanned out to the other members. Callers report each analysis they run (record_analysis) and
+    each result they copy to a duplicate (record_reuse), which gives the numbers for `report`.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.indexes = {}  # company name -> NearDuplicateIndex
+        self.postings = 0
+        self.duplicates = 0
+        self.analyzed = 0  # analyses run
+        self.reused = 0  # analyses skipped, their result copied from a duplicate's
+        self.analysis_seconds = 0.0  # summed time of the analyses that did run
+        self.dedup_seconds = 0.0  # time spent clustering
+
+    def representative(self, key, text, company_name=None):
+        """Key of the posting whose analysis `key` can reuse (`key` itself for a new cluster)."""
+        start = time.perf_counter()
+        self.postings += 1
+        if not isinstance(text, str):
+            representative = key  # not a text, analyzed on its own (and reported as failed there)
+        else:
+            index = self.indexes.get(company_name)
+            if index is None:
+                index = self.indexes[company_name] = NearDuplicateIndex(
+                    self.threshold, self.num_perm, self.shingle_size
+                )
+            representative = index.add(key, text)
+        self.duplicates += representative != key
+        self.dedup_seconds += time.perf_counter() - start
+        return representative
+
+    def record_analysis(self, seconds):
+        self.analyzed += 1
+        self.analysis_seconds += seconds
+
+    def record_reuse(self, count=1):
+        self.reused += count
+
+    @property
+    def ratio(self):
+        """Share of the postings that were duplicates (their analysis was skipped)."""
+        return self.duplicates / self.postings if self.postings else 0.0
+
+    @property
+    def seconds_saved(self):
+        """Estimated analysis time skipped (reused results x mean analysis time), minus the clustering time."""
+        if not self.analyzed:
+            return 0.0
+        return self.reused * self.analysis_seconds / self.analyzed - self.dedup_seconds
+
+    def report(self):
+        return (f"{self.postings} postings, {self.duplicates} near-duplicates ({self.ratio:.1%}), "
+                f"{self.analyzed} analyses run, {self.reused} reused, ~{self.seconds_saved:.1f}s saved")
+
+
+def timed_call(fn, *args):
+    """Returns (fn(*args), seconds taken); a module-level function, so it can be sent to worker processes."""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
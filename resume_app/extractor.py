@@ -1,36 +1,330 @@
+import io
+import os
 import re
-import pdfplumber
-from docx import Document
-import nltk
+import time
 import unicodedata
-from collections import Counter
+import zipfile
+from bisect import bisect_left
+from collections import Counter, namedtuple
 
 from analyzer import (
+    COMPANY,
     load_excluded_words,
-    lemmatize_word,
+    phrase_scanner,
+    lemmatize_tokens,
     calculate_importance,
     normalize_token,
 )
+from cache import CACHE_DIR, DiskCache, sha256_hex
+from instrumentation import COUNTING, EXTRACTION, LEMMATIZATION, TOKENIZATION, increment, span
+from phrase_mining import iter_ngrams
+from vocabulary import Vocabulary, count_keys, pack_pairs
 
+PDF_TYPE = "application/pdf"
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+# File extension -> MIME type, for resumes read from disk instead of uploaded
+RESUME_TYPES = {".pdf": PDF_TYPE, ".docx": DOCX_TYPE}
 
-def extract_resume_text(uploaded_file):
-    """Extracts text from a PDF or DOCX resume uploaded via Streamlit."""
+
+class ResumeFile(io.BytesIO):
+    """In-memory file with the same `.name` and `.type` attributes as Streamlit's UploadedFile."""
+
+    def __init__(self, data, name, type):
+        super().__init__(data)
+        self.name = name
+        self.type = type
+
+
+def open_resume_file(path):
+    """Reads a PDF/DOCX resume from disk into a ResumeFile that extract_resume_text accepts."""
+    file_type = RESUME_TYPES.get(os.path.splitext(path)[1].lower(), "")
+    with open(path, "rb") as file:
+        return ResumeFile(file.read(), os.path.basename(path), file_type)
+
+
+# PDF text extraction backends: pdfplumber keeps the layout, PyPDF2 is lighter and text-only
+PDF_BACKENDS = ("pdfplumber", "pypdf2")
+# Limits for untrusted uploads: pages read, characters kept and seconds spent on one resume.
+# Extraction is unlimited by default; the UI and the service opt in with **UPLOAD_LIMITS.
+MAX_PDF_PAGES = 10
+MAX_TEXT_CHARS = 200_000
+# Soft budget, checked between pages: one slow page can still overrun it (the service's task
+# timeout is the hard bound)
+PDF_TIME_BUDGET = 20.0
+UPLOAD_LIMITS = {"max_pages": MAX_PDF_PAGES, "max_chars": MAX_TEXT_CHARS, "time_budget": PDF_TIME_BUDGET}
+
+# Extracted text and the limit that cut it short: None, "pages", "chars" or "time"
+Extraction = namedtuple("Extraction", ["text", "truncated"])
+
+
+def _pdf_page_texts(file, backend):
+    """Yields the page count of a PDF, then the text of each page (see iter_pdf_pages)."""
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend {backend!r}, expected one of {PDF_BACKENDS}")
+    # pdfplumber / PyPDF2 are imported here so importing extractor stays cheap
+    if backend == "pdfplumber":
+        import pdfplumber
+
+        with pdfplumber.open(file) as pdf:
+            yield len(pdf.pages)
+            for page in pdf.pages:
+                try:
+                    yield page.extract_text() or ""
+                finally:
+                    page.close()
+    else:
+        from PyPDF2 import PdfReader
+
+        pages = PdfReader(file).pages
+        yield len(pages)
+        for page in pages:
+            yield page.extract_text() or ""
+
+
+def iter_pdf_pages(file, backend="pdfplumber"):
+    """
+    Yields the text of each page of a PDF, one page at a time, so callers can stop early.
+    pdfplumber pages are closed as soon as they are read to release their cached objects.
+    """
+    pages = _pdf_page_texts(file, backend)
+    next(pages)  # page count
+    yield from pages
+
+
+def _truncated_text(texts, max_chars):
+    text = "\n".join(texts)
+    return text[:max_chars] if max_chars is not None else text
+
+
+def extract_pdf_text(file, backend="pdfplumber", max_pages=None, max_chars=None, time_budget=None):
+    """
+    Joins PDF page texts into an Extraction, stopping after `max_pages` pages, past `max_chars`
+    characters, or when `time_budget` seconds have passed (checked between pages).
+    """
+    texts = []
+    collected = -1  # length of the joined text so far
+    truncated = None
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
+    pages = _pdf_page_texts(file, backend)
+    try:
+        page_count = next(pages)
+        for page_number, page_text in enumerate(pages, 1):
+            texts.append(page_text)
+            collected += len(page_text) + 1
+            if max_chars is not None and collected > max_chars:
+                truncated = "chars"
+                break
+            if page_number == page_count:
+                break
+            if max_pages is not None and page_number >= max_pages:
+                truncated = "pages"
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                truncated = "time"
+                break
+    finally:
+        pages.close()  # closes the PDF right away when we stop early
+    return Extraction(_truncated_text(texts, max_chars), truncated)
+
+
+# DOCX text extraction backends: "xml" stream-parses the package parts (body, tables, text
+# boxes, headers and footers), "python-docx" builds the full object model and reads body paragraphs only
+DOCX_BACKENDS = ("xml", "python-docx")
+
+WORDML = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+DOCX_PARAGRAPH, DOCX_RUN, DOCX_TEXT = WORDML + "p", WORDML + "r", WORDML + "t"
+DOCX_BREAKS = {WORDML + "tab": "\t", WORDML + "br": "\n", WORDML + "cr": "\n", WORDML + "noBreakHyphen": "-"}
+# Elements whose direct children are the top-level blocks of a part (freed once parsed)
+DOCX_CONTAINERS = {WORDML + "body", WORDML + "hdr", WORDML + "ftr"}
+# Word writes text boxes twice: DrawingML in mc:Choice and a VML copy in mc:Fallback, which is skipped
+DOCX_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+DOCX_BODY = "word/document.xml"
+DOCX_HEADER_FOOTER = re.compile(r"word/(header|footer)(\d*)\.xml")
+
+
+def docx_parts(names):
+    """Parts of a DOCX package holding text, in reading order: headers, the body, then footers."""
+    found = {"header": [], "footer": []}
+    for name in names:
+        match = DOCX_HEADER_FOOTER.fullmatch(name)
+        if match:
+            found[match.group(1)].append((int(match.group(2) or 0), name))
+    return [name for _, name in sorted(found["header"])] + [DOCX_BODY] + [name for _, name in sorted(found["footer"])]
+
+
+def iter_docx_part_paragraphs(stream):
+    """
+    Yields the text of every paragraph of one WordprocessingML part (table cells and text boxes
+    included) while the XML is parsed incrementally; finished top-level blocks are cleared, so
+    memory stays bounded by the largest paragraph or table. A text box paragraph comes out
+    before the paragraph it is anchored in.
+    """
+    from xml.etree.ElementTree import iterparse
+
+    tags = []  # tags of the open elements, innermost last
+    paragraphs = []  # text pieces of the open paragraphs, innermost last (text boxes nest them)
+    skipping = 0  # depth inside mc:Fallback
+    container, container_depth = None, None
+    for event, element in iterparse(stream, events=("start", "end")):
+        tag = element.tag
+        if event == "start":
+            tags.append(tag)
+            if tag == DOCX_FALLBACK:
+                skipping += 1
+            elif tag == DOCX_PARAGRAPH and not skipping:
+                paragraphs.append([])
+            elif tag in DOCX_CONTAINERS and container is None:
+                container, container_depth = element, len(tags)
+            continue
+        tags.pop()
+        if tag == DOCX_FALLBACK:
+            skipping -= 1
+        elif skipping or not paragraphs:
+            pass
+        elif tag == DOCX_TEXT:
+            paragraphs[-1].append(element.text or "")
+        elif tag in DOCX_BREAKS and tags and tags[-1] == DOCX_RUN:  # w:tab also defines tab stops in w:pPr
+            paragraphs[-1].append(DOCX_BREAKS[tag])
+        elif tag == DOCX_PARAGRAPH:
+            yield "".join(paragraphs.pop())
+        if len(tags) == container_depth:
+            container.clear()
+
+
+def iter_docx_paragraphs(file):
+    """
+    Yields the paragraphs of a DOCX file part by part (see docx_parts) without building a
+    document model. Header/footer parts with the same text as an earlier one (first page,
+    even page and default variants) are only read once.
+    """
+    with zipfile.ZipFile(file) as archive:
+        names = set(archive.namelist())
+        seen = set()
+        for name in docx_parts(names):
+            with archive.open(name) as stream:
+                if name == DOCX_BODY:
+                    yield from iter_docx_part_paragraphs(stream)
+                    continue
+                paragraphs = tuple(iter_docx_part_paragraphs(stream))
+            if paragraphs not in seen:
+                seen.add(paragraphs)
+                yield from paragraphs
+
+
+def extract_docx_text(file, backend="xml", max_chars=None):
+    """Joins the paragraphs of a DOCX file into an Extraction, stopping past `max_chars` characters."""
+    if backend not in DOCX_BACKENDS:
+        raise ValueError(f"Unknown DOCX backend {backend!r}, expected one of {DOCX_BACKENDS}")
+    if backend == "python-docx":
+        # Imported here so importing extractor stays cheap
+        from docx import Document
+
+        paragraphs = (paragraph.text for paragraph in Document(file).paragraphs)
+    else:
+        paragraphs = iter_docx_paragraphs(file)
+    texts = []
+    collected = -1  # length of the joined text so far
+    truncated = None
+    try:
+        for text in paragraphs:
+            texts.append(text)
+            collected += len(text) + 1
+            if max_chars is not None and collected > max_chars:
+                truncated = "chars"
+                break
+    finally:
+        if hasattr(paragraphs, "close"):
+            paragraphs.close()  # closes the archive right away when we stop early
+    return Extraction(_truncated_text(texts, max_chars), truncated)
+
+
+def extract_resume(uploaded_file, pdf_backend="pdfplumber", max_pages=None, max_chars=None, time_budget=None):
+    """
+    Extracts the text of a PDF or DOCX resume uploaded via Streamlit as an Extraction, whose
+    `truncated` tells callers to warn that only part of the file was read. PDFs are read page
+    by page within the given limits (see extract_pdf_text); DOCX files are stream-parsed,
+    tables, text boxes, headers and footers included (see iter_docx_paragraphs), up to
+    `max_chars` characters. Nothing is cut off unless limits are passed (see UPLOAD_LIMITS).
+    """
+    if not uploaded_file:
+        return Extraction("", None) #if no file is provided return empty string
+
+    with span(EXTRACTION):
+        file_type = uploaded_file.type
+        if file_type == PDF_TYPE:
+            extraction = extract_pdf_text(uploaded_file, pdf_backend, max_pages, max_chars, time_budget)
+        elif file_type == DOCX_TYPE:
+            extraction = extract_docx_text(uploaded_file, max_chars=max_chars)
+        else:
+            return Extraction("", None) #if not DOCX or PDF return empty string
+    if extraction.truncated:
+        increment("extraction.truncated")
+    return extraction
+
+
+def extract_resume_text(uploaded_file, pdf_backend="pdfplumber", max_pages=None, max_chars=None, time_budget=None):
+    """Text of a PDF or DOCX resume uploaded via Streamlit (see extract_resume)."""
+    return extract_resume(uploaded_file, pdf_backend, max_pages, max_chars, time_budget).text
+
+
+# Bump whenever a change to the extraction code changes its output, so older cached text is not reused
+EXTRACTOR_VERSION = 4
+TEXT_CACHE_PATH = os.path.join(CACHE_DIR, "extracted_text.sqlite")
+TEXT_CACHE_MAX_BYTES = 64 * 2**20
+
+# Shared on-disk cache of extracted resume text, opened by get_text_cache on first use
+text_cache = None
+
+
+def get_text_cache():
+    global text_cache
+    if text_cache is None:
+        text_cache = DiskCache(TEXT_CACHE_PATH, max_bytes=TEXT_CACHE_MAX_BYTES)
+    return text_cache
+
+
+def read_upload_bytes(uploaded_file):
+    """Returns the full contents of an uploaded file without moving its read position."""
+    if hasattr(uploaded_file, "getvalue"):
+        return uploaded_file.getvalue()
+    position = uploaded_file.tell()
+    uploaded_file.seek(0)
+    data = uploaded_file.read()
+    uploaded_file.seek(position)
+    return data
+
+
+def extract_resume_cached(uploaded_file, cache=None, pdf_backend="pdfplumber", max_pages=None, max_chars=None,
+                          time_budget=None):
+    """
+    Same as extract_resume, but the Extraction is stored in an on-disk cache keyed by the
+    SHA-256 of the file bytes, EXTRACTOR_VERSION and the extraction options, so the same
+    file is only ever parsed once. Text cut short by the time budget is not stored, since
+    another run may get further. `cache` defaults to the shared get_text_cache().
+    """
     if not uploaded_file:
-        return "" #if no file is provided return empty string
+        return Extraction("", None)
+    cache = cache if cache is not None else get_text_cache()
+    key = ":".join([
+        f"v{EXTRACTOR_VERSION}", uploaded_file.type, pdf_backend, str(max_pages), str(max_chars),
+        sha256_hex(read_upload_bytes(uploaded_file)),
+    ])
+    cached = cache.get(key)
+    if cached is not None:
+        increment("text_cache.hits")
+        truncated, text = cached.decode("utf-8").split("\n", 1)
+        return Extraction(text, truncated or None)
+    increment("text_cache.misses")
+    extraction = extract_resume(uploaded_file, pdf_backend, max_pages, max_chars, time_budget)
+    if extraction.truncated != "time":
+        cache.put(key, f"{extraction.truncated or ''}\n{extraction.text}".encode("utf-8"))
+    return extraction
 
-    file_type = uploaded_file.type
-    if file_type == "application/pdf":
-        with pdfplumber.open(uploaded_file) as pdf:
-            return "\n".join(page.extract_text() or "" for page in pdf.pages) #return all lines as a single text
-    elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        # Extract text from DOCX using python-docx
-        doc = Document(uploaded_file)
-        text = []
-        for paragraph in doc.paragraphs:
-            text.append(paragraph.text)
-        return "\n".join(text)  # Return all paragraphs as a single text
 
-    return "" #if not DOCX or PDF return empty string
+def extract_resume_text_cached(uploaded_file, cache=None, pdf_backend="pdfplumber", max_pages=None, max_chars=None,
+                               time_budget=None):
+    """Text of a resume, cached on disk (see extract_resume_cached)."""
+    return extract_resume_cached(uploaded_file, cache, pdf_backend, max_pages, max_chars, time_budget).text
 
 
 def extract_text_from_paste(pasted_text):
@@ -43,77 +337,217 @@ def extract_text_from_paste(pasted_text):
         return "No job description provided."
 
 
-def extract_keywords(text, top_n=5, company_name=None):
+def extract_text_from_html(html):
+    """Visible text of an HTML job posting, one block per line."""
+    from bs4 import BeautifulSoup  # only needed for HTML postings
+
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript"]):
+        tag.decompose()
+    return "\n".join(line.strip() for line in soup.get_text("\n").splitlines() if line.strip())
+
+
+# Words are runs of letters/digits/underscore, same as the old re.findall(r"\b\w+\b", ...)
+TOKEN_PATTERN = re.compile(r"\b\w+\b")
+
+
+def blank_spans(text, spans):
+    """Replaces each (start, end) span of `text` with spaces, keeping every other offset unchanged."""
+    pieces = []
+    position = 0
+    for start, end in sorted(spans):
+        start = max(start, position)
+        if end > start:
+            pieces.append(text[position:start])
+            pieces.append(" " * (end - start))
+            position = end
+    pieces.append(text[position:])
+    return "".join(pieces)
+
+
+def top_terms(counts, top_n=5):
+    """
+    Turns a Counter into [(term, count, importance_score), ...] sorted by count,
+    keeping only terms seen more than once. top_n=None keeps all of them.
+    """
+    importance_scores = calculate_importance(counts) #make them fit a scale of 1-10
+    return [
+        (term, count, importance_scores[term])
+        for term, count in counts.most_common(top_n)
+        if count > 1
+    ]
+
+
+def encode_text(text, vocabulary, excluded_words, company_name=None, lemma_mode="context", emphasis_boost=0):
+    """
+    Tokenizes, normalizes, filters and lemmatizes `text`. Returns (token count, `vocabulary`
+    ids of the lemmas of the non-excluded tokens, Counter of emphasis boosts by lemma, boost of
+    the emphasis phrases with no word after them in `text`, which the text that follows would get).
+    """
+    # One scan finds the company name (full name + abbreviation, whole words only) and the
+    # emphasis phrases; company matches are blanked out so offsets stay valid
+    with span(TOKENIZATION):
+        text = text.lower()
+        company_spans = []
+        emphasis_ends = []
+        for start, end, kind in phrase_scanner(company_name).finditer(text):
+            if kind == COMPANY:
+                company_spans.append((start, end))
+            elif emphasis_boost:
+                emphasis_ends.append(end)
+        if company_spans:
+            text = blank_spans(text, company_spans)
+
+        # Tokenize (text is already lowercase to standardize), then normalize tokens
+        token_matches = list(TOKEN_PATTERN.finditer(text))
+        normalized_tokens = [normalize_token(match.group()) for match in token_matches]
+    #Lemmatize tokens (make them become their base form), tagging the full sequence so POS tags keep their context
+    with span(LEMMATIZATION):
+        lemmas = lemmatize_tokens(normalized_tokens, mode=lemma_mode)
+
+    increment("tokens", len(normalized_tokens))
+    token_ids = vocabulary.encode(
+        lemma for tok, lemma in zip(normalized_tokens, lemmas) if tok not in excluded_words
+    )
+    # Extra keyword weight for the first non-excluded word after each emphasis phrase
+    emphasis = Counter()
+    trailing_boost = 0
+    token_starts = [match.start() for match in token_matches]
+    for end in emphasis_ends:
+        index = bisect_left(token_starts, end)
+        while index < len(normalized_tokens) and normalized_tokens[index] in excluded_words:
+            index += 1
+        if index < len(normalized_tokens):
+            emphasis[lemmas[index]] += emphasis_boost
+        else:
+            trailing_boost += emphasis_boost
+    return len(normalized_tokens), token_ids, emphasis, trailing_boost
+
+
+class PreprocessedDocument:
+    """
+    A document tokenized, normalized, filtered and lemmatized exactly once.
+    Unigram, bigram and longer n-gram counts are all derived from the filtered lemmas, which are
+    kept as `token_ids`, a compact array of ids in the document's own `vocabulary`. Unigrams and bigrams
+    are counted on those ids (bigrams as packed 64-bit pair keys) and only turned back into
+    strings when asked for, e.g. just the top N for top_ngrams.
+    With `emphasis_boost`, the word after each analyzer.EMPHASIS_PHRASES match gets that much
+    extra unigram count (see analyzer.emphasize_target_words).
+    """
+
+    def __init__(self, text, company_name=None, lemma_mode="context", emphasis_boost=0):
+        self.company_name = company_name
+        self.lemma_mode = lemma_mode
+        self.excluded_words = load_excluded_words(company_name) #load list of common irrelevant words + company name
+        self.vocabulary = Vocabulary()
+        self.token_count, self.token_ids, self.emphasis, _ = encode_text(
+            text, self.vocabulary, self.excluded_words, company_name, lemma_mode, emphasis_boost
+        )
+        self._counts = {}
+        self._key_counts = {}
+
+    @property
+    def lemmas(self):
+        """The filtered lemmas as strings (materialized from `token_ids` on every access)."""
+        return self.vocabulary.decode(self.token_ids)
+
+    def ngrams(self, n):
+        """Yields n-gram tuples over the filtered lemmas, skipping any that contain an excluded word."""
+        excluded_words = self.excluded_words
+        for gram in iter_ngrams(self.lemmas, n):
+            if not any(word in excluded_words for word in gram):
+                yield gram
+
+    def _counted_keys(self, n):
+        """count_keys result for n = 1 (lemma ids) or 2 (packed pair keys), most common first."""
+        if n not in self._key_counts:
+            import numpy as np  # only needed once documents are counted, keeps module import cheap
+
+            with span(COUNTING):
+                ids = np.frombuffer(self.token_ids, dtype=np.uint32) if self.token_ids else np.zeros(0, np.uint32)
+                if n == 1:
+                    boosts = {self.vocabulary.id(lemma): boost for lemma, boost in self.emphasis.items()}
+                    self._key_counts[n] = count_keys(ids, boosts)
+                else:
+                    distinct = np.unique(ids)
+                    excluded = np.array(
+                        [self.vocabulary.terms[term_id] in self.excluded_words for term_id in distinct.tolist()],
+                        dtype=bool,
+                    )
+                    valid = ~excluded[np.searchsorted(distinct, ids)]
+                    self._key_counts[n] = count_keys(pack_pairs(ids, valid))
+        return self._key_counts[n]
+
+    def _key_terms(self, n, keys, counts):
+        """Yields (term, count) for counted keys, as Python strings and numbers."""
+        term_of = self.vocabulary.terms.__getitem__ if n == 1 else self.vocabulary.pair_term
+        pairs = zip(map(term_of, keys.tolist()), counts.tolist())
+        if counts.dtype.kind != "f":
+            return pairs
+        # Float emphasis boosts make the whole array float; unboosted counts stay ints
+        return ((term, count if term in self.emphasis else int(count)) for term, count in pairs)
+
+    def ngram_counts(self, n=1):
+        """Counter of n-grams joined as "w1 w2 ..."; unigrams are plain lemma counts. Computed once per n."""
+        if n not in self._counts:
+            if n <= 2:
+                # Materialized in first-occurrence order, the same order counting strings would give
+                keys, counts, first = self._counted_keys(n)
+                order = first.argsort(kind="stable")
+                self._counts[n] = Counter(dict(self._key_terms(n, keys[order], counts[order])))
+            else:
+                with span(COUNTING):
+                    self._counts[n] = Counter(" ".join(gram) for gram in self.ngrams(n))
+        return self._counts[n]
+
+    def term_counts(self, max_n=2):
+        """Unigram through `max_n`-gram counts merged into one Counter (e.g. for tfidf.TfidfModel)."""
+        counts = Counter()
+        for n in range(1, max_n + 1):
+            counts.update(self.ngram_counts(n))
+        return counts
+
+    def top_ngrams(self, n=1, top_n=5):
+        """
+        Top `top_n` n-grams as [(term, count, importance_score), ...] (see top_terms).
+        For unigrams and bigrams only the returned terms are turned into strings.
+        """
+        if n > 2:
+            return top_terms(self.ngram_counts(n), top_n)
+        keys, counts, _ = self._counted_keys(n)
+        selected = int((counts > 1).sum())
+        if top_n is not None:
+            selected = min(selected, top_n)
+        top = dict(self._key_terms(n, keys[:selected], counts[:selected]))
+        importance_scores = calculate_importance(top) #make them fit a scale of 1-10
+        return [(term, count, importance_scores[term]) for term, count in top.items()]
+
+
+def preprocess(text, company_name=None, lemma_mode="context", emphasis_boost=0):
+    """Returns `text` as a PreprocessedDocument, passing already preprocessed documents through unchanged."""
+    if isinstance(text, PreprocessedDocument):
+        return text
+    return PreprocessedDocument(text, company_name=company_name, lemma_mode=lemma_mode, emphasis_boost=emphasis_boost)
+
+
+def extract_keywords(text, top_n=5, company_name=None, lemma_mode="context", emphasis_boost=0):
     """
     Identify top `top_n` keywords (words with count > 1), excluding stop/excluded words.
     Returns list of (word, count, importance_score).
     If top_n is None, returns all words with freq > 1.
+    `text` may also be a PreprocessedDocument, in which case it is not processed again.
+    `lemma_mode` is passed to analyzer.lemmatize_tokens ("token" gives the old per-word tagging).
+    `emphasis_boost` adds that much to the count of the word after "we need", "we are looking for", ...
     """
-    if company_name:
-        text = text.replace(company_name, "")  # Remove full company name from job posting text
-        abbreviation = ''.join([w[0] for w in company_name.lower().split()])
-        text = text.replace(abbreviation, "")          # Also remove abbreviation manually
-
-    excluded_words = load_excluded_words(company_name) #load list of common irrelevant words
-    # Tokenize and convert to lowercase to standardize
-    raw_tokens = re.findall(r"\b\w+\b", text.lower())
-    # Normalize tokens
-    normalized_tokens = [normalize_token(tok) for tok in raw_tokens]
-    #Lemmatize tokens (make them become their base form)
-    filtered = [lemmatize_word(tok) for tok in normalized_tokens if tok.lower() not in excluded_words]
-
-    word_counts = Counter(filtered) #count word/token frequencies after filtering them
-    importance_scores = calculate_importance(word_counts) #make them fit a scale of 1-10
-
-    if top_n is not None:
-        # Return top `top_n` items with count > 1
-        return [
-            (w, c, importance_scores[w])
-            for w, c in word_counts.most_common(top_n)
-            if c > 1
-        ]
-    else:
-        # Return all items with freq > 1
-        return [
-            (w, c, importance_scores[w])
-            for w, c in word_counts.most_common()
-            if c > 1
-        ]
+    return preprocess(text, company_name, lemma_mode, emphasis_boost).top_ngrams(1, top_n)
 
 
-def extract_bigrams(text, top_n=5, company_name=None):
+def extract_bigrams(text, top_n=5, company_name=None, lemma_mode="context"):
     """
     Identify top `top_n` bigrams (2-word sequences), excluding any that contain excluded words.
     Returns list of ("word1 word2", count, importance_score).
     If top_n is None, returns all bigrams with freq > 1.
+    `text` may also be a PreprocessedDocument, in which case it is not processed again.
+    `lemma_mode` is passed to analyzer.lemmatize_tokens ("token" gives the old per-word tagging).
     """
-    excluded_words = load_excluded_words(company_name) #get excluded words list + company name
-    raw_tokens = re.findall(r"\b\w+\b", text.lower())
-    normalized_tokens = [normalize_token(tok) for tok in raw_tokens]
-    lemma_tokens = [lemmatize_word(tok) for tok in normalized_tokens if tok not in excluded_words] #lemmatize and filter tokens
-
-    # Generate bigrams from filtered tokens
-    bigrams_list = list(nltk.bigrams(lemma_tokens))
-    # Filter out any bigram containing excluded terms
-    bigrams_list = [
-        bg for bg in bigrams_list
-        if not any(word in excluded_words for word in bg)
-    ]
-
-    # Convert bigram to string "w1 w2"
-    bigram_strs = [" ".join(bg) for bg in bigrams_list]
-    bigram_counts = Counter(bigram_strs)
-    importance_scores = calculate_importance(bigram_counts)
-
-    if top_n is not None:
-        return [
-            (bg, cnt, importance_scores[bg])
-            for bg, cnt in bigram_counts.most_common(top_n)
-            if cnt > 1
-        ]
-    else:
-        return [
-            (bg, cnt, importance_scores[bg])
-            for bg, cnt in bigram_counts.most_common()
-            if cnt > 1
-        ]
+    return preprocess(text, company_name, lemma_mode).top_ngrams(2, top_n)
@@ -0,0 +1,121 @@
+import contextvars
+import io
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+# Stage names used by the extractor and matcher spans
+EXTRACTION = "extraction"
+TOKENIZATION = "tokenization"
+LEMMATIZATION = "lemmatization"
+COUNTING = "counting"
+MATCHING = "matching"
+ANALYSIS = "analysis"
+
+_current = contextvars.ContextVar("resume_analyzer_recorder", default=None)
+_DISABLED = nullcontext()
+
+
+class Recorder:
+    """
+    Collects the timing spans and counters of everything run inside `recording(recorder)`.
+    Subclass and override `on_span` / `on_count` to forward them elsewhere (logs, metrics).
+    With `profile=True` the code run while recording is also profiled with cProfile, with
+    `trace_memory=True` its peak Python heap usage is measured with tracemalloc.
+    """
+
+    def __init__(self, profile=False, trace_memory=False):
+        self.spans = []  # (name, start offset in seconds, duration in seconds, depth), in finishing order
+        self.counters = Counter()
+        self.peak_memory = None
+        self.profiler = None
+        if profile:
+            import cProfile
+
+            self.profiler = cProfile.Profile()
+        self.trace_memory = trace_memory
+        self._origin = time.perf_counter()
+        self._depth = 0
+
+    @contextmanager
+    def span(self, name):
+        depth = self._depth
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth = depth
+            self.on_span(name, start - self._origin, time.perf_counter() - start, depth)
+
+    def on_span(self, name, offset, seconds, depth):
+        self.spans.append((name, offset, seconds, depth))
+
+    def on_count(self, name, amount):
+        self.counters[name] += amount
+
+    def totals(self):
+        """{span name: (calls, total seconds)} in order of first completion."""
+        totals = {}
+        for name, _, seconds, _ in self.spans:
+            calls, total = totals.get(name, (0, 0.0))
+            totals[name] = (calls + 1, total + seconds)
+        return totals
+
+    def profile_report(self, limit=25, sort="cumulative"):
+        """Top `limit` functions of the cProfile capture as text, or None when not profiling."""
+        if self.profiler is None:
+            return None
+        import pstats
+
+        out = io.StringIO()
+        pstats.Stats(self.profiler, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+
+@contextmanager
+def recording(recorder=None, profile=False, trace_memory=False):
+    """
+    Records spans and counters of the code run inside the block (in this thread or task).
+    Yields the Recorder; an existing one can be passed to collect several blocks together.
+    """
+    if recorder is None:
+        recorder = Recorder(profile=profile, trace_memory=trace_memory)
+    tracing = False
+    if recorder.trace_memory:
+        import tracemalloc
+
+        tracing = not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+    token = _current.set(recorder)
+    if recorder.profiler is not None:
+        recorder.profiler.enable()
+    try:
+        yield recorder
+    finally:
+        if recorder.profiler is not None:
+            recorder.profiler.disable()
+        _current.reset(token)
+        if recorder.trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            recorder.peak_memory = max(recorder.peak_memory or 0, peak)
+            if tracing:
+                tracemalloc.stop()
+
+
+def span(name):
+    """Context manager timing a pipeline stage; a shared no-op unless recording."""
+    recorder = _current.get()
+    if recorder is None:
+        return _DISABLED
+    return recorder.span(name)
+
+
+def increment(name, amount=1):
+    """Adds to a counter of the active recorder (no-op unless recording)."""
+    recorder = _current.get()
+    if recorder is not None:
+        recorder.on_count(name, amount)
+
@@ -0,0 +1,208 @@
+"""
+Precompiled lemma lookup table, so known tokens skip pos_tag and WordNet at runtime.
+
+    python lemma_table.py --corpus resumes/ postings/ --min-count 2 --output lemma_table.bin
+    python lemma_table.py --vocabulary words.txt --wordnet --output lemma_table.bin
+
+The table holds, for every vocabulary word, the lemmatize_word result (POS tagged in
+isolation) and the lemma for each WordNet POS (used by the context mode after pos_tag), both
+with SPECIAL_CASES applied. analyzer looks tokens up here first and only falls back to NLTK
+for words that are not in the table. Lookups and misses are counted; with
+RESUME_ANALYZER_LEMMA_MISSES=path the missed words are appended to that file at exit, ready
+to be passed back with --vocabulary.
+
+File format (little-endian): MAGIC, the rules fingerprint (32 bytes, see
+analyzer.lemma_rules_fingerprint), the entry count N and slot count S (a power of two), then
+S uint32 hash slots, N + 1 uint32 key offsets, N + 1 uint32 value offsets, the UTF-8 keys and
+the values. A slot holds entry index + 1 (0 = empty); a key lives in the first slot at or after
+crc32(key) % S (linear probing). The file is memory-mapped, so it is never loaded into Python
+objects, and a lookup usually reads a single key.
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections import Counter
+
+MAGIC = b"LEMTAB1\n"
+HEADER = struct.Struct("<32sII")
+# Keys of the per-POS entries are word + POS_SEPARATOR + WordNet POS ("n", "v", "a", "r")
+POS_SEPARATOR = "\x1f"
+# Distinct missed words remembered for write_misses
+MAX_TRACKED_MISSES = 50_000
+
+
+def pos_key(word, pos):
+    return f"{word}{POS_SEPARATOR}{pos}"
+
+
+def _offsets(view):
+    offsets = array("I")
+    if sys.byteorder == "big":
+        offsets.frombytes(view)
+        offsets.byteswap()
+        return offsets
+    return view.cast("I")
+
+
+class LemmaTable:
+    """Read-only view of a table file; `get` returns the lemma of a key, or None when it is not in the table."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a lemma table")
+        self.fingerprint, self.count, slot_count = HEADER.unpack_from(self._map, len(MAGIC))
+        self._mask = slot_count - 1
+        view = memoryview(self._map)
+        start = len(MAGIC) + HEADER.size
+        self._slots = _offsets(view[start:start + slot_count * 4])
+        start += slot_count * 4
+        width = (self.count + 1) * 4
+        self._key_offsets = _offsets(view[start:start + width])
+        self._value_offsets = _offsets(view[start + width:start + 2 * width])
+        self._keys_start = start + 2 * width
+        self._values_start = self._keys_start + self._key_offsets[self.count]
+        self.hits = 0
+        self.misses = 0
+        self.missed = Counter()
+
+    def __len__(self):
+        return self.count
+
+    def get(self, key):
+        target = key.encode("utf-8")
+        slots, key_offsets, start = self._slots, self._key_offsets, self._keys_start
+        slot = zlib.crc32(target) & self._mask
+        while entry := slots[slot]:
+            index = entry - 1
+            if self._map[start + key_offsets[index]:start + key_offsets[index + 1]] == target:
+                self.hits += 1
+                values = self._values_start
+                return self._map[values + self._value_offsets[index]:values + self._value_offsets[entry]].decode("utf-8")
+            slot = (slot + 1) & self._mask
+        self.misses += 1
+        word = key.partition(POS_SEPARATOR)[0]
+        if word in self.missed or len(self.missed) < MAX_TRACKED_MISSES:
+            self.missed[word] += 1
+        return None
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"entries": self.count, "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None}
+
+    def write_misses(self, path):
+        """Appends the missed words, most frequent first, one per line (a --vocabulary file)."""
+        with open(path, "a", encoding="utf-8") as file:
+            for word, _ in self.missed.most_common():
+                file.write(word + "\n")
+
+    def close(self):
+        self._slots = self._key_offsets = self._value_offsets = None  # release the exported views before closing
+        self._map.close()
+
+
+def write_table(entries, path, fingerprint):
+    """Writes {key: lemma} as a table file (written to a temporary file, then renamed into place)."""
+    keys = sorted((key.encode("utf-8"), lemma.encode("utf-8")) for key, lemma in entries.items())
+    slot_count = 1 << max(3, (2 * len(keys)).bit_length())  # at most half full, probes stay short
+    slots = array("I", bytes(4 * slot_count))
+    key_offsets = array("I", [0])
+    value_offsets = array("I", [0])
+    for index, (key, value) in enumerate(keys):
+        key_offsets.append(key_offsets[-1] + len(key))
+        value_offsets.append(value_offsets[-1] + len(value))
+        slot = zlib.crc32(key) & (slot_count - 1)
+        while slots[slot]:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = index + 1
+    if sys.byteorder == "big":
+        for offsets in (slots, key_offsets, value_offsets):
+            offsets.byteswap()
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(MAGIC + HEADER.pack(fingerprint, len(keys), slot_count))
+        file.write(slots.tobytes())
+        file.write(key_offsets.tobytes())
+        file.write(value_offsets.tobytes())
+        file.write(b"".join(key for key, _ in keys))
+        file.write(b"".join(value for _, value in keys))
+    os.replace(temporary, path)
+
+
+def load_table(path, fingerprint):
+    """The table at `path`, or None if there is none or it was built with other lemmatization rules."""
+    if not os.path.exists(path):
+        return None
+    table = LemmaTable(path)
+    if table.fingerprint != fingerprint:
+        table.close()
+        return None
+    return table
+
+
+def build_entries(words):
+    """Table entries for `words`, computed with the NLTK path (never with an existing table)."""
+    from analyzer import ADJ, ADV, NOUN, VERB, get_wordnet_pos, wordnet_lemma
+
+    entries = {}
+    for word in words:
+        entries[word] = wordnet_lemma(word, get_wordnet_pos(word))
+        for pos in (NOUN, VERB, ADJ, ADV):
+            entries[pos_key(word, pos)] = wordnet_lemma(word, pos)
+    return entries
+
+
+def corpus_words(paths, min_count=1):
+    """Lowercase tokens seen at least `min_count` times in the .txt/.html files under `paths`."""
+    from extractor import TOKEN_PATTERN
+
+    counts = Counter()
+    for root in paths:
+        files = [root] if os.path.isfile(root) else (
+            os.path.join(dirpath, name) for dirpath, _, names in os.walk(root) for name in names
+            if name.lower().endswith((".txt", ".html", ".htm"))
+        )
+        for path in files:
+            with open(path, encoding="utf-8", errors="replace") as file:
+                counts.update(TOKEN_PATTERN.findall(file.read().lower()))
+    return {word for word, count in counts.items() if count >= min_count}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the precompiled lemma table.")
+    parser.add_argument("--output", default=None, help="table file (default: analyzer.LEMMA_TABLE_PATH)")
+    parser.add_argument("--vocabulary", nargs="*", default=[], help="files with one word per line")
+    parser.add_argument("--corpus", nargs="*", default=[], help="text/HTML files or directories to take words from")
+    parser.add_argument("--min-count", type=int, default=1, help="minimum corpus frequency of a word")
+    parser.add_argument("--wordnet", action="store_true", help="also add every single-word WordNet lemma")
+    args = parser.parse_args(argv)
+
+    from analyzer import LEMMA_TABLE_PATH, SPECIAL_CASES, lemma_rules_fingerprint, require_nltk_resources
+
+    require_nltk_resources()
+    words = set(SPECIAL_CASES) | corpus_words(args.corpus, args.min_count)
+    for path in args.vocabulary:
+        with open(path, encoding="utf-8") as file:
+            words.update(line.strip().lower() for line in file if line.strip())
+    if args.wordnet:
+        from nltk.corpus import wordnet
+
+        words.update(name.lower() for name in wordnet.all_lemma_names() if "_" not in name)
+    output = args.output or LEMMA_TABLE_PATH
+    entries = build_entries(sorted(words))
+    write_table(entries, output, lemma_rules_fingerprint())
+    print(f"{len(words)} words, {len(entries)} entries, {os.path.getsize(output) / 2**20:.1f} MB -> {output}",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
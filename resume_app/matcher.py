@@ -1,5 +1,11 @@
+import os
 import re
-from extractor import extract_keywords, extract_bigrams
+import unicodedata
+
+from analyzer import excluded_lexicon
+from cache import CACHE_DIR, DiskCache, MemoryCache, TieredCache, sha256_hex
+from extractor import extract_keywords, extract_bigrams, preprocess
+from instrumentation import ANALYSIS, MATCHING, increment, span
 
 def expand_company_terms(company_name: str):
     if not company_name:
@@ -11,55 +17,145 @@ def expand_company_terms(company_name: str):
     words.add(company_name.lower())
     return words
 
-def analyze_resume_against_job(resume_text, job_text, company_name=None):
+# How many of the resume's own top keywords/bigrams are returned for display in the UI
+RESUME_DISPLAY_N = 5
+
+
+def match_terms(job_terms, resume_terms):
     """
-    Finds top job posting keywords/bigrams, compares them to ALL resume keywords/bigrams.
-    Also extracts top 5 from resume for display in UI.
+    Compares job terms [(term, count, score), ...] against a set (or dict) of resume terms
+    in a single pass. Returns (matches, missing, matched_weight, total_weight) where
+    matches are (term, job_count) pairs and the weights are sums of job importance scores.
     """
-    # 1) Job
-    job_keywords = extract_keywords(job_text, top_n=5, company_name=company_name)
-    job_bigrams = extract_bigrams(job_text, top_n=5, company_name=company_name)
-
-    # 2) Resume (ALL)
-    resume_keywords_all = extract_keywords(resume_text, top_n=None, company_name=company_name)
-    resume_bigrams_all = extract_bigrams(resume_text, top_n=None, company_name=company_name)
-
-    # 3) Resume (TOP 5) - for display
-    resume_keywords_top = resume_keywords_all[:5]
-    resume_bigrams_top = resume_bigrams_all[:5]
-
-    # 4) Identify matches & missing elements
-    # job_keywords => [(word, job_count, job_score), ...]
-    # resume_keywords_all => [(word, res_count, res_score), ...]
-
-    # Match if job_word == res_word
-    keyword_matches = [
-        (word, job_count)
-        for (word, job_count, _) in job_keywords
-        if word in [rword for (rword, _, _) in resume_keywords_all]
-    ]
-    bigram_matches = [
-        (bigram, job_count)
-        for (bigram, job_count, _) in job_bigrams
-        if bigram in [rbg for (rbg, _, _) in resume_bigrams_all]
-    ]
+    matches = []
+    missing = []
+    matched_weight = 0
+    total_weight = 0
+    for term, job_count, job_score in job_terms:
+        total_weight += job_score
+        if term in resume_terms:
+            matches.append((term, job_count))
+            matched_weight += job_score
+        else:
+            missing.append(term)
+    return matches, missing, matched_weight, total_weight
 
-    missing_keywords = [
-        word for (word, _, _) in job_keywords
-        if word not in [rword for (rword, _, _) in resume_keywords_all]
-    ]
-    missing_bigrams = [
-        bigram for (bigram, _, _) in job_bigrams
-        if bigram not in [rbg for (rbg, _, _) in resume_bigrams_all]
+
+def weighted_match_score(matched_weight, total_weight):
+    """Percentage (0-100) of the job's importance weight found in the resume, None if nothing to match."""
+    if total_weight <= 0:
+        return None
+    return 100.0 * matched_weight / total_weight
+
+
+def analyze_resume_against_job(resume_text, job_text, company_name=None, lemma_mode="context", top_n=5,
+                               tfidf_model=None, emphasis_boost=0):
+    """
+    Finds top `top_n` job posting keywords/bigrams, compares them to ALL resume keywords/bigrams.
+    Also extracts top 5 from resume for display in UI, and a weighted match score where every
+    job term counts by its importance score.
+    `lemma_mode="token"` reproduces the old per-word lemmatization for before/after comparisons.
+    With a tfidf.TfidfModel fitted on a collection of postings, job terms are ranked and scored
+    by tf-idf instead of raw counts, and "cosine_similarity" holds the resume/posting tf-idf cosine.
+    `emphasis_boost` boosts job keywords named right after "we need", "we are looking for", ...
+    """
+    with span(ANALYSIS):
+        # 0) Preprocess each document once, keywords and bigrams are both views over it
+        job_doc = preprocess(job_text, company_name=company_name, lemma_mode=lemma_mode, emphasis_boost=emphasis_boost)
+        resume_doc = preprocess(resume_text, company_name=company_name, lemma_mode=lemma_mode)
+
+        # 1) Job
+        if tfidf_model is None:
+            job_keywords = extract_keywords(job_doc, top_n=top_n)
+            job_bigrams = extract_bigrams(job_doc, top_n=top_n)
+            cosine_similarity = None
+        else:
+            job_keywords = tfidf_model.top_terms(job_doc.ngram_counts(1), top_n=top_n)
+            job_bigrams = tfidf_model.top_terms(job_doc.ngram_counts(2), top_n=top_n)
+            cosine_similarity = float(tfidf_model.cosine_similarity(resume_doc.term_counts(), [job_doc.term_counts()])[0])
+
+        # 2) Resume (TOP 5) - for display
+        resume_keywords_top = extract_keywords(resume_doc, top_n=RESUME_DISPLAY_N)
+        resume_bigrams_top = extract_bigrams(resume_doc, top_n=RESUME_DISPLAY_N)
+
+        # 3) Resume (ALL) - every term seen more than once, as sets for O(1) lookups
+        resume_keyword_counts = resume_doc.ngram_counts(1)
+        resume_bigram_counts = resume_doc.ngram_counts(2)
+        with span(MATCHING):
+            resume_keyword_set = {word for word, count in resume_keyword_counts.items() if count > 1}
+            resume_bigram_set = {bigram for bigram, count in resume_bigram_counts.items() if count > 1}
+
+            # 4) Identify matches & missing elements (match if job term == resume term)
+            keyword_matches, missing_keywords, keyword_weight, keyword_total = match_terms(job_keywords, resume_keyword_set)
+            bigram_matches, missing_bigrams, bigram_weight, bigram_total = match_terms(job_bigrams, resume_bigram_set)
+
+        return {
+            "top_job_keywords": job_keywords,
+            "top_job_bigrams": job_bigrams,
+            "top_resume_keywords": resume_keywords_top,
+            "top_resume_bigrams": resume_bigrams_top,
+            "keyword_matches": keyword_matches,
+            "bigram_matches": bigram_matches,
+            "missing_keywords": missing_keywords,
+            "missing_bigrams": missing_bigrams,
+            "match_score": weighted_match_score(keyword_weight + bigram_weight, keyword_total + bigram_total),
+            "cosine_similarity": cosine_similarity,
+        }
+
+
+# Bump whenever a change to extraction/matching changes analysis output, so cached results are not reused
+ANALYZER_VERSION = 4
+RESULT_CACHE_PATH = os.path.join(CACHE_DIR, "analysis_results.sqlite")
+RESULT_CACHE_MEMORY_ENTRIES = 512
+RESULT_CACHE_MAX_BYTES = 64 * 2**20
+RESULT_CACHE_TTL = 7 * 24 * 3600  # seconds
+
+# Shared two-tier (memory + SQLite) cache of analysis results, created by get_result_cache on first use
+result_cache = None
+
+
+def get_result_cache():
+    global result_cache
+    if result_cache is None:
+        result_cache = TieredCache(
+            MemoryCache(RESULT_CACHE_MEMORY_ENTRIES, ttl=RESULT_CACHE_TTL),
+            DiskCache(RESULT_CACHE_PATH, max_bytes=RESULT_CACHE_MAX_BYTES, ttl=RESULT_CACHE_TTL),
+        )
+    return result_cache
+
+
+def normalize_text(text):
+    """NFKC-normalizes `text` and collapses whitespace runs, so trivially different copies share a cache key."""
+    return " ".join(unicodedata.normalize("NFKC", text or "").split())
+
+
+def result_cache_key(resume_text, job_text, company_name=None, lemma_mode="context", top_n=5):
+    """
+    Key for an analysis: hashes of the (normalized) documents and company name, plus the
+    excluded_words.json contents and ANALYZER_VERSION, so editing the exclusion list or
+    the analysis code never serves stale results.
+    """
+    parts = [
+        f"v{ANALYZER_VERSION}", lemma_mode, str(top_n), excluded_lexicon.current_fingerprint(),
+        sha256_hex(resume_text), sha256_hex(job_text), sha256_hex((company_name or "").strip()),
     ]
+    return sha256_hex(":".join(parts))
 
-    return {
-        "top_job_keywords": job_keywords,
-        "top_job_bigrams": job_bigrams,
-        "top_resume_keywords": resume_keywords_top,
-        "top_resume_bigrams": resume_bigrams_top,
-        "keyword_matches": keyword_matches,
-        "bigram_matches": bigram_matches,
-        "missing_keywords": missing_keywords,
-        "missing_bigrams": missing_bigrams,
-    }
+
+def analyze_resume_against_job_cached(resume_text, job_text, company_name=None, lemma_mode="context", top_n=5,
+                                      cache=None):
+    """
+    Same as analyze_resume_against_job on the normalized texts, with results kept in a
+    memory + disk cache (`cache` defaults to get_result_cache()). Cached results are shared,
+    so treat the returned dict as read-only.
+    """
+    cache = cache if cache is not None else get_result_cache()
+    resume_text = normalize_text(resume_text)
+    job_text = normalize_text(job_text)
+    key = result_cache_key(resume_text, job_text, company_name, lemma_mode, top_n)
+    result = cache.get(key)
+    increment("result_cache.hits" if result is not None else "result_cache.misses")
+    if result is None:
+        result = analyze_resume_against_job(resume_text, job_text, company_name, lemma_mode=lemma_mode, top_n=top_n)
+        cache.put(key, result)
+    return result
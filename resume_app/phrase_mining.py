@@ -0,0 +1,203 @@
+"""
+Phrase mining over a whole postings archive, in fixed memory.
+
+    python phrase_mining.py postings/ archive.txt --n 2 3 4 --capacity 20000 --top 30
+    python phrase_mining.py postings/ --lemma-mode none   # no NLTK, raw tokens (much faster)
+
+Files are read in blocks of lines and turned into a lemma stream. N-grams of every requested
+length are cut from that stream as it goes, and their counts are kept approximately by one
+Space-Saving summary per n (SpaceSaving). Memory is set by --capacity, whatever the size of the
+corpus. Each reported count is an upper bound. The error column says by how much it can be too
+high, so count - error is a guaranteed lower bound.
+"""
+import argparse
+import os
+import sys
+from collections import deque
+from itertools import chain, islice
+
+from analyzer import lemmatize_tokens, load_excluded_words, normalize_token
+
+# Phrases tracked per n-gram length by default
+DEFAULT_CAPACITY = 10_000
+# Characters of a text file read (and lemmatized) at once; blocks end on a line boundary
+BLOCK_CHARS = 1 << 20
+
+
+def iter_ngrams(tokens, n, excluded=()):
+    """
+    Yields n-gram tuples from any token iterable without materializing it. Tokens in `excluded`
+    are skipped over, so the n-gram joins the words on either side of them.
+    """
+    window = deque(maxlen=n)
+    for token in tokens:
+        if token in excluded:
+            continue
+        window.append(token)
+        if len(window) == n:
+            yield tuple(window)
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitters summary (Metwally et al.): approximate counts of the most frequent
+    items of a stream, keeping at most `capacity` items.
+
+    When the summary is full, a new item replaces one with the smallest count and inherits that
+    count as its error. A reported count is never below the true count and at most `error`
+    above it. Every item seen more than total / capacity times is guaranteed to be kept.
+    Items are bucketed by count, so each `add` is O(1).
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.total = 0
+        self.counts = {}  # item -> count (an upper bound)
+        self.errors = {}  # item -> how much its count may overestimate
+        self._buckets = {}  # count -> {item: None}, oldest first
+        self._min = 0
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __contains__(self, item):
+        return item in self.counts
+
+    def _bucket_add(self, item, count):
+        bucket = self._buckets.get(count)
+        if bucket is None:
+            bucket = self._buckets[count] = {}
+        bucket[item] = None
+
+    def _bucket_remove(self, item, count):
+        bucket = self._buckets[count]
+        del bucket[item]
+        if not bucket:
+            del self._buckets[count]
+            if count == self._min:
+                self._min += 1  # every count moves up by one at a time, so min + 1 exists
+
+    def add(self, item):
+        self.total += 1
+        count = self.counts.get(item)
+        if count is not None:
+            self.counts[item] = count + 1
+            self._bucket_add(item, count + 1)
+            self._bucket_remove(item, count)
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = 1
+            self.errors[item] = 0
+            self._bucket_add(item, 1)
+            self._min = 1
+        else:
+            floor = self._min
+            victim = next(iter(self._buckets[floor]))
+            del self.counts[victim], self.errors[victim]
+            self.counts[item] = floor + 1
+            self.errors[item] = floor
+            self._bucket_add(item, floor + 1)
+            self._bucket_remove(victim, floor)
+
+    def update(self, items):
+        for item in items:
+            self.add(item)
+
+    def top(self, k=None):
+        """[(item, count, error), ...] by decreasing count; count - error is a guaranteed lower bound."""
+        ranked = sorted(self.counts.items(), key=lambda pair: -pair[1])
+        return [(item, count, self.errors[item]) for item, count in islice(ranked, k)]
+
+
+def document_lemmas(text, excluded_words, lemma_mode="context"):
+    """
+    Lemmas of `text` with excluded tokens dropped, the same filtering as PreprocessedDocument.
+    lemma_mode=None skips lemmatization and keeps the normalized tokens.
+    """
+    from extractor import TOKEN_PATTERN
+
+    tokens = [normalize_token(token) for token in TOKEN_PATTERN.findall(text.lower())]
+    lemmas = tokens if lemma_mode is None else lemmatize_tokens(tokens, mode=lemma_mode)
+    return [lemma for token, lemma in zip(tokens, lemmas) if token not in excluded_words]
+
+
+class PhraseMiner:
+    """
+    Mines the top n-grams of many documents, one Space-Saving summary per n.
+    A document is one text or an iterable of consecutive blocks of one text (n-grams run across
+    block boundaries, never across documents). Excluded words are skipped over, as in iter_ngrams.
+    """
+
+    def __init__(self, ns=(2, 3), capacity=DEFAULT_CAPACITY, excluded_words=None, lemma_mode="context"):
+        self.ns = sorted(set(ns))
+        if not self.ns or self.ns[0] < 1:
+            raise ValueError("n-gram lengths must be positive")
+        self.excluded_words = load_excluded_words() if excluded_words is None else excluded_words
+        self.lemma_mode = lemma_mode
+        self.summaries = {n: SpaceSaving(capacity) for n in self.ns}
+        self.documents = 0
+        self.tokens = 0
+
+    def add_document(self, blocks):
+        if isinstance(blocks, str):
+            blocks = [blocks]
+        excluded_words = self.excluded_words
+        lemmas = chain.from_iterable(document_lemmas(block, excluded_words, self.lemma_mode) for block in blocks)
+        window = deque(maxlen=self.ns[-1])
+        adders = [(n, self.summaries[n].add) for n in self.ns]
+        for lemma in lemmas:
+            if lemma in excluded_words:
+                continue
+            self.tokens += 1
+            window.append(lemma)
+            length = len(window)
+            for n, add in adders:
+                if n > length:
+                    break
+                add(" ".join(islice(window, length - n, None)))
+        self.documents += 1
+
+    def top(self, n, k=None):
+        """Top `k` n-grams as [(phrase, count, error), ...] (see SpaceSaving.top)."""
+        return self.summaries[n].top(k)
+
+
+def iter_blocks(path, block_chars=BLOCK_CHARS):
+    """Yields the text of a posting file in blocks of whole lines; HTML files are one block of visible text."""
+    if path.lower().endswith((".html", ".htm")):
+        from cli import read_job_text
+
+        yield read_job_text(path)
+        return
+    with open(path, encoding="utf-8", errors="replace") as file:
+        while block := file.read(block_chars):
+            yield block + file.readline()  # finish the current line, so no word is split
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mine the most frequent phrases of a postings archive.")
+    parser.add_argument("paths", nargs="+", help="text/HTML files or directories (searched recursively)")
+    parser.add_argument("--n", type=int, nargs="+", default=[2, 3], help="n-gram lengths")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY, help="phrases tracked per n")
+    parser.add_argument("--top", type=int, default=25, help="phrases printed per n")
+    parser.add_argument("--lemma-mode", choices=["context", "token", "none"], default="context")
+    args = parser.parse_args(argv)
+
+    from cli import JOB_EXTENSIONS, find_files
+
+    lemma_mode = None if args.lemma_mode == "none" else args.lemma_mode
+    miner = PhraseMiner(args.n, args.capacity, lemma_mode=lemma_mode)
+    for root in args.paths:
+        for path in [root] if os.path.isfile(root) else find_files(root, JOB_EXTENSIONS):
+            miner.add_document(iter_blocks(path))
+    print(f"{miner.documents} documents, {miner.tokens} tokens", file=sys.stderr)
+    for n in miner.ns:
+        print(f"\n{n}-grams {'count':>8} {'error':>8}")
+        for phrase, count, error in miner.top(n, args.top):
+            print(f"  {phrase:<40} {count:>8} {error:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+import heapq
+import json
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+from itertools import accumulate, chain
+
+from extractor import extract_bigrams, extract_keywords, preprocess
+from matcher import weighted_match_score
+
+# On-disk format: MAGIC, then one zlib stream holding a varint-prefixed JSON list of document
+# keys, the number of terms and, per term, its varint-prefixed UTF-8 bytes, the posting length
+# and the gaps between consecutive doc ids as little-endian uint32 (small gaps compress well).
+MAGIC = b"RIDX1\n"
+ZLIB_LEVEL = 6
+
+
+def resume_terms(text, company_name=None, lemma_mode="context"):
+    """
+    The keywords and bigrams a resume "has" in the sense of analyze_resume_against_job:
+    every lemma and bigram seen more than once.
+    """
+    doc = preprocess(text, company_name=company_name, lemma_mode=lemma_mode)
+    return {term for n in (1, 2) for term, count in doc.ngram_counts(n).items() if count > 1}
+
+
+def job_query_terms(job_text, company_name=None, top_n=5, lemma_mode="context"):
+    """The posting's top keywords and bigrams as {term: importance_score}, same as the matcher uses."""
+    doc = preprocess(job_text, company_name=company_name, lemma_mode=lemma_mode)
+    terms = {}
+    for term, _, score in extract_keywords(doc, top_n=top_n) + extract_bigrams(doc, top_n=top_n):
+        terms[term] = terms.get(term, 0) + score
+    return terms
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class ResumeIndex:
+    """
+    Inverted index from resume keywords/bigrams to the resumes containing them, for ranking a
+    large pool of stored resumes against a job posting without re-analyzing any resume.
+
+    Postings are sorted arrays of internal doc ids (ids only grow, so adding appends).
+    Removing a resume only tombstones its id; `compact()` (also done by `save`) rewrites
+    the postings without removed ids.
+    """
+
+    def __init__(self):
+        self.keys = []  # doc id -> external key, None once removed
+        self.ids = {}  # external key -> doc id
+        self.postings = {}  # term -> array("I") of doc ids
+        self.removed = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, key):
+        return key in self.ids
+
+    def add(self, key, text, company_name=None, lemma_mode="context"):
+        """Analyzes a resume once and indexes its terms under `key` (replacing an older version)."""
+        self.add_terms(key, resume_terms(text, company_name, lemma_mode))
+
+    def add_terms(self, key, terms):
+        """Indexes already extracted resume terms (e.g. computed by resume_terms in worker processes)."""
+        if key in self.ids:
+            self.remove(key)
+        doc_id = len(self.keys)
+        self.keys.append(key)
+        self.ids[key] = doc_id
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = array("I")
+            posting.append(doc_id)
+
+    def remove(self, key):
+        """Removes a resume; its postings entries are skipped until the next compact()."""
+        doc_id = self.ids.pop(key)
+        self.keys[doc_id] = None
+        self.removed += 1
+
+    def compact(self):
+        """Drops removed resumes from every posting list and renumbers the remaining ones."""
+        if not self.removed:
+            return
+        new_ids = {}
+        keys = []
+        for doc_id, key in enumerate(self.keys):
+            if key is not None:
+                new_ids[doc_id] = len(keys)
+                keys.append(key)
+        postings = {}
+        for term, posting in self.postings.items():
+            kept = array("I", (new_ids[doc_id] for doc_id in posting if doc_id in new_ids))
+            if kept:
+                postings[term] = kept
+        self.keys = keys
+        self.ids = {key: doc_id for doc_id, key in enumerate(keys)}
+        self.postings = postings
+        self.removed = 0
+
+    def query(self, job_text, k=10, company_name=None, top_n=5, lemma_mode="context"):
+        """
+        Top `k` resumes for a job posting as [(key, match_score), ...], best first, where
+        match_score is the weighted share (0-100) of the posting's top terms the resume contains.
+        """
+        return self.query_terms(job_query_terms(job_text, company_name, top_n, lemma_mode), k)
+
+    def query_terms(self, weighted_terms, k=10):
+        """
+        Top `k` resumes for {term: weight}, scored by the summed weight of the terms they contain.
+
+        Terms are processed heaviest first. Once the k-th best score so far exceeds the total
+        weight of the terms still to come, no unseen resume can make the top k anymore: the
+        remaining terms only update existing candidates, and candidates that cannot reach the
+        k-th best score even with every remaining term are dropped.
+        """
+        terms = sorted(
+            ((weight, term) for term, weight in weighted_terms.items() if weight > 0 and term in self.postings),
+            reverse=True,
+        )
+        total_weight = sum(weight for weight in weighted_terms.values() if weight > 0)
+        remaining = sum(weight for weight, _ in terms)
+        keys = self.keys
+        scores = {}
+        closed = False  # True once no new candidates can enter the top k
+        for weight, term in terms:
+            posting = self.postings[term]
+            if closed:
+                if len(scores) < len(posting):
+                    for doc_id in scores:
+                        position = bisect_left(posting, doc_id)
+                        if position < len(posting) and posting[position] == doc_id:
+                            scores[doc_id] += weight
+                else:
+                    for doc_id in posting:
+                        if doc_id in scores:
+                            scores[doc_id] += weight
+            else:
+                for doc_id in posting:
+                    if keys[doc_id] is not None:
+                        scores[doc_id] = scores.get(doc_id, 0) + weight
+            remaining -= weight
+            if len(scores) > k:
+                threshold = heapq.nlargest(k, scores.values())[-1]
+                closed = closed or threshold > remaining
+                if closed:
+                    scores = {doc_id: score for doc_id, score in scores.items() if score + remaining >= threshold}
+        best = heapq.nsmallest(k, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(keys[doc_id], weighted_match_score(score, total_weight)) for doc_id, score in best]
+
+    def save(self, path):
+        """Writes the index (compacted) in the MAGIC format, see the comment at the top of the module."""
+        self.compact()
+        out = bytearray()
+        header = json.dumps(self.keys).encode("utf-8")
+        _write_varint(out, len(header))
+        out += header
+        _write_varint(out, len(self.postings))
+        for term, posting in self.postings.items():
+            encoded = term.encode("utf-8")
+            _write_varint(out, len(encoded))
+            out += encoded
+            _write_varint(out, len(posting))
+            deltas = array("I", (doc_id - previous for previous, doc_id in zip(chain((0,), posting), posting)))
+            if sys.byteorder == "big":
+                deltas.byteswap()
+            out += deltas.tobytes()
+        with open(path, "wb") as file:
+            file.write(MAGIC + zlib.compress(bytes(out), ZLIB_LEVEL))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            data = file.read()
+        if not data.startswith(MAGIC):
+            raise ValueError(f"{path} is not a resume index file")
+        data = zlib.decompress(data[len(MAGIC):])
+        index = cls()
+        length, pos = _read_varint(data, 0)
+        index.keys = json.loads(data[pos:pos + length].decode("utf-8"))
+        pos += length
+        index.ids = {key: doc_id for doc_id, key in enumerate(index.keys) if key is not None}
+        index.removed = len(index.keys) - len(index.ids)
+        term_count, pos = _read_varint(data, pos)
+        for _ in range(term_count):
+            length, pos = _read_varint(data, pos)
+            term = data[pos:pos + length].decode("utf-8")
+            pos += length
+            count, pos = _read_varint(data, pos)
+            deltas = array("I")
+            deltas.frombytes(data[pos:pos + count * deltas.itemsize])
+            pos += count * deltas.itemsize
+            if sys.byteorder == "big":
+                deltas.byteswap()
+            index.postings[term] = array("I", accumulate(deltas))
+        return index
@@ -0,0 +1,69 @@
+from collections import deque
+
+
+def is_word_char(char):
+    """Same notion of a word character as the \\w in the tokenizer regex."""
+    return char.isalnum() or char == "_"
+
+
+class PhraseScanner:
+    """
+    Aho-Corasick automaton over a fixed set of phrases. `finditer` reports every occurrence
+    of every phrase in one left-to-right pass over the text, whatever the number of phrases,
+    and only where the occurrence starts and ends on a word boundary.
+    Phrases are matched case-insensitively; the scanned text must already be lowercase.
+    """
+
+    def __init__(self, phrases):
+        """`phrases` is an iterable of (phrase, value) pairs; `value` is reported with each match."""
+        self.goto = [{}]  # state -> {char: next state}
+        self.fail = [0]  # state -> longest proper suffix state
+        self.output = [[]]  # state -> [(phrase length, value), ...] of phrases ending here
+        for phrase, value in phrases:
+            phrase = phrase.lower()
+            if phrase:
+                self._insert(phrase, value)
+        self._build_failure_links()
+
+    def _insert(self, phrase, value):
+        state = 0
+        for char in phrase:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append((len(phrase), value))
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def finditer(self, text):
+        """Yields (start, end, value) for each word-bounded phrase occurrence, ordered by end offset."""
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        length = len(text)
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                end = index + 1
+                if end < length and is_word_char(text[end]):
+                    continue
+                for phrase_length, value in output[state]:
+                    start = end - phrase_length
+                    if start == 0 or not is_word_char(text[start - 1]):
+                        yield start, end, value
@@ -0,0 +1,337 @@
+"""
+Local HTTP analysis service for other tools, without Streamlit. Extraction and analysis run in
+a process pool; the asyncio front end only parses requests and waits on results.
+
+    python service.py --port 8765 --workers 4
+
+    POST /analyze        {"job_text": ..., "resume": <base64 PDF/DOCX>, "filename": "cv.pdf"}
+                         or {"job_text": ..., "resume_text": ...}; optional "company_name", "top_n",
+                         "lemma_mode". Answers with the analyze_resume_against_job result; an
+                         uploaded resume cut short by extractor.UPLOAD_LIMITS adds an
+                         X-Resume-Truncated header ("pages", "chars" or "time").
+    POST /analyze/batch  Same resume fields plus "jobs": [{"key": ..., "job_text": ..., "company_name": ...}].
+                         Streams one JSON line {"key", "result", "error"} per job as it finishes.
+    GET  /health         Pool and queue counters.
+
+At most --max-pending tasks are queued or running at once; beyond that requests get 429
+with a Retry-After header. A task taking longer than --timeout seconds answers 504 (a task
+already running in a worker is not interrupted, it still counts as pending until it ends).
+"""
+import argparse
+import asyncio
+import base64
+import binascii
+import json
+import os
+import sys
+from http import HTTPStatus
+
+from analyzer import LEMMA_MODES, NLTKResourceError
+from batch import IN_FLIGHT_PER_WORKER
+from extractor import DOCX_TYPE, PDF_TYPE, RESUME_TYPES, UPLOAD_LIMITS, ResumeFile, extract_resume_cached
+from matcher import analyze_resume_against_job_cached
+from workers import create_pool
+
+DEFAULT_PORT = 8765
+DEFAULT_TIMEOUT = 30.0  # seconds per task
+MAX_BODY_BYTES = 16 * 2**20
+HEADER_TIMEOUT = 10.0  # seconds to receive the request line, headers and body
+RETRY_AFTER = 1  # seconds, sent with 429 responses
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def sniff_resume_type(data, filename=None):
+    """MIME type of an uploaded resume from its file name, or its first bytes if there is none."""
+    if filename:
+        file_type = RESUME_TYPES.get(os.path.splitext(filename)[1].lower())
+        if file_type is None:
+            raise HTTPError(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, f"Unsupported resume type: {filename}")
+        return file_type
+    if data.startswith(b"%PDF"):
+        return PDF_TYPE
+    if data.startswith(b"PK"):
+        return DOCX_TYPE
+    raise HTTPError(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, "Resume is neither a PDF nor a DOCX file")
+
+
+def extract_upload(data, file_type):
+    """Worker task: Extraction of an uploaded resume within UPLOAD_LIMITS (cached on disk by content hash)."""
+    return extract_resume_cached(ResumeFile(data, "upload", file_type), **UPLOAD_LIMITS)
+
+
+def analyze_text(resume_text, job_text, company_name, top_n, lemma_mode):
+    """Worker task: one analysis (cached like in the UI)."""
+    return analyze_resume_against_job_cached(resume_text, job_text, company_name, lemma_mode=lemma_mode, top_n=top_n)
+
+
+async def read_request(reader):
+    """Returns (method, path, headers, body) of one HTTP/1.1 request."""
+    request_line = await reader.readline()
+    if not request_line:
+        raise ConnectionError("client closed the connection")
+    try:
+        method, path, _ = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Body larger than {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method, path.split("?", 1)[0], headers, body
+
+
+def _head(status, headers):
+    status = HTTPStatus(status)
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}", "Connection: close"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def send_json(writer, status, payload, headers=None):
+    body = json.dumps(payload).encode("utf-8")
+    writer.write(_head(status, {"Content-Type": "application/json", "Content-Length": len(body), **(headers or {})}))
+    writer.write(body)
+    await writer.drain()
+
+
+def _optional_str(value):
+    return value is None or isinstance(value, str)
+
+
+class AnalysisService:
+    """
+    The HTTP front end. `executor` defaults to a workers.create_pool process pool with
+    `max_workers` processes, warmed up before forking unless warm=False; `max_pending`
+    (default: workers * batch.IN_FLIGHT_PER_WORKER) caps the tasks queued or running at once.
+    """
+
+    def __init__(self, max_workers=None, max_pending=None, timeout=DEFAULT_TIMEOUT, executor=None, warm=True):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = executor if executor is not None else create_pool(self.max_workers, warm=warm)
+        self.max_pending = max_pending or self.max_workers * IN_FLIGHT_PER_WORKER
+        self.timeout = timeout
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.failed = 0
+        self._loop = None
+
+    def stats(self):
+        return {"workers": self.max_workers, "max_pending": self.max_pending, "pending": self.pending,
+                "completed": self.completed, "rejected": self.rejected, "timed_out": self.timed_out,
+                "failed": self.failed}
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        """Starts the workers, then listens; returns the asyncio Server (port=0 picks a free port)."""
+        self._loop = asyncio.get_running_loop()
+        # Fork the workers before any connection is open: a worker forked while a client socket
+        # is open keeps a copy of it, and that client would never see the connection close
+        await asyncio.gather(*(asyncio.wrap_future(self.executor.submit(os.getpid)) for _ in range(self.max_workers)))
+        return await asyncio.start_server(self.handle, host, port)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _reserve(self, tasks):
+        """Claims queue slots for `tasks` tasks, or answers 429 when the queue is full."""
+        if self.pending + tasks > self.max_pending:
+            self.rejected += 1
+            raise HTTPError(HTTPStatus.TOO_MANY_REQUESTS, "Too many pending analyses, retry later",
+                            {"Retry-After": RETRY_AFTER})
+        self.pending += tasks
+
+    def _task_done(self, _):
+        # Called from the executor's thread; pending is only touched on the event loop
+        self._loop.call_soon_threadsafe(self._release)
+
+    def _release(self, tasks=1):
+        self.pending -= tasks
+
+    async def run(self, fn, *args):
+        """Runs fn(*args) in the pool (its slot must already be reserved), within the task timeout."""
+        try:
+            future = self.executor.submit(fn, *args)
+        except RuntimeError as error:  # pool shut down or broken (BrokenProcessPool)
+            self._release()
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, f"Worker pool unavailable: {error}")
+        future.add_done_callback(self._task_done)
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise HTTPError(HTTPStatus.GATEWAY_TIMEOUT, f"Analysis took longer than {self.timeout:g}s")
+        except NLTKResourceError as error:
+            self.failed += 1
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, str(error))
+        except HTTPError:
+            raise
+        except Exception as error:
+            self.failed += 1
+            raise HTTPError(HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(error).__name__}: {error}")
+        self.completed += 1
+        return result
+
+    async def handle(self, reader, writer):
+        try:
+            try:
+                method, path, _, body = await asyncio.wait_for(read_request(reader), HEADER_TIMEOUT)
+                await self.dispatch(method, path, body, writer)
+            except HTTPError as error:
+                await send_json(writer, error.status, {"error": str(error)}, error.headers)
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                pass
+            except Exception as error:
+                await send_json(writer, HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(error).__name__}: {error}"})
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, body, writer):
+        routes = {
+            ("GET", "/health"): self.health,
+            ("POST", "/analyze"): self.analyze,
+            ("POST", "/analyze/batch"): self.analyze_batch,
+        }
+        handler = routes.get((method, path))
+        if handler is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {method} {path}")
+        await handler(body, writer)
+
+    async def health(self, body, writer):
+        await send_json(writer, HTTPStatus.OK, {"status": "ok", **self.stats()})
+
+    def _parse(self, body):
+        """Decodes the JSON request body into (payload, resume bytes or None, file type, options)."""
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be JSON")
+        if not isinstance(payload, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+        lemma_mode = payload.get("lemma_mode", "context")
+        if lemma_mode not in LEMMA_MODES:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"lemma_mode must be one of {LEMMA_MODES}")
+        try:
+            options = (int(payload.get("top_n", 5)), lemma_mode)
+        except (TypeError, ValueError):
+            options = (-1, lemma_mode)
+        if options[0] < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "top_n must be a non-negative integer")
+        if not _optional_str(payload.get("company_name")) or not _optional_str(payload.get("filename")):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "company_name and filename must be strings")
+        if "resume" in payload:
+            try:
+                data = base64.b64decode(payload["resume"], validate=True)
+            except (binascii.Error, TypeError):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "resume must be base64")
+            return payload, data, sniff_resume_type(data, payload.get("filename")), options
+        if not isinstance(payload.get("resume_text"), str):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Send resume (base64 file) or resume_text")
+        return payload, None, None, options
+
+    async def _resume_text(self, payload, data, file_type, reserved_after):
+        """
+        (resume text, response headers): uploads are extracted in the pool, and a resume cut short
+        by UPLOAD_LIMITS gets an X-Resume-Truncated header naming the limit. On failure releases
+        the `reserved_after` slots.
+        """
+        if data is None:
+            return payload["resume_text"], {}
+        try:
+            text, truncated = await self.run(extract_upload, data, file_type)
+            return text, {"X-Resume-Truncated": truncated} if truncated else {}
+        except HTTPError:
+            self._release(reserved_after)  # the analysis tasks will never be submitted
+            raise
+
+    async def analyze(self, body, writer):
+        payload, data, file_type, (top_n, lemma_mode) = self._parse(body)
+        if not isinstance(payload.get("job_text"), str):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "job_text is required")
+        self._reserve(2 if data is not None else 1)
+        resume_text, headers = await self._resume_text(payload, data, file_type, 1)
+        result = await self.run(analyze_text, resume_text, payload["job_text"], payload.get("company_name"),
+                                top_n, lemma_mode)
+        await send_json(writer, HTTPStatus.OK, result, headers)
+
+    async def analyze_batch(self, body, writer):
+        payload, data, file_type, (top_n, lemma_mode) = self._parse(body)
+        jobs = payload.get("jobs")
+        if not isinstance(jobs, list) or not all(
+            isinstance(job, dict) and isinstance(job.get("job_text"), str) and _optional_str(job.get("company_name"))
+            for job in jobs
+        ):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "jobs must be a list of {key, job_text, company_name} with string texts")
+        self._reserve(len(jobs) + (data is not None))
+        resume_text, headers = await self._resume_text(payload, data, file_type, len(jobs))
+
+        async def run_job(position, job):
+            key = job.get("key", position)
+            try:
+                result = await self.run(analyze_text, resume_text, job["job_text"],
+                                        job.get("company_name", payload.get("company_name")), top_n, lemma_mode)
+                return {"key": key, "result": result, "error": None}
+            except HTTPError as error:
+                return {"key": key, "result": None, "error": str(error)}
+
+        # Chunked NDJSON, one line per job in completion order
+        writer.write(_head(HTTPStatus.OK, {"Content-Type": "application/x-ndjson", "Transfer-Encoding": "chunked",
+                                           **headers}))
+        for finished in asyncio.as_completed([run_job(position, job) for position, job in enumerate(jobs)]):
+            line = json.dumps(await finished).encode("utf-8") + b"\n"
+            writer.write(b"%x\r\n%s\r\n" % (len(line), line))
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+async def serve(host, port, max_workers=None, max_pending=None, timeout=DEFAULT_TIMEOUT, warm=True):
+    service = AnalysisService(max_workers, max_pending, timeout, warm=warm)
+    server = await service.start(host, port)
+    print(f"Listening on http://{host}:{server.sockets[0].getsockname()[1]} "
+          f"({service.max_workers} workers, {service.max_pending} pending max)", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve resume analysis over local HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="tasks queued or running before answering 429 (default: 4 per worker)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per task before 504")
+    parser.add_argument("--cold", action="store_true",
+                        help="do not load the NLTK models before forking (each worker loads them on first use)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_pending, args.timeout, warm=not args.cold))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
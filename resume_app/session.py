@@ -0,0 +1,113 @@
+from array import array
+from collections import Counter
+
+from analyzer import excluded_lexicon, load_excluded_words
+from extractor import PreprocessedDocument, encode_text
+from instrumentation import increment
+from matcher import analyze_resume_against_job
+from vocabulary import Vocabulary
+
+
+class IncrementalDocument(PreprocessedDocument):
+    """
+    A PreprocessedDocument that can be updated in place with an edited version of its text.
+    The text is split into paragraphs (lines), each one encoded on its own (extractor.encode_text)
+    and kept by its text, so an update only tokenizes and lemmatizes the paragraphs that are new
+    or changed. The document's lemma ids are then the cached ids of its paragraphs joined in
+    order, and counting runs again on them (vectorized, so cheap next to lemmatization).
+    An emphasis phrase at the end of a paragraph boosts the first word of the paragraphs after
+    it, as in the whole text; company names and emphasis phrases never span a line break in
+    either. Paragraphs are POS-tagged on their own, so in "context" mode a lemma next to a line
+    break can differ from the whole-text analysis; "token" mode gives exactly the same result.
+    """
+
+    def __init__(self, text="", company_name=None, lemma_mode="context", emphasis_boost=0):
+        self.company_name = company_name
+        self.lemma_mode = lemma_mode
+        self.emphasis_boost = emphasis_boost
+        self.text = None
+        self.paragraphs = []
+        self.encoded = 0  # paragraphs encoded by the last update
+        self.reused = 0  # paragraphs taken from the previous version by the last update
+        self._paragraph_cache = {}  # paragraph text -> encode_text result
+        self._excluded_fingerprint = None
+        self.update(text)
+
+    def update(self, text):
+        """Switches to a new version of the text. Returns False (and does nothing) if it did not change."""
+        fingerprint = excluded_lexicon.current_fingerprint()
+        if fingerprint != self._excluded_fingerprint:
+            # The exclusion list changed, every paragraph has to be filtered again
+            self.excluded_words = load_excluded_words(self.company_name)
+            self._excluded_fingerprint = fingerprint
+            self._paragraph_cache = {}
+            self.vocabulary = Vocabulary()  # ids of the lemmas of every version since, freed with the document
+        elif text == self.text:
+            self.encoded, self.reused = 0, len(self.paragraphs)
+            return False
+
+        previous = self._paragraph_cache
+        cache = {}
+        self.encoded = self.reused = 0
+        for paragraph in text.split("\n"):
+            if paragraph in cache:
+                continue
+            if paragraph in previous:
+                cache[paragraph] = previous[paragraph]
+                self.reused += 1
+            else:
+                cache[paragraph] = encode_text(
+                    paragraph, self.vocabulary, self.excluded_words, self.company_name, self.lemma_mode, self.emphasis_boost
+                )
+                self.encoded += 1
+        increment("paragraphs.reused", self.reused)
+        increment("paragraphs.encoded", self.encoded)
+
+        self.text = text
+        self.paragraphs = text.split("\n")
+        self._paragraph_cache = cache  # only the current paragraphs are kept
+        self.token_count = 0
+        self.token_ids = array("I")
+        self.emphasis = Counter()
+        carried_boost = 0  # emphasis phrases still waiting for their word (see encode_text)
+        for paragraph in self.paragraphs:
+            token_count, token_ids, emphasis, trailing_boost = cache[paragraph]
+            self.token_count += token_count
+            self.token_ids.extend(token_ids)
+            if carried_boost and token_ids:
+                self.emphasis[self.vocabulary.terms[token_ids[0]]] += carried_boost
+                carried_boost = 0
+            if emphasis:
+                self.emphasis.update(emphasis)
+            carried_boost += trailing_boost
+        self._counts = {}
+        self._key_counts = {}
+        return True
+
+
+class AnalysisSession:
+    """
+    Repeated analyses of an edited resume against a posting. `analyze` takes the current texts;
+    both documents are IncrementalDocuments, so only edited paragraphs are processed again, and an
+    unchanged pair returns the previous result. Results are the same dicts analyze_resume_against_job returns.
+    """
+
+    def __init__(self, company_name=None, lemma_mode="context", top_n=5, tfidf_model=None, emphasis_boost=0):
+        self.company_name = company_name
+        self.lemma_mode = lemma_mode
+        self.top_n = top_n
+        self.tfidf_model = tfidf_model
+        self.emphasis_boost = emphasis_boost
+        self.resume = IncrementalDocument(company_name=company_name, lemma_mode=lemma_mode)
+        self.job = IncrementalDocument(company_name=company_name, lemma_mode=lemma_mode, emphasis_boost=emphasis_boost)
+        self.result = None
+
+    def analyze(self, resume_text, job_text):
+        changed = self.resume.update(resume_text)
+        changed = self.job.update(job_text) or changed
+        if changed or self.result is None:
+            self.result = analyze_resume_against_job(
+                self.resume, self.job, self.company_name, lemma_mode=self.lemma_mode, top_n=self.top_n,
+                tfidf_model=self.tfidf_model, emphasis_boost=self.emphasis_boost,
+            )
+        return self.result
@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import analyzer
+from analyzer import (
+    ExcludedWordsLexicon,
+    LEMMA_MODES,
+    NLTKResourceError,
+    ensure_nltk_resources,
+    lemmatize_tokens,
+    load_excluded_words,
+    penn_to_wordnet,
+)
+
+
+def test_penn_to_wordnet_defaults_to_noun():
+    assert penn_to_wordnet("VBG") == "v"
+    assert penn_to_wordnet("JJ") == "a"
+    assert penn_to_wordnet("RB") == "r"
+    assert penn_to_wordnet("NNS") == "n"
+    assert penn_to_wordnet("CD") == "n"
+
+
+def test_lemmatize_tokens_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        lemmatize_tokens(["python"], mode="fast")
+
+
+@pytest.mark.parametrize("mode", LEMMA_MODES)
+def test_lemmatize_tokens_empty(mode):
+    assert lemmatize_tokens([], mode=mode) == []
+
+
+def reference_lemma(word):
+    """The original, uncached lemmatize_word: NLTK tagging and WordNet called directly, then the special cases."""
+    from nltk import pos_tag
+    from nltk.stem import WordNetLemmatizer
+
+    pos = {"J": "a", "N": "n", "V": "v", "R": "r"}.get(pos_tag([word])[0][1][0].upper(), "n")
+    lemma = WordNetLemmatizer().lemmatize(word.lower(), pos)
+    return {"engineering": "engineer", "programming": "program", "developing": "develop",
+            "analyzing": "analyze"}.get(lemma, lemma)
+
+
+@pytest.mark.needs_nltk_data
+def test_token_mode_matches_the_original_lemmatizer(tmp_path):
+    tokens = "managed teams programming python services engineering running analyzing Developing".split()
+    instance = analyzer.Analyzer(lemma_table_path=str(tmp_path / "no_table.bin"))
+    lemmas = instance.lemmatize_tokens(tokens, mode="token")
+    assert lemmas == [reference_lemma(tok) for tok in tokens]
+    assert instance.lemmatize_tokens(tokens, mode="token") == lemmas  # cached the second time
+    assert dict(zip(tokens, lemmas)).items() >= {
+        ("teams", "team"), ("programming", "program"), ("python", "python"), ("services", "service"),
+        ("engineering", "engineer"),
+    }
+
+
+@pytest.mark.needs_nltk_data
+def test_context_mode_is_aligned_and_applies_special_cases():
+    tokens = "we are programming and engineering data pipelines".split()
+    lemmas = lemmatize_tokens(tokens, mode="context")
+    assert len(lemmas) == len(tokens)
+    assert lemmas[2] == "program"
+
+
+def write_lexicon(path, words, mtime_ns):
+    path.write_text(json.dumps({"articles": words[:1], "nested": [words[1:]]}), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_lexicon_parses_once_and_reloads_on_mtime_change(tmp_path):
+    path = tmp_path / "excluded_words.json"
+    write_lexicon(path, ["The", "and", "of"], 1_000_000_000)
+    lexicon = ExcludedWordsLexicon(str(path))
+
+    assert lexicon.base_words() == {"the", "and", "of"}
+    lexicon.with_company("Acme Corp")
+    assert lexicon.loads == 1
+
+    write_lexicon(path, ["the", "python"], 2_000_000_000)
+    assert "python" in lexicon.base_words()
+    assert lexicon.loads == 2
+
+
+def test_company_overlay_does_not_touch_base(tmp_path):
+    path = tmp_path / "excluded_words.json"
+    write_lexicon(path, ["the", "and"], 1_000_000_000)
+    lexicon = ExcludedWordsLexicon(str(path))
+
+    words = lexicon.with_company("Florida International University")
+    assert {"fiu", "florida", "florida international university", "the"} <= set(words)
+    assert "fiu" in words and "the" in words
+    assert "fiu" not in lexicon.base_words()
+    assert len(words) == len(set(words))
+
+
+def test_excluded_words_support_set_algebra():
+    excluded = load_excluded_words("Acme")
+    assert "acme" in excluded | {"python"} and "python" in excluded | {"python"}
+    assert excluded & {"acme", "python"} == {"acme"}
+    assert "acme" not in excluded - {"acme"}
+    assert isinstance(excluded - {"acme"}, frozenset)
+    assert set(excluded) ^ excluded == set()
+
+
+def test_missing_lexicon_file_is_empty(tmp_path):
+    lexicon = ExcludedWordsLexicon(str(tmp_path / "missing.json"))
+    assert len(lexicon.with_company(None)) == 0
+
+
+def test_offline_mode_fails_fast_on_missing_resources(monkeypatch):
+    monkeypatch.setitem(analyzer.NLTK_RESOURCES, "corpora/not_a_real_corpus", "not_a_real_corpus")
+    with pytest.raises(NLTKResourceError, match="corpora/not_a_real_corpus"):
+        ensure_nltk_resources(offline=True)
+
+
+STRESS_TEXTS = [
+    "Senior engineers building data pipelines and programming analytics services",
+    "Developing machine learning models, analyzing experiments and reviewing code",
+    "Managed teams of developers shipping APIs, dashboards and deployments",
+]
+STRESS_THREADS = 16
+
+
+def run_concurrently(task, arguments):
+    """Runs task(argument) for every argument on its own thread, all released at once; results in order."""
+    barrier = threading.Barrier(len(arguments))
+    with ThreadPoolExecutor(len(arguments)) as pool:
+        return list(pool.map(lambda argument: (barrier.wait(), task(argument))[1], arguments))
+
+
+@pytest.fixture
+def table_analyzer(table_lemmas):
+    """A cold Analyzer whose lemma table covers STRESS_TEXTS, so "token" mode needs no NLTK data."""
+    return table_lemmas(*STRESS_TEXTS)
+
+
+def test_analyzers_keep_their_own_caches(table_analyzer):
+    assert table_analyzer.lemmatize_tokens(["engineers"], mode="token") == ["engineer"]
+    table_analyzer.lemmatize_with_pos("engineers", "n")
+    assert table_analyzer.lemmatize_with_pos.cache_info().currsize == 1
+    assert analyzer.Analyzer().lemmatize_with_pos.cache_info().currsize == 0
+
+
+def test_concurrent_table_lemmatization_matches_serial(table_analyzer):
+    token_lists = [text.lower().replace(",", "").split() for text in STRESS_TEXTS] * (STRESS_THREADS // 2)
+    serial = [analyzer.Analyzer(lemma_table_path=table_analyzer.lemma_table_path).lemmatize_tokens(tokens, "token")
+              for tokens in token_lists]
+    concurrent = run_concurrently(lambda tokens: table_analyzer.lemmatize_tokens(tokens, "token"), token_lists)
+    assert concurrent == serial
+
+
+@pytest.mark.needs_nltk_data
+@pytest.mark.parametrize("mode", LEMMA_MODES)
+def test_cold_analyzer_under_threads_matches_serial(mode):
+    from extractor import TOKEN_PATTERN
+
+    token_lists = [TOKEN_PATTERN.findall(text.lower()) for text in STRESS_TEXTS] * (STRESS_THREADS // 2)
+    serial = [analyzer.Analyzer().lemmatize_tokens(tokens, mode) for tokens in token_lists]
+    # Every thread hits the same unloaded analyzer at once, so WordNet and the tagger load under contention
+    shared = analyzer.Analyzer()
+    assert run_concurrently(lambda tokens: shared.lemmatize_tokens(tokens, mode), token_lists) == serial
+
+
+@pytest.mark.needs_nltk_data
+def test_concurrent_analyses_match_serial(monkeypatch):
+    from matcher import analyze_resume_against_job
+
+    pairs = [(resume, job) for resume in STRESS_TEXTS for job in STRESS_TEXTS]
+    serial = [analyze_resume_against_job(resume, job, "Acme") for resume, job in pairs]
+    monkeypatch.setattr(analyzer, "default_analyzer", analyzer.Analyzer())
+    concurrent = run_concurrently(lambda pair: analyze_resume_against_job(*pair, "Acme"), pairs)
+    assert concurrent == serial
@@ -0,0 +1,47 @@
+import pytest
+
+from batch import analyze_resume_against_jobs, analyze_resumes_against_job, iter_items
+
+RESUME = "Python developer. Built Python data pipelines and SQL reports. Data pipelines on AWS."
+JOBS = {
+    "data": "We need Python and SQL. Python data pipelines, data pipelines daily.",
+    "web": "React and React Native developer, frontend React work.",
+}
+
+
+def test_iter_items_accepts_mappings_sequences_and_company_tuples():
+    assert list(iter_items(["a", ("b", "Acme")])) == [(0, "a", None), (1, "b", "Acme")]
+    assert list(iter_items({"x": "a"})) == [("x", "a", None)]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_bad_item_does_not_stop_the_batch(max_workers):
+    results = {r.key: r for r in analyze_resume_against_jobs("", ["", None], max_workers=max_workers)}
+    assert results[0].error is None
+    assert results[0].result["match_score"] is None
+    assert results[1].result is None
+    assert "AttributeError" in results[1].error
+
+
+def test_interleaved_inline_batches_keep_their_own_resume(table_lemmas):
+    other_resume = "Java developer. Java services."
+    table_lemmas(RESUME, other_resume, *JOBS.values())
+    first = analyze_resume_against_jobs(RESUME, JOBS, lemma_mode="token", max_workers=1)
+    second = analyze_resume_against_jobs(other_resume, JOBS, lemma_mode="token", max_workers=1)
+    results = [next(first), next(second), next(first), next(second)]
+    alone = {r.key: r.result for r in analyze_resume_against_jobs(RESUME, JOBS, lemma_mode="token", max_workers=1)}
+    assert [r.result for r in results[::2]] == [alone["data"], alone["web"]]
+    assert results[0].result != results[1].result
+
+
+@pytest.mark.needs_nltk_data
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_batch_matches_single_analysis(max_workers):
+    from matcher import analyze_resume_against_job
+
+    results = {r.key: r.result for r in analyze_resume_against_jobs(RESUME, JOBS, max_workers=max_workers)}
+    for key, job in JOBS.items():
+        assert results[key] == analyze_resume_against_job(RESUME, job)
+
+    reverse = {r.key: r.result for r in analyze_resumes_against_job({"me": RESUME}, JOBS["data"], max_workers=max_workers)}
+    assert reverse["me"] == results["data"]
@@ -0,0 +1,31 @@
+import io
+
+from benchmarks.bench_pipeline import compare, parse_size, run_benchmarks
+from benchmarks.fixtures import make_job_text, make_resume_text
+
+
+def test_generated_documents_have_the_requested_size():
+    assert len(make_resume_text(1000)) == 1000
+    assert len(make_job_text(5000)) == 5000
+    assert make_resume_text(1000) == make_resume_text(1000)
+
+
+def test_parse_size():
+    assert [parse_size(label) for label in ("500", "16k", "1M")] == [500, 16384, 2**20]
+
+
+def test_compare_flags_only_regressions_over_threshold():
+    baseline = {"tokenize@1k": {"seconds": 1.0, "peak_bytes": 100}, "gone@1k": {"seconds": 1.0, "peak_bytes": 1}}
+    results = {
+        "tokenize@1k": {"seconds": 1.2, "peak_bytes": 200},
+        "new@1k": {"seconds": 9.0, "peak_bytes": 9},
+    }
+    assert compare(results, baseline, threshold=0.25) == ["tokenize@1k peak_bytes: 100 -> 200 (+100%)"]
+    assert len(compare(results, baseline, threshold=0.1)) == 2
+
+
+def test_run_benchmarks_reports_every_size():
+    out = io.StringIO()
+    results = run_benchmarks(["tokenize"], ["1k", "2k"], repeat=1, out=out)
+    assert set(results) == {"tokenize@1k", "tokenize@2k"}
+    assert results["tokenize@2k"]["unit"] == "chars" and results["tokenize@2k"]["peak_bytes"] > 0
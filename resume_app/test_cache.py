@@ -0,0 +1,53 @@
+import os
+import time
+
+import matcher
+from analyzer import ExcludedWordsLexicon
+from cache import DiskCache, MemoryCache, TieredCache, sha256_hex
+from matcher import analyze_resume_against_job_cached
+
+
+def test_hits_misses_and_lru_eviction(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"), max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"5678")
+    assert cache.get("a") == b"1234"  # "a" is now the most recently used
+    cache.put("c", b"9999")  # 12 bytes > 10: evicts "b"
+    assert cache.get("b") is None
+    assert cache.get("c") == b"9999"
+    assert cache.stats() == {"hits": 2, "misses": 1, "evictions": 1, "entries": 2, "bytes": 8}
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"), ttl=0.05)
+    cache.put("a", b"x")
+    assert cache.get("a") == b"x"
+    time.sleep(0.1)
+    assert cache.get("a", b"gone") == b"gone"
+
+
+def test_cache_is_shared_through_the_file(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    DiskCache(path).put(sha256_hex("resume"), b"text")
+    assert DiskCache(path).get(sha256_hex("resume")) == b"text"
+
+
+def test_result_cache_tiers_and_lexicon_invalidation(tmp_path, monkeypatch):
+    lexicon_path = tmp_path / "excluded_words.json"
+    lexicon_path.write_text('{"articles": ["the"]}')
+    monkeypatch.setattr(matcher, "excluded_lexicon", ExcludedWordsLexicon(str(lexicon_path)))
+    disk_path = str(tmp_path / "results.sqlite")
+    cache = TieredCache(MemoryCache(), DiskCache(disk_path))
+
+    first = analyze_resume_against_job_cached("", " ", "Acme", cache=cache)
+    assert analyze_resume_against_job_cached(" ", "", "Acme", cache=cache) is first
+    assert cache.stats()["memory_hits"] == 1
+
+    fresh_process = TieredCache(MemoryCache(), DiskCache(disk_path))
+    assert analyze_resume_against_job_cached("", "", "Acme", cache=fresh_process) == first
+    assert fresh_process.disk_hits == 1
+
+    lexicon_path.write_text('{"articles": ["the", "a"]}')
+    os.utime(lexicon_path, ns=(2_000_000_000, 2_000_000_000))
+    analyze_resume_against_job_cached("", "", "Acme", cache=cache)
+    assert cache.misses == 2
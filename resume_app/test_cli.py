@@ -0,0 +1,68 @@
+import json
+
+import cli
+from cli import find_files, main, read_checkpoint, read_job_text
+
+
+def test_find_files_filters_and_sorts(tmp_path):
+    (tmp_path / "b").mkdir()
+    for name in ["b/z.pdf", "a.docx", "notes.md", "c.PDF"]:
+        (tmp_path / name).write_bytes(b"")
+    found = [p[len(str(tmp_path)) + 1:] for p in find_files(str(tmp_path), (".pdf", ".docx"))]
+    assert found == ["a.docx", "c.PDF", "b/z.pdf"]
+
+
+def test_read_job_text_strips_html(tmp_path):
+    path = tmp_path / "job.html"
+    path.write_text("<html><style>p{}</style><body><h1>Data Engineer</h1><p>Python &amp; SQL</p></body></html>")
+    assert read_job_text(str(path)) == "Data Engineer\nPython & SQL"
+
+
+def test_checkpoint_skips_done_pairs_and_drops_partial_line(tmp_path):
+    output = tmp_path / "out.jsonl"
+    done = {"resume": "r.pdf", "job": "a.txt", "result": {}, "error": None}
+    failed = {"resume": "r.pdf", "job": "b.txt", "result": None, "error": "boom"}
+    output.write_text(json.dumps(done) + "\n" + json.dumps(failed) + "\n" + '{"resume": "r.pd')
+    assert read_checkpoint(str(output)) == {("r.pdf", "a.txt")}
+    assert output.read_text() == json.dumps(done) + "\n"  # the failed pair is retried, its error line dropped
+
+
+def test_checkpoint_skips_lines_that_are_not_records(tmp_path):
+    output = tmp_path / "out.jsonl"
+    done = {"resume": "r.pdf", "job": "a.txt", "result": {}, "error": None}
+    lines = [json.dumps(done), "[1, 2]", '{"resume": "r.pdf"}', '"text"', "not json"]
+    output.write_text("\n".join(lines) + "\n")
+    assert read_checkpoint(str(output)) == {("r.pdf", "a.txt")}
+    assert output.read_text() == json.dumps(done) + "\n"
+
+
+def test_unreadable_resume_is_reported_not_raised(tmp_path):
+    (tmp_path / "resumes").mkdir()
+    (tmp_path / "jobs").mkdir()
+    (tmp_path / "resumes" / "broken.pdf").write_bytes(b"not a pdf")
+    (tmp_path / "jobs" / "job.txt").write_text("Python developer")
+    output = tmp_path / "out.jsonl"
+
+    assert main(["--resumes", str(tmp_path / "resumes"), "--jobs", str(tmp_path / "jobs"),
+                 "--output", str(output), "--workers", "1"]) == 1
+    [record] = [json.loads(line) for line in output.read_text().splitlines()]
+    assert record["result"] is None and record["error"]
+
+
+def test_broken_resume_is_parsed_once(tmp_path, monkeypatch):
+    (tmp_path / "resumes").mkdir()
+    (tmp_path / "jobs").mkdir()
+    (tmp_path / "resumes" / "broken.pdf").write_bytes(b"not a pdf")
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (tmp_path / "jobs" / name).write_text("Python developer")
+    opened = []
+    real_open = cli.open_resume_file
+    monkeypatch.setattr(cli, "open_resume_file", lambda path: opened.append(path) or real_open(path))
+    cli.load_resume.cache_clear()
+
+    assert main(["--resumes", str(tmp_path / "resumes"), "--jobs", str(tmp_path / "jobs"),
+                 "--output", str(tmp_path / "out.jsonl"), "--workers", "1"]) == 1
+    records = [json.loads(line) for line in (tmp_path / "out.jsonl").read_text().splitlines()]
+    assert len(records) == 3 and all(record["error"] for record in records)
+    assert len(opened) == 1
+
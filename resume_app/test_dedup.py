@@ -0,0 +1,61 @@
+import pytest
+
+from batch import analyze_resume_against_jobs
+from dedup import MinHasher, NearDuplicateIndex, PostingDeduplicator, lsh_bands, normalize_posting, shingles, similarity
+
+POSTING = """Senior Data Engineer. We are looking for a data engineer to design, build and operate batch
+and streaming data pipelines on AWS. You will own our Airflow orchestration, model warehouse tables
+in dbt, review Python and SQL code, and mentor two junior engineers. Requirements: five years of
+Python, strong SQL, experience with Spark or Flink, and a habit of writing tests and documentation.
+Benefits include remote work, a learning budget and flexible hours."""
+REPOST = POSTING.replace("Senior Data Engineer.", "Senior Data Engineer (Reposted)") + "\nApply via jobs.example.com?utm_source=feed"
+LOCATION_VARIANT = POSTING.replace("remote work", "hybrid work in Austin, TX")
+OTHER = """Frontend Developer. Build React and TypeScript interfaces for our checkout flow, work with
+designers on accessibility, write component tests with Jest and keep bundle sizes small. Experience
+with GraphQL, CSS animations and design systems is a plus. We offer equity and a yearly offsite."""
+RESUME = "Python data engineer building Airflow data pipelines on AWS with SQL, dbt and Spark."
+
+
+def test_lsh_bands_put_the_s_curve_near_the_threshold():
+    for threshold in (0.5, 0.8, 0.9):
+        bands, rows = lsh_bands(threshold)
+        assert bands * rows <= 128
+        assert abs((1 / bands) ** (1 / rows) - threshold) < 0.05
+
+
+def test_minhash_estimates_jaccard():
+    first = shingles(normalize_posting(POSTING))
+    second = shingles(normalize_posting(LOCATION_VARIANT))
+    exact = len(first & second) / len(first | second)
+    hasher = MinHasher()
+    assert similarity(hasher.signature(first), hasher.signature(second)) == pytest.approx(exact, abs=0.1)
+    assert similarity(hasher.signature(first), hasher.signature(first)) == 1.0
+
+
+def test_index_clusters_reposts_and_keeps_distinct_postings_apart():
+    index = NearDuplicateIndex(threshold=0.7)
+    assert index.add("a", POSTING) == "a"
+    assert index.add("b", OTHER) == "b"
+    assert index.add("c", REPOST) == "a"
+    assert index.add("d", LOCATION_VARIANT) == "a"
+    assert index.clusters == {"a": ["a", "c", "d"], "b": ["b"]}
+    assert NearDuplicateIndex(threshold=0.99).add("x", POSTING) == "x"
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_batch_analyzes_each_cluster_once_and_fans_out(table_lemmas, max_workers):
+    table_lemmas(POSTING, REPOST, OTHER, RESUME)
+    jobs = {"a": POSTING, "b": OTHER, "c": REPOST, "d": (REPOST, "Acme"), "e": None}
+    dedup = PostingDeduplicator(threshold=0.7)
+    results = {r.key: r for r in analyze_resume_against_jobs(
+        RESUME, jobs, lemma_mode="token", max_workers=max_workers, dedup=dedup
+    )}
+    plain = {r.key: r for r in analyze_resume_against_jobs(RESUME, jobs, lemma_mode="token", max_workers=1)}
+
+    assert sorted(results) == sorted(jobs)
+    assert results["c"].result == results["a"].result == plain["a"].result
+    assert results["d"].result == plain["d"].result  # another company is never merged
+    assert results["e"].error is not None
+    assert (dedup.postings, dedup.duplicates, dedup.analyzed, dedup.reused) == (5, 1, 4, 1)
+    assert dedup.ratio == pytest.approx(0.2)
+    assert "1 near-duplicates" in dedup.report()
@@ -0,0 +1,126 @@
+from collections import Counter
+
+import pytest
+
+from benchmarks.fixtures import make_docx, make_pdf, make_template_docx
+from cache import DiskCache
+from extractor import (
+    DOCX_BACKENDS,
+    DOCX_TYPE,
+    PDF_BACKENDS,
+    Extraction,
+    PDF_TYPE,
+    PreprocessedDocument,
+    ResumeFile,
+    extract_bigrams,
+    extract_docx_text,
+    extract_resume,
+    extract_resume_cached,
+    extract_keywords,
+    extract_resume_text,
+    extract_resume_text_cached,
+    iter_pdf_pages,
+    top_terms,
+)
+
+JOB_TEXT = """
+We need a Python developer to build data pipelines. Python and SQL experience required.
+You will build data pipelines, maintain data pipelines and review Python code daily.
+"""
+
+
+def test_top_terms_drops_singletons_and_respects_top_n():
+    counts = Counter({"python": 4, "sql": 2, "rust": 1, "data": 3})
+    assert top_terms(counts, top_n=2) == [("python", 4, 10), ("data", 3, 8)]
+    assert [term for term, _, _ in top_terms(counts, top_n=None)] == ["python", "data", "sql"]
+
+
+@pytest.mark.needs_nltk_data
+def test_document_views_match_extract_functions():
+    doc = PreprocessedDocument(JOB_TEXT)
+    assert extract_keywords(doc, top_n=None) == extract_keywords(JOB_TEXT, top_n=None)
+    assert extract_bigrams(doc, top_n=None) == extract_bigrams(JOB_TEXT, top_n=None)
+    assert ("data pipeline", 3, 10) in extract_bigrams(doc, top_n=None)
+
+
+@pytest.mark.needs_nltk_data
+def test_ngrams_skip_excluded_words():
+    doc = PreprocessedDocument(JOB_TEXT)
+    for gram in doc.ngrams(3):
+        assert not any(word in doc.excluded_words for word in gram)
+    assert doc.ngram_counts(2) is doc.ngram_counts(2)
+
+
+PAGES = [f"Page {number} Python developer building data pipelines" for number in range(1, 6)]
+
+
+@pytest.mark.parametrize("backend", PDF_BACKENDS)
+def test_pdf_backends_extract_the_same_pages(backend):
+    assert list(iter_pdf_pages(ResumeFile(make_pdf(PAGES), "cv.pdf", PDF_TYPE), backend)) == PAGES
+
+
+@pytest.mark.parametrize("backend", PDF_BACKENDS)
+def test_pdf_extraction_reports_the_limit_that_cut_it_short(backend):
+    def extract(**limits):
+        return extract_resume(ResumeFile(make_pdf(PAGES), "cv.pdf", PDF_TYPE), pdf_backend=backend, **limits)
+
+    assert extract() == Extraction("\n".join(PAGES), None)
+    assert extract(max_pages=2) == Extraction("\n".join(PAGES[:2]), "pages")
+    assert extract(max_pages=5).truncated is None
+    assert extract(max_chars=60) == Extraction((PAGES[0] + "\n" + PAGES[1])[:60], "chars")
+    assert extract(max_chars=len("\n".join(PAGES))).truncated is None
+    assert extract(time_budget=0) == Extraction(PAGES[0], "time")
+
+
+def test_unknown_pdf_backend():
+    with pytest.raises(ValueError):
+        extract_resume_text(ResumeFile(make_pdf(PAGES), "cv.pdf", PDF_TYPE), pdf_backend="ocr")
+
+
+@pytest.mark.parametrize("backend", DOCX_BACKENDS)
+def test_docx_backends_extract_the_same_paragraphs(backend):
+    paragraphs = ["Python developer", "Skills:\tSQL, Docker", "", "Built data pipelines & APIs"]
+    docx = ResumeFile(make_docx(paragraphs), "cv.docx", DOCX_TYPE)
+    assert extract_docx_text(docx, backend) == Extraction("\n".join(paragraphs), None)
+
+
+def test_docx_extraction_reads_template_parts_once_in_order():
+    docx = make_template_docx(
+        header=["Jane Doe", "jane@example.com"], sidebar=["Languages: Spanish"],
+        skills=[("Python", "Expert"), ("SQL", "Advanced")], paragraphs=["Built data pipelines."], footer=["Page 1"],
+    )
+    text = extract_resume_text(ResumeFile(docx, "cv.docx", DOCX_TYPE))
+    # Same header on the first and later pages, text box without its VML copy, one line per table cell
+    assert text.split("\n") == [
+        "Jane Doe", "jane@example.com", "Languages: Spanish", "", "Python", "Expert", "SQL", "Advanced",
+        "Built data pipelines.", "Page 1",
+    ]
+    assert extract_resume(ResumeFile(docx, "cv.docx", DOCX_TYPE), max_chars=12) == Extraction("Jane Doe\njan", "chars")
+
+
+def test_cached_extraction_parses_each_file_once(tmp_path):
+    cache = DiskCache(str(tmp_path / "text.sqlite"))
+    upload = ResumeFile(make_pdf(PAGES), "cv.pdf", PDF_TYPE)
+    same_bytes = ResumeFile(make_pdf(PAGES), "renamed.pdf", PDF_TYPE)
+    assert extract_resume_text_cached(upload, cache) == extract_resume_text(upload)
+    assert extract_resume_text_cached(same_bytes, cache) == extract_resume_text(upload)
+    assert extract_resume_text_cached(same_bytes, cache, max_pages=1) == PAGES[0]
+    assert extract_resume_cached(same_bytes, cache, max_pages=1) == Extraction(PAGES[0], "pages")
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_cached_extraction_skips_text_cut_by_the_time_budget(tmp_path):
+    cache = DiskCache(str(tmp_path / "text.sqlite"))
+    upload = ResumeFile(make_pdf(PAGES), "cv.pdf", PDF_TYPE)
+    assert extract_resume_cached(upload, cache, time_budget=0).truncated == "time"
+    assert extract_resume_cached(upload, cache) == Extraction("\n".join(PAGES), None)
+    assert cache.misses == 2
+
+
+@pytest.mark.needs_nltk_data
+def test_emphasis_boost_counts_the_word_after_the_phrase():
+    text = "We need a Kubernetes expert. Python, Python and Kubernetes."
+    plain = dict((w, c) for w, c, _ in extract_keywords(text, top_n=None))
+    boosted = dict((w, c) for w, c, _ in extract_keywords(text, top_n=None, emphasis_boost=1.5))
+    assert boosted["kubernetes"] == plain["kubernetes"] + 1.5
+    assert boosted["python"] == plain["python"]
@@ -0,0 +1,41 @@
+import os
+import statistics
+import subprocess
+import sys
+
+import pytest
+
+# Budget (seconds) for a cold `import <module>` in a fresh interpreter, median of a few runs.
+# Heavy dependencies (nltk, pdfplumber, python-docx) must only be imported on first use.
+IMPORT_BUDGET_SECONDS = {"extractor": 0.25, "matcher": 0.25}
+RUNS = 3
+
+MEASURE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = sorted(name for name in ("nltk", "pdfplumber", "docx") if name in sys.modules)
+print(elapsed, ",".join(heavy), file=sys.stderr)
+"""
+
+
+def measure_import(module):
+    env = dict(os.environ, RESUME_ANALYZER_OFFLINE="1")
+    proc = subprocess.run(
+        [sys.executable, "-c", MEASURE.format(module=module)],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env, capture_output=True, text=True, check=True,
+    )
+    elapsed, _, heavy = proc.stderr.strip().splitlines()[-1].partition(" ")
+    return float(elapsed), heavy, proc.stdout
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGET_SECONDS))
+def test_import_is_fast_quiet_and_lazy(module):
+    runs = [measure_import(module) for _ in range(RUNS)]
+    median = statistics.median(elapsed for elapsed, _, _ in runs)
+    _, heavy, stdout = runs[-1]
+    print(f"import {module}: {median * 1000:.1f} ms (budget {IMPORT_BUDGET_SECONDS[module] * 1000:.0f} ms)")
+    assert stdout == ""
+    assert heavy == ""
+    assert median < IMPORT_BUDGET_SECONDS[module]
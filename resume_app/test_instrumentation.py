@@ -0,0 +1,52 @@
+import time
+
+from benchmarks.fixtures import make_pdf
+from cache import DiskCache
+from extractor import PDF_TYPE, ResumeFile, extract_resume_text_cached
+from instrumentation import EXTRACTION, Recorder, increment, recording, span
+
+
+def test_spans_and_counters_are_only_recorded_inside_recording():
+    with span("outside"):
+        increment("outside")
+    with recording() as recorder:
+        with span("outer"):
+            with span("inner"):
+                time.sleep(0.001)
+            increment("tokens", 3)
+        increment("tokens")
+    assert [(name, depth) for name, _, _, depth in recorder.spans] == [("inner", 1), ("outer", 0)]
+    assert recorder.totals()["outer"][1] >= recorder.totals()["inner"][1] > 0
+    assert recorder.counters == {"tokens": 4}
+
+
+def test_disabled_span_is_a_shared_no_op():
+    assert span("a") is span("b")
+
+
+def test_custom_recorder_and_opt_in_capture():
+    class Forwarding(Recorder):
+        def __init__(self):
+            super().__init__(profile=True, trace_memory=True)
+            self.forwarded = []
+
+        def on_span(self, name, offset, seconds, depth):
+            self.forwarded.append(name)
+
+    recorder = Forwarding()
+    with recording(recorder):
+        with span("work"):
+            data = [str(i) for i in range(10000)]
+    assert recorder.forwarded == ["work"] and recorder.spans == []
+    assert recorder.peak_memory > 0 and data
+    assert "function calls" in recorder.profile_report()
+
+
+def test_extraction_span_and_cache_counters(tmp_path):
+    cache = DiskCache(str(tmp_path / "text.sqlite"))
+    upload = ResumeFile(make_pdf(["Python developer"]), "cv.pdf", PDF_TYPE)
+    with recording() as recorder:
+        extract_resume_text_cached(upload, cache)
+        extract_resume_text_cached(upload, cache)
+    assert recorder.totals()[EXTRACTION][0] == 1
+    assert recorder.counters == {"text_cache.misses": 1, "text_cache.hits": 1}
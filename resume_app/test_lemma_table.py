@@ -0,0 +1,54 @@
+import pytest
+
+import analyzer
+from lemma_table import LemmaTable, load_table, pos_key, write_table
+
+FINGERPRINT = b"f" * 32
+ENTRIES = {
+    "developers": "developer",
+    pos_key("developers", "n"): "developer",
+    "engineering": "engineer",
+    "ünïcode": "unicode",
+    "a": "a",
+}
+
+
+def test_lookup_hits_misses_and_stats(tmp_path):
+    path = str(tmp_path / "lemmas.bin")
+    write_table(ENTRIES, path, FINGERPRINT)
+    table = LemmaTable(path)
+    assert len(table) == len(ENTRIES)
+    for key, lemma in ENTRIES.items():
+        assert table.get(key) == lemma
+    assert table.get("python") is None
+    assert table.get(pos_key("python", "v")) is None
+    assert table.get("") is None and table.get("zzz") is None
+    assert table.stats()["hits"] == 5 and table.stats()["misses"] == 4
+
+    misses = tmp_path / "misses.txt"
+    table.write_misses(str(misses))
+    assert misses.read_text().splitlines() == ["python", "", "zzz"]
+    table.close()
+
+
+def test_tables_with_other_rules_are_ignored(tmp_path):
+    path = str(tmp_path / "lemmas.bin")
+    write_table(ENTRIES, path, FINGERPRINT)
+    assert load_table(path, b"x" * 32) is None
+    assert load_table(str(tmp_path / "missing.bin"), FINGERPRINT) is None
+    (tmp_path / "junk.bin").write_bytes(b"not a table")
+    with pytest.raises(ValueError):
+        LemmaTable(str(tmp_path / "junk.bin"))
+
+
+def test_analyzer_uses_the_table_before_nltk(tmp_path, monkeypatch):
+    path = str(tmp_path / "lemmas.bin")
+    write_table(ENTRIES, path, analyzer.lemma_rules_fingerprint())
+    monkeypatch.setattr(analyzer, "default_analyzer", analyzer.Analyzer(lemma_table_path=path))
+    try:
+        # No NLTK data is needed for words in the table
+        assert analyzer.lemmatize_word("developers") == "developer"
+        assert analyzer.lemmatize_with_pos("Developers", "n") == "developer"
+        assert analyzer.get_lemma_table().stats()["hits"] == 2
+    finally:
+        analyzer.default_analyzer.close()
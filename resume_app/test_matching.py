@@ -0,0 +1,19 @@
+from matcher import match_terms, normalize_text, weighted_match_score
+
+
+def test_match_terms_single_pass():
+    job_terms = [("python", 4, 10), ("sql", 2, 5), ("cloud", 2, 5)]
+    matches, missing, matched_weight, total_weight = match_terms(job_terms, {"python", "cloud", "java"})
+    assert matches == [("python", 4), ("cloud", 2)]
+    assert missing == ["sql"]
+    assert (matched_weight, total_weight) == (15, 20)
+    assert weighted_match_score(matched_weight, total_weight) == 75.0
+
+
+def test_weighted_match_score_without_job_terms():
+    assert weighted_match_score(0, 0) is None
+
+
+def test_normalize_text_collapses_whitespace_and_unicode():
+    assert normalize_text("  Python\u00a0developer\n\n  ＳＱＬ ") == "Python developer SQL"
+    assert normalize_text(None) == ""
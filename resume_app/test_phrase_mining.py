@@ -0,0 +1,57 @@
+import random
+from collections import Counter
+
+from phrase_mining import PhraseMiner, SpaceSaving, iter_blocks, iter_ngrams
+
+
+def test_iter_ngrams_skips_across_excluded_tokens():
+    tokens = iter(["build", "the", "data", "and", "pipeline", "daily"])
+    assert list(iter_ngrams(tokens, 3, excluded={"the", "and"})) == [
+        ("build", "data", "pipeline"),
+        ("data", "pipeline", "daily"),
+    ]
+    assert list(iter_ngrams(["python"], 2)) == []
+
+
+def test_space_saving_is_exact_while_it_has_room():
+    stream = list("abracadabra")
+    summary = SpaceSaving(capacity=10)
+    summary.update(stream)
+    assert summary.top() == [(item, count, 0) for item, count in Counter(stream).most_common()]
+
+
+def test_space_saving_bounds_memory_and_keeps_heavy_hitters():
+    rng = random.Random(7)
+    stream = ["python"] * 3000 + ["sql"] * 1500 + [f"rare{rng.randrange(5000)}" for _ in range(20000)]
+    rng.shuffle(stream)
+    truth = Counter(stream)
+    summary = SpaceSaving(capacity=50)
+    summary.update(stream)
+
+    assert len(summary) == 50
+    assert summary.total == len(stream)
+    assert [item for item, _, _ in summary.top(2)] == ["python", "sql"]
+    for item, count, error in summary.top():
+        assert count - error <= truth[item] <= count
+        assert error <= summary.total / summary.capacity
+
+
+def test_phrase_miner_counts_ngrams_across_blocks_but_not_documents():
+    miner = PhraseMiner(ns=(2, 3), capacity=100, excluded_words={"and"}, lemma_mode=None)
+    miner.add_document(["we build data", " pipelines and data pipelines"])
+    miner.add_document("pipelines data")
+    assert dict((phrase, count) for phrase, count, _ in miner.top(2)) == {
+        "we build": 1, "build data": 1, "data pipelines": 2, "pipelines data": 2,
+    }
+    assert miner.top(3, 1) == [("we build data", 1, 0)]
+    assert (miner.documents, miner.tokens) == (2, 8)
+
+
+def test_iter_blocks_ends_blocks_on_line_boundaries(tmp_path):
+    path = tmp_path / "archive.txt"
+    lines = [f"senior python developer {number}\n" for number in range(200)]
+    path.write_text("".join(lines))
+    blocks = list(iter_blocks(str(path), block_chars=100))
+    assert len(blocks) > 1
+    assert all(block.endswith("\n") for block in blocks)
+    assert "".join(blocks) == "".join(lines)
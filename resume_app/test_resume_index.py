@@ -0,0 +1,55 @@
+import random
+
+from resume_index import ResumeIndex
+
+VOCABULARY = [f"term{number}" for number in range(40)]
+
+
+def brute_force(docs, weighted_terms, k):
+    total = sum(weighted_terms.values())
+    scored = sorted(
+        ((-sum(w for t, w in weighted_terms.items() if t in terms), key) for key, terms in docs.items()),
+    )
+    return [(key, 100.0 * -neg / total) for neg, key in scored if neg < 0][:k]
+
+
+def build(docs):
+    index = ResumeIndex()
+    for key, terms in docs.items():
+        index.add_terms(key, terms)
+    return index
+
+
+def test_query_matches_brute_force_ranking():
+    rng = random.Random(7)
+    docs = {f"r{number:03d}": set(rng.sample(VOCABULARY, rng.randint(1, 12))) for number in range(300)}
+    index = build(docs)
+    for _ in range(20):
+        weighted = {term: rng.randint(1, 10) for term in rng.sample(VOCABULARY, 8)}
+        assert index.query_terms(weighted, k=5) == brute_force(docs, weighted, 5)
+
+
+def test_remove_readd_and_compact():
+    docs = {"a": {"python", "sql"}, "b": {"python"}, "c": {"java"}}
+    index = build(docs)
+    index.remove("a")
+    index.add_terms("c", {"python", "sql"})
+    assert "a" not in index and len(index) == 2
+    assert index.query_terms({"python": 2, "sql": 1}, k=3) == [("c", 100.0), ("b", 100.0 * 2 / 3)]
+    index.compact()
+    assert index.keys == ["b", "c"]
+    assert index.query_terms({"python": 2, "sql": 1}, k=3) == [("c", 100.0), ("b", 100.0 * 2 / 3)]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    rng = random.Random(3)
+    docs = {f"r{number}": set(rng.sample(VOCABULARY, 6)) for number in range(500)}
+    index = build(docs)
+    index.remove("r10")
+    path = tmp_path / "resumes.idx"
+    index.save(str(path))
+    loaded = ResumeIndex.load(str(path))
+    weighted = {term: 1 for term in VOCABULARY[:10]}
+    assert loaded.query_terms(weighted, k=10) == index.query_terms(weighted, k=10)
+    assert len(loaded) == 499 and "r10" not in loaded
+    assert path.stat().st_size < 500 * 6 * 2 + 8000
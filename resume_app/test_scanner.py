@@ -0,0 +1,45 @@
+import random
+import re
+
+from analyzer import COMPANY, EMPHASIS, phrase_scanner
+from extractor import blank_spans
+from scanner import PhraseScanner
+
+
+def naive(text, phrases):
+    found = []
+    for phrase, value in phrases:
+        for match in re.finditer(r"(?=\b%s\b)" % re.escape(phrase), text):
+            found.append((match.start(), match.start() + len(phrase), value))
+    return sorted(found, key=lambda item: (item[1], item[0]))
+
+
+def test_overlapping_phrases_on_word_boundaries_only():
+    phrases = [("we need", 1), ("need", 2), ("need python", 3), ("ed", 4)]
+    text = "we need python. we needed a seed, need"
+    assert sorted(PhraseScanner(phrases).finditer(text)) == sorted(naive(text, phrases))
+
+
+def test_matches_naive_search_on_random_text():
+    rng = random.Random(5)
+    words = ["ab", "abc", "bc", "c", "cab", "b"]
+    phrases = [("ab", "x"), ("abc", "y"), ("bc", "z"), ("c ab", "w"), ("b c", "v")]
+    scanner = PhraseScanner(phrases)
+    for _ in range(200):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 12)))
+        assert sorted(scanner.finditer(text)) == sorted(naive(text, phrases))
+
+
+def test_company_terms_are_whole_words():
+    text = "florida international university (fiu) hires at fiu. fiuzzy tiles; we need sql"
+    matches = list(phrase_scanner("Florida International University").finditer(text))
+    assert [(text[start:end], kind) for start, end, kind in matches] == [
+        ("florida international university", COMPANY), ("fiu", COMPANY), ("fiu", COMPANY), ("we need", EMPHASIS),
+    ]
+    blanked = blank_spans(text, [(start, end) for start, end, kind in matches if kind == COMPANY])
+    assert len(blanked) == len(text)
+    assert blanked.split() == ["(", ")", "hires", "at", ".", "fiuzzy", "tiles;", "we", "need", "sql"]
+
+
+def test_blank_spans_handles_overlaps():
+    assert blank_spans("abcdef", [(3, 5), (1, 4)]) == "a    f"
@@ -0,0 +1,160 @@
+import asyncio
+import base64
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import service
+from benchmarks.fixtures import make_pdf
+from benchmarks.load_service import request
+from service import AnalysisService, sniff_resume_type
+
+JOB = {"resume_text": "Python developer", "job_text": "We need Python"}
+
+
+def serve(test, threads=True, **options):
+    """Runs `test(port, service)` against a service on a free port (thread pool unless threads=False)."""
+    async def main():
+        analysis = AnalysisService(executor=ThreadPoolExecutor(2) if threads else None, **options)
+        server = await analysis.start("127.0.0.1", 0)
+        try:
+            return await test(server.sockets[0].getsockname()[1], analysis)
+        finally:
+            server.close()
+            analysis.close()
+    return asyncio.run(main())
+
+
+def test_sniff_resume_type():
+    assert sniff_resume_type(b"%PDF-1.4") == service.PDF_TYPE
+    assert sniff_resume_type(b"", "cv.DOCX") == service.DOCX_TYPE
+    for args in [(b"hello",), (b"%PDF", "cv.txt")]:
+        try:
+            sniff_resume_type(*args)
+        except service.HTTPError as error:
+            assert error.status == 415
+        else:
+            raise AssertionError(args)
+
+
+def test_bad_requests():
+    async def test(port, _):
+        statuses = [
+            (await request("127.0.0.1", port, "GET", "/nope"))[0],
+            (await request("127.0.0.1", port, "POST", "/analyze", ["not", "an", "object"]))[0],
+            (await request("127.0.0.1", port, "POST", "/analyze", {"resume_text": "x"}))[0],
+            (await request("127.0.0.1", port, "POST", "/analyze", {**JOB, "lemma_mode": "fast"}))[0],
+            (await request("127.0.0.1", port, "POST", "/analyze", {"resume": "%%%", "job_text": "x"}))[0],
+        ]
+        return statuses
+    assert serve(test) == [404, 400, 400, 400, 400]
+
+
+def test_invalid_fields_are_bad_requests():
+    batch = {"resume_text": "x", "jobs": [{"key": "a", "job_text": "A"}]}
+    payloads = [
+        ("/analyze", {**JOB, "company_name": 42}),
+        ("/analyze", {**JOB, "top_n": -1}),
+        ("/analyze", {**JOB, "top_n": "many"}),
+        ("/analyze", {"resume": "", "filename": ["cv.pdf"], "job_text": "x"}),
+        ("/analyze/batch", {**batch, "jobs": [{"key": "a", "job_text": 7}]}),
+        ("/analyze/batch", {**batch, "jobs": [{"key": "a", "job_text": "A", "company_name": {"x": 1}}]}),
+        ("/analyze/batch", {**batch, "company_name": False}),
+    ]
+
+    async def test(port, analysis):
+        statuses = [(await request("127.0.0.1", port, "POST", path, payload))[0] for path, payload in payloads]
+        return statuses, analysis.pending
+    assert serve(test) == ([400] * len(payloads), 0)
+
+
+def test_malformed_content_length():
+    async def send(port, length):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"POST /analyze HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode("latin-1"))
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        writer.close()
+        return status
+
+    async def test(port, _):
+        return [await send(port, length) for length in ("abc", "-5", "")]
+    assert serve(test) == [400, 400, 400]
+
+
+def test_backpressure_and_timeouts(monkeypatch):
+    release = threading.Event()
+
+    def slow_analysis(*args):
+        release.wait(5)
+        return {"match_score": 50.0}
+
+    monkeypatch.setattr(service, "analyze_text", slow_analysis)
+
+    async def test(port, analysis):
+        first = asyncio.ensure_future(request("127.0.0.1", port, "POST", "/analyze", JOB))
+        while analysis.pending < 1:
+            await asyncio.sleep(0.01)
+        rejected = await request("127.0.0.1", port, "POST", "/analyze", JOB)
+        release.set()
+        status, _, body = await first
+        return rejected, status, json.loads(body), analysis.stats()
+
+    rejected, status, result, stats = serve(test, max_pending=1)
+    assert rejected[0] == 429 and rejected[1]["retry-after"] == "1"
+    assert (status, result) == (200, {"match_score": 50.0})
+    assert stats["rejected"] == 1 and stats["completed"] == 1
+
+    release.clear()
+
+    async def timeout_test(port, analysis):
+        status, _, _ = await request("127.0.0.1", port, "POST", "/analyze", JOB)
+        release.set()
+        return status, analysis.stats()["timed_out"]
+
+    assert serve(timeout_test, timeout=0.05) == (504, 1)
+
+
+def test_batch_streams_one_line_per_job(monkeypatch):
+    monkeypatch.setattr(service, "analyze_text", lambda resume, job, *args: {"job": job})
+
+    async def test(port, analysis):
+        payload = {"resume_text": "x", "jobs": [{"key": "a", "job_text": "A"}, {"job_text": "B"}]}
+        status, headers, body = await request("127.0.0.1", port, "POST", "/analyze/batch", payload)
+        return status, headers, body, analysis.pending
+
+    status, headers, body, pending = serve(test)
+    assert status == 200 and headers["transfer-encoding"] == "chunked"
+    lines = sorted((json.loads(line) for line in body.splitlines()), key=lambda line: str(line["key"]))
+    assert lines == [{"key": 1, "result": {"job": "B"}, "error": None}, {"key": "a", "result": {"job": "A"}, "error": None}]
+    assert pending == 0
+
+
+def test_truncated_upload_is_flagged(monkeypatch):
+    monkeypatch.setattr(service, "analyze_text", lambda resume, job, *args: {"resume": resume})
+    monkeypatch.setattr(service, "UPLOAD_LIMITS", {"max_pages": 1})
+
+    async def test(port, _):
+        pages = [f"Page {number} Python developer" for number in (1, 2)]
+        payload = {"resume": base64.b64encode(make_pdf(pages)).decode(), "job_text": "x"}
+        whole = {**payload, "resume": base64.b64encode(make_pdf(pages[:1])).decode()}
+        return [await request("127.0.0.1", port, "POST", "/analyze", body) for body in (payload, whole)]
+
+    (status, headers, body), (_, whole_headers, _) = serve(test)
+    assert status == 200 and json.loads(body) == {"resume": "Page 1 Python developer"}
+    assert headers["x-resume-truncated"] == "pages"
+    assert "x-resume-truncated" not in whole_headers
+
+
+@pytest.mark.needs_nltk_data
+def test_pdf_upload_in_process_pool():
+    async def test(port, _):
+        payload = {"resume": base64.b64encode(make_pdf(["Python developer. Python and SQL."])).decode(),
+                   "job_text": "We need Python. Python and SQL daily."}
+        status, _, body = await request("127.0.0.1", port, "POST", "/analyze", payload)
+        return status, json.loads(body)
+
+    status, result = serve(test, threads=False, max_workers=1)
+    assert status == 200 and "python" in dict(result["keyword_matches"])
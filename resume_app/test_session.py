@@ -0,0 +1,53 @@
+from extractor import PreprocessedDocument
+from matcher import analyze_resume_against_job
+from session import AnalysisSession, IncrementalDocument
+
+RESUME = """Python developer building data pipelines.
+Built data pipelines in Python and SQL for analytics teams.
+Led code reviews, mentoring and testing of Python services.
+
+Maintained SQL reporting and data pipelines."""
+
+JOB = """We need a Python developer to build data pipelines.
+Python and SQL experience required, data pipelines every day.
+You will review Python code and mentor analytics teams."""
+
+EDITED = RESUME.replace("Led code reviews", "Led Docker deployments, code reviews")
+
+
+def test_update_only_encodes_changed_paragraphs(table_lemmas):
+    table_lemmas(RESUME, EDITED)
+    doc = IncrementalDocument(RESUME, lemma_mode="token")
+    assert (doc.encoded, doc.reused) == (5, 0)
+    assert doc.update(RESUME) is False
+    assert doc.update(EDITED) is True
+    assert (doc.encoded, doc.reused) == (1, 4)
+    full = PreprocessedDocument(EDITED, lemma_mode="token")
+    assert doc.lemmas == full.lemmas
+    assert doc.token_count == full.token_count
+    assert doc.top_ngrams(2, None) == full.top_ngrams(2, None)
+
+
+def test_session_matches_full_analysis_after_edits(table_lemmas):
+    table_lemmas(RESUME, JOB, EDITED)
+    session = AnalysisSession(company_name="Acme", lemma_mode="token")
+    first = session.analyze(RESUME, JOB)
+    assert first == analyze_resume_against_job(RESUME, JOB, "Acme", lemma_mode="token")
+    assert session.analyze(RESUME, JOB) is first
+
+    edited = session.analyze(EDITED, JOB)
+    assert edited == analyze_resume_against_job(EDITED, JOB, "Acme", lemma_mode="token")
+    assert session.job.encoded == 0
+    assert session.resume.encoded == 1
+
+
+def test_phrases_next_to_line_breaks_match_the_full_analysis(table_lemmas):
+    text = "We need\n\nthe Python developers.\nAcme\nCorp builds Python tools; we need\nSQL and Python.\nwe need"
+    table_lemmas(text, "docker")
+    doc = IncrementalDocument(text, company_name="Acme Corp", lemma_mode="token", emphasis_boost=2)
+    full = PreprocessedDocument(text, company_name="Acme Corp", lemma_mode="token", emphasis_boost=2)
+    assert doc.emphasis == full.emphasis == {"python": 2, "sql": 2}
+    assert doc.ngram_counts(1) == full.ngram_counts(1)
+    assert doc.update(text.replace("We need\n\nthe Python", "We need\n\nthe Docker")) is True
+    assert doc.emphasis == {"docker": 2, "sql": 2}
+
@@ -0,0 +1,60 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from tfidf import TfidfModel
+
+POSTINGS = [
+    Counter({"team": 3, "experience": 2, "python": 2}),
+    Counter({"team": 2, "experience": 2, "kubernetes": 3}),
+    Counter({"team": 4, "experience": 1, "sales": 2}),
+]
+
+
+def fitted():
+    model = TfidfModel()
+    model.add_documents(POSTINGS)
+    return model
+
+
+def test_document_frequencies_and_idf_order():
+    model = fitted()
+    assert (model.n_docs, model.df("team"), model.df("python"), model.df("rust")) == (3, 3, 1, 0)
+    idf = dict(zip(model.terms, model.idf()))
+    assert idf["team"] < idf["python"]
+
+
+def test_transform_rows_are_sorted_and_unit_length():
+    rows = fitted().transform(POSTINGS + [Counter()])
+    assert list(rows.indptr) == [0, 3, 6, 9, 9]
+    for start, end in zip(rows.indptr[:-1], rows.indptr[1:]):
+        assert list(rows.indices[start:end]) == sorted(rows.indices[start:end])
+        if end > start:
+            assert np.linalg.norm(rows.data[start:end]) == pytest.approx(1.0)
+
+
+def test_scoring_does_not_grow_the_vocabulary():
+    model = fitted()
+    terms = len(model.terms)
+    rows = model.transform([Counter({"rust": 2, "python": 1}), Counter({"rust": 1})])
+    model.weights(Counter({"golang": 3}))
+    model.cosine_similarity(Counter({"rust": 1}), [Counter({"rust": 1, "team": 1})])
+    assert len(model.terms) == len(model.vocabulary) == terms
+    assert model.df("rust") == 0
+    assert rows.indices[-1] == rows.indices[1] == terms  # "rust" shares one transient column
+
+
+def test_cosine_similarity_against_many_documents():
+    model = fitted()
+    resume = Counter({"python": 2, "team": 1})
+    sims = model.cosine_similarity(resume, [resume, Counter({"sales": 2}), POSTINGS[0], Counter()])
+    assert sims[0] == pytest.approx(1.0)
+    assert sims[1] == 0.0 and sims[3] == 0.0
+    assert 0 < sims[2] < 1
+
+
+def test_top_terms_prefers_rare_terms_over_generic_ones():
+    top = fitted().top_terms(POSTINGS[0], top_n=2)
+    assert [term for term, _, _ in top] == ["python", "team"]
+    assert top[0][1:] == (2, 10)
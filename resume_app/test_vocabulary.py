@@ -0,0 +1,59 @@
+import pickle
+import random
+from collections import Counter
+
+import numpy as np
+
+from extractor import PreprocessedDocument
+from vocabulary import Vocabulary, count_keys, pack_pairs
+
+
+def test_encode_decode_round_trip():
+    vocabulary = Vocabulary()
+    ids = vocabulary.encode(["python", "sql", "python"])
+    assert ids.tolist() == [0, 1, 0] and ids.itemsize == 4
+    assert vocabulary.decode(ids) == ["python", "sql", "python"]
+    assert len(vocabulary) == 2
+
+
+def test_vocabulary_and_documents_pickle(table_lemmas):
+    vocabulary = Vocabulary()
+    vocabulary.encode(["python", "sql"])
+    copy = pickle.loads(pickle.dumps(vocabulary))
+    assert copy.terms == ["python", "sql"] and copy.id("sql") == 1 and copy.id("java") == 2
+
+    table_lemmas("Python developer, Python and SQL pipelines")
+    doc = PreprocessedDocument("Python developer, Python and SQL pipelines", lemma_mode="token")
+    assert pickle.loads(pickle.dumps(doc)).ngram_counts(1) == doc.ngram_counts(1)
+    assert pickle.loads(pickle.dumps(PreprocessedDocument(""))).lemmas == []
+
+
+def test_documents_have_their_own_vocabulary(table_lemmas):
+    table_lemmas("python sql", "java")
+    first = PreprocessedDocument("python sql", lemma_mode="token")
+    second = PreprocessedDocument("java", lemma_mode="token")
+    assert first.vocabulary is not second.vocabulary
+    assert (len(first.vocabulary), len(second.vocabulary)) == (2, 1)
+
+
+def test_count_keys_orders_like_most_common():
+    rng = random.Random(3)
+    for _ in range(100):
+        keys = [rng.randint(0, 8) for _ in range(rng.randint(1, 40))]
+        unique, counts, _ = count_keys(np.array(keys))
+        assert list(zip(unique.tolist(), counts.tolist())) == Counter(keys).most_common()
+
+
+def test_count_keys_weights():
+    unique, counts, _ = count_keys(np.array([1, 2, 2]), {1: 2, 9: 5})
+    assert list(zip(unique.tolist(), counts.tolist())) == [(1, 3), (2, 2)]
+    assert counts.dtype.kind == "i"
+    assert count_keys(np.array([1, 2, 2]), {1: 0.5})[1].tolist() == [2.0, 1.5]
+
+
+def test_pack_pairs_skips_invalid_tokens():
+    vocabulary = Vocabulary()
+    ids = np.frombuffer(vocabulary.encode(["machine", "learning", "the", "machine", "learning"]), dtype=np.uint32)
+    valid = ids != vocabulary.id("the")
+    keys = pack_pairs(ids, valid)
+    assert [vocabulary.pair_term(key) for key in keys.tolist()] == ["machine learning", "machine learning"]
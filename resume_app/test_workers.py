@@ -0,0 +1,33 @@
+import gc
+import pickle
+import sys
+
+import pytest
+
+from workers import CAN_FORK, _WarmInitializer, create_pool, process_memory, worker_memory
+
+
+def test_pool_starts_its_workers_up_front():
+    with create_pool(2, warm=False) as pool:
+        memory = worker_memory(pool)
+        assert len(memory) == 2
+        assert pool.submit(sum, [1, 2]).result() == 3
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc")
+def test_process_memory():
+    memory = process_memory()
+    assert memory["rss"] > 0 and 0 < memory["pss"] <= memory["rss"]
+    assert process_memory(2**22 + 7) == {"rss": None, "pss": None, "shared": None}
+
+
+def test_warm_initializer_is_picklable():
+    assert pickle.loads(pickle.dumps(_WarmInitializer(None, ())))
+
+
+@pytest.mark.needs_nltk_data
+@pytest.mark.skipif(not CAN_FORK, reason="needs fork")
+def test_warm_workers_inherit_frozen_models():
+    with create_pool(2, warm=True) as pool:
+        assert pool.submit(gc.get_freeze_count).result() > 0
+    assert gc.get_freeze_count() == 0
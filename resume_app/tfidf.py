@@ -0,0 +1,129 @@
+from collections import namedtuple
+
+import numpy as np
+
+from analyzer import calculate_importance
+
+# Compressed sparse rows: row i has entries indices[indptr[i]:indptr[i + 1]] with values data[...]
+SparseRows = namedtuple("SparseRows", ["indptr", "indices", "data"])
+
+
+class TfidfModel:
+    """
+    Corpus-aware term scoring. Keeps document frequencies for every term (keyword or bigram)
+    of the documents added with `add_documents`, so terms found in every posting ("team",
+    "experience") weigh less than rare, specific ones. Documents are passed as term Counters,
+    e.g. PreprocessedDocument.term_counts().
+
+    idf(term) = ln((1 + n_docs) / (1 + df(term))) + 1, tf-idf = count * idf.
+    Terms never seen in the collection get df = 0; scoring a document never adds them to the
+    vocabulary, only `add_documents` does.
+    """
+
+    def __init__(self):
+        self.vocabulary = {}  # term -> column
+        self.terms = []  # column -> term
+        self.n_docs = 0
+        self._df = np.zeros(1024, dtype=np.int64)
+
+    def _term_ids(self, terms):
+        """Column ids for `terms`, growing the vocabulary (and the df array) for new terms."""
+        vocabulary = self.vocabulary
+        ids = []
+        for term in terms:
+            column = vocabulary.get(term)
+            if column is None:
+                column = vocabulary[term] = len(self.terms)
+                self.terms.append(term)
+            ids.append(column)
+        if len(self.terms) > len(self._df):
+            self._df = np.concatenate([self._df, np.zeros(max(len(self._df), len(self.terms)), dtype=np.int64)])
+        return np.array(ids, dtype=np.int64)
+
+    def _lookup_ids(self, terms):
+        """
+        Column ids for `terms` without touching the vocabulary: unknown terms get transient columns
+        after the vocabulary's (shared within the call, df = 0). Returns (ids, number of columns).
+        """
+        vocabulary = self.vocabulary
+        transient = {}
+        ids = []
+        for term in terms:
+            column = vocabulary.get(term)
+            if column is None:
+                column = transient.get(term)
+                if column is None:
+                    column = transient[term] = len(self.terms) + len(transient)
+            ids.append(column)
+        return np.array(ids, dtype=np.int64), len(self.terms) + len(transient)
+
+    def add_documents(self, counters):
+        """Adds a batch of documents (term Counters) to the document-frequency statistics."""
+        counters = list(counters)
+        ids = self._term_ids(term for counts in counters for term in counts)
+        self._df[:len(self.terms)] += np.bincount(ids, minlength=len(self.terms))
+        self.n_docs += len(counters)
+
+    def df(self, term):
+        column = self.vocabulary.get(term)
+        return 0 if column is None else int(self._df[column])
+
+    def idf(self, n_columns=None):
+        """Inverse document frequency of every vocabulary column (and of transient columns up to `n_columns`)."""
+        df = self._df[:len(self.terms)]
+        if n_columns is not None and n_columns > len(df):
+            df = np.concatenate([df, np.zeros(n_columns - len(df), dtype=np.int64)])
+        return np.log((1 + self.n_docs) / (1 + df)) + 1
+
+    def transform(self, counters):
+        """
+        Turns a batch of term Counters into L2-normalized tf-idf rows in one vectorized pass.
+        Returns SparseRows with the columns of each row sorted; terms outside the vocabulary get
+        transient columns numbered from len(self.terms).
+        """
+        counters = list(counters)
+        lengths = np.array([len(counts) for counts in counters], dtype=np.int64)
+        indices, n_columns = self._lookup_ids(term for counts in counters for term in counts)
+        tf = np.fromiter((count for counts in counters for count in counts.values()), dtype=np.float64,
+                         count=len(indices))
+        rows = np.repeat(np.arange(len(counters)), lengths)
+
+        # Sort columns within each row (rows stay in order)
+        order = np.lexsort((indices, rows))
+        indices = indices[order]
+        data = tf[order] * self.idf(n_columns)[indices]
+
+        norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=len(counters)))
+        data /= np.where(norms > 0, norms, 1.0)[rows]
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+        return SparseRows(indptr, indices, data)
+
+    def cosine_similarity(self, query_counts, counters):
+        """Cosine similarity between one document (e.g. a resume) and each of `counters` (e.g. postings)."""
+        matrix = self.transform([query_counts, *counters])
+        dense = np.zeros(max(len(self.terms), int(matrix.indices.max(initial=-1)) + 1))
+        start, end = matrix.indptr[0], matrix.indptr[1]
+        dense[matrix.indices[start:end]] = matrix.data[start:end]
+
+        indices, data = matrix.indices[end:], matrix.data[end:]
+        rows = np.repeat(np.arange(len(counters)), np.diff(matrix.indptr[1:]))
+        return np.bincount(rows, weights=data * dense[indices], minlength=len(counters))
+
+    def weights(self, counts):
+        """Raw tf-idf weight of every term of one document."""
+        terms = list(counts)
+        ids, n_columns = self._lookup_ids(terms)
+        weights = np.array([counts[term] for term in terms], dtype=np.float64) * self.idf(n_columns)[ids]
+        return dict(zip(terms, weights.tolist()))
+
+    def top_terms(self, counts, top_n=5):
+        """
+        Like extractor.top_terms, but ranked by tf-idf weight instead of raw count and with
+        1-10 importance scores scaled from those weights. Terms seen only once are still dropped.
+        """
+        weights = self.weights({term: count for term, count in counts.items() if count > 1})
+        importance_scores = calculate_importance(weights)
+        ranked = sorted(weights, key=lambda term: (-weights[term], -counts[term]))
+        if top_n is not None:
+            ranked = ranked[:top_n]
+        return [(term, counts[term], importance_scores[term]) for term in ranked]
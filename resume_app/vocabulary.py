@@ -0,0 +1,89 @@
+import threading
+from array import array
+
+# array typecode for token ids: unsigned 32-bit, so a bigram packs into one 64-bit key
+ID_TYPECODE = "I"
+PAIR_SHIFT = 32
+PAIR_MASK = (1 << PAIR_SHIFT) - 1
+
+
+class Vocabulary:
+    """
+    Interns lemma strings as small integer ids, so a token stream is an array of 4-byte ids
+    instead of a list of separate str objects. Ids are never reused or removed, so a vocabulary
+    lives as long as its owner: each PreprocessedDocument has its own (an IncrementalDocument
+    keeps one for all its versions), and it is freed with the document.
+    Lookups are lock-free, only new terms take the lock; pickling drops the lock.
+    """
+
+    def __init__(self):
+        self.ids = {}  # term -> id
+        self.terms = []  # id -> term
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {"terms": self.terms}
+
+    def __setstate__(self, state):
+        self.terms = state["terms"]
+        self.ids = {term: term_id for term_id, term in enumerate(self.terms)}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.terms)
+
+    def id(self, term):
+        term_id = self.ids.get(term)
+        if term_id is None:
+            with self._lock:
+                term_id = self.ids.get(term)
+                if term_id is None:
+                    term_id = len(self.terms)
+                    self.terms.append(term)
+                    self.ids[term] = term_id
+        return term_id
+
+    def encode(self, terms):
+        """array("I") of the ids of `terms`, interning new ones."""
+        return array(ID_TYPECODE, map(self.id, terms))
+
+    def decode(self, ids):
+        terms = self.terms
+        return [terms[term_id] for term_id in ids]
+
+    def pair_term(self, key):
+        """The "w1 w2" string of a packed bigram key."""
+        return f"{self.terms[key >> PAIR_SHIFT]} {self.terms[key & PAIR_MASK]}"
+
+
+def count_keys(keys, weights=None):
+    """
+    Counts the integer keys of a NumPy array. Returns (keys, counts, first positions) ordered
+    like Counter(keys).most_common(): by count descending, ties in order of first occurrence.
+    `weights` is an optional {key: extra count} added to keys that occur; counts stay
+    integers unless a weight is a float.
+    """
+    import numpy as np  # only needed once documents are counted, keeps module import cheap
+
+    unique, first, counts = np.unique(keys, return_index=True, return_counts=True)
+    if weights:
+        if any(isinstance(extra, float) for extra in weights.values()):
+            counts = counts.astype(np.float64)
+        for key, extra in weights.items():
+            position = int(np.searchsorted(unique, key))
+            if position < len(unique) and unique[position] == key:
+                counts[position] += extra
+    order = np.lexsort((first, -counts))
+    return unique[order], counts[order], first[order]
+
+
+def pack_pairs(ids, valid):
+    """
+    Packed 64-bit keys (first id << 32 | second id) of every adjacent pair of `ids`
+    (a uint32 NumPy array) where both tokens are `valid` (a boolean array).
+    """
+    import numpy as np
+
+    wide = ids.astype(np.uint64)
+    keys = (wide[:-1] << np.uint64(PAIR_SHIFT)) | wide[1:]
+    return keys[valid[:-1] & valid[1:]]
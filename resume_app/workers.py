@@ -0,0 +1,97 @@
+import gc
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from analyzer import NLTKResourceError, warm_up
+
+# Forked workers share the parent's memory pages until they write to them
+CAN_FORK = "fork" in multiprocessing.get_all_start_methods()
+
+
+def worker_pid():
+    return os.getpid()
+
+
+def start_workers(pool, count):
+    """Makes `pool` start its worker processes now instead of on the first real task. Returns their pids."""
+    return {future.result() for future in [pool.submit(worker_pid) for _ in range(count)]}
+
+
+def create_pool(max_workers=None, warm=True, initializer=None, initargs=()):
+    """
+    ProcessPoolExecutor for analysis work, with its workers already started.
+
+    With warm=True (and fork available) the NLTK models and excluded words are loaded here,
+    before forking (analyzer.warm_up), and frozen with gc.freeze so the workers' garbage
+    collector never touches them: the pages stay shared copy-on-write instead of being copied
+    into every worker, and no worker pays the model loading on its first request.
+    Without fork each worker runs warm_up itself when it starts. Missing NLTK data does not
+    stop the pool from starting, the tasks report it.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    context = multiprocessing.get_context("fork") if CAN_FORK else None
+    if warm and not CAN_FORK:
+        initializer, initargs = _WarmInitializer(initializer, initargs), ()
+    elif warm:
+        try:
+            warm_up()
+        except NLTKResourceError:
+            # Workers start cold; each task then fails with the missing-data error, as without warm-up
+            warm = False
+        else:
+            gc.collect()
+            gc.freeze()
+    pool = ProcessPoolExecutor(max_workers, mp_context=context, initializer=initializer, initargs=initargs)
+    try:
+        start_workers(pool, max_workers)
+    finally:
+        if warm and CAN_FORK:
+            gc.unfreeze()  # only the workers keep the frozen generation, this process collects normally
+    return pool
+
+
+class _WarmInitializer:
+    """Picklable worker initializer that warms up, then runs the caller's initializer."""
+
+    def __init__(self, initializer, initargs):
+        self.initializer = initializer
+        self.initargs = initargs
+
+    def __call__(self):
+        try:
+            warm_up()
+        except NLTKResourceError:
+            pass  # reported by the tasks themselves, as in create_pool
+        if self.initializer is not None:
+            self.initializer(*self.initargs)
+
+
+def process_memory(pid=None):
+    """
+    Memory of a process in bytes from /proc (Linux): "rss" (resident), "pss" (proportional share,
+    shared pages split between the processes using them) and "shared" (clean + dirty shared).
+    Values are None where /proc is not available.
+    """
+    pid = pid or os.getpid()
+    memory = {"rss": None, "pss": None, "shared": None}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as file:
+            fields = dict(line.split(":", 1) for line in file if ":" in line and not line[0].isdigit())
+    except OSError:
+        return memory
+
+    def kib(name):
+        return int(fields[name].split()[0]) * 1024 if name in fields else None
+
+    memory["rss"] = kib("Rss")
+    memory["pss"] = kib("Pss")
+    if "Shared_Clean" in fields:
+        memory["shared"] = kib("Shared_Clean") + kib("Shared_Dirty")
+    return memory
+
+
+def worker_memory(pool):
+    """process_memory of each worker process of `pool`, as {pid: memory}."""
+    # ProcessPoolExecutor has no public list of its workers; _processes maps pid -> Process
+    return {pid: process_memory(pid) for pid in sorted(pool._processes or ())}